@@ -0,0 +1,192 @@
+"""
+Digital Detox Weaver: Provider Circuit Breakers
+
+This module implements SOURCE 4 - Orchestration Framework
+One breaker per provider, shared by LLMRouter and RAGDataFetcher:
+
+- closed: calls go through and consecutive failures are counted
+- open: after ``failure_threshold`` failures, calls fail immediately with
+  CircuitOpenError for ``reset_seconds``
+- half-open: after that, a single probe call is let through; its success
+  closes the breaker and its failure reopens it (a probe that never reached
+  the provider is given back with ``release_probe``)
+
+Retries use jittered exponential backoff ("full jitter": a uniform delay up
+to base * 2^attempt, capped), so callers that failed together do not retry
+in lockstep.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_SECONDS = 30.0
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_CAP = 8.0
+
+try:
+    from kiro_config.llm_config import llm_config
+    RETRY_ATTEMPTS, REQUEST_TIMEOUT = llm_config.retry_attempts, float(llm_config.timeout)
+except ImportError:
+    # pydantic-settings is only in the full orchestration install; same defaults as LLMConfig
+    RETRY_ATTEMPTS, REQUEST_TIMEOUT = 3, 300.0
+
+# Configuration and programming errors: retrying the same call cannot help
+NON_RETRYABLE = (AttributeError, KeyError, NotImplementedError, TypeError, ValueError)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose breaker is open"""
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker for one provider"""
+
+    def __init__(self, name: str, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_seconds: float = DEFAULT_RESET_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.failures = 0
+        self.opened = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self.clock() - self._opened_at >= self.reset_seconds:
+            self._state = HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        Whether a call may go out now
+        
+        In half-open state only one probe goes out at a time; a probe that
+        never reports back (an abandoned stream) is replaced after ``reset_seconds``.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and (not self._probing or self.clock() - self._probe_started >= self.reset_seconds):
+                self._probing = True
+                self._probe_started = self.clock()
+                return True
+            return False
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call is allowed"""
+        if not self.allow():
+            with self._lock:
+                remaining = max(0.0, self.reset_seconds - (self.clock() - self._opened_at))
+            raise CircuitOpenError(f"{self.name} circuit open; next probe in {remaining:.1f}s")
+
+    def release_probe(self):
+        """Give back a half-open probe claimed by ``before_call`` for a call that was never made"""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info(f"✓ {self.name} circuit closed")
+            self._state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._current_state() == HALF_OPEN or (self._state == CLOSED and self.failures >= self.failure_threshold):
+                self._state = OPEN
+                self._opened_at = self.clock()
+                self._probing = False
+                self.opened += 1
+                logger.warning(f"⚠️ {self.name} circuit opened after {self.failures} failures; "
+                               f"failing fast for {self.reset_seconds:.0f}s")
+
+
+class CircuitBreakers:
+    """Lazily created breakers by provider name"""
+
+    def __init__(self, failure_threshold: Optional[int] = None, reset_seconds: Optional[float] = None):
+        self.failure_threshold = failure_threshold or int(os.getenv("LLM_BREAKER_FAILURES", str(DEFAULT_FAILURE_THRESHOLD)))
+        self.reset_seconds = reset_seconds or float(os.getenv("LLM_BREAKER_RESET_SECONDS", str(DEFAULT_RESET_SECONDS)))
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            if name not in self._breakers:
+                self._breakers[name] = CircuitBreaker(name, self.failure_threshold, self.reset_seconds)
+            return self._breakers[name]
+
+    def states(self) -> Dict[str, str]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.state for breaker in breakers}
+
+
+def is_retryable(error: BaseException) -> bool:
+    return not isinstance(error, NON_RETRYABLE + (CircuitOpenError,))
+
+
+def backoff_delay(attempt: int, base: float = DEFAULT_BACKOFF_BASE, cap: float = DEFAULT_BACKOFF_CAP) -> float:
+    """Full-jitter delay before retry number ``attempt`` (0-based)"""
+    return random.uniform(0.0, min(cap, base * 2 ** attempt))
+
+
+def call_with_retry(breaker: CircuitBreaker, call: Callable[[], T], retries: int = RETRY_ATTEMPTS,
+                    timeout: float = REQUEST_TIMEOUT, backoff_base: float = DEFAULT_BACKOFF_BASE) -> T:
+    """
+    Run ``call`` through ``breaker`` with up to ``retries`` jittered retries
+
+    Gives up early when the next backoff would pass ``timeout`` seconds from
+    the first attempt. Raises CircuitOpenError without calling while open.
+    """
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while True:
+        breaker.before_call()
+        try:
+            result = call()
+        except Exception as e:
+            breaker.record_failure()
+            if attempt >= retries or not is_retryable(e):
+                raise
+            delay = backoff_delay(attempt, backoff_base)
+            if time.monotonic() + delay >= deadline:
+                raise
+            logger.warning(f"{breaker.name} call failed ({e}); retry {attempt + 1}/{retries} in {delay:.2f}s")
+            time.sleep(delay)
+            attempt += 1
+            continue
+        breaker.record_success()
+        return result
+
+
+# Process-wide breakers, shared by the router and the RAG fetcher
+circuit_breakers = CircuitBreakers()
@@ -0,0 +1,129 @@
+"""
+Digital Detox Weaver: Provider Client Pool
+
+This module implements SOURCE 4 - Orchestration Framework
+Long-lived, thread-safe provider clients shared by LLMRouter, RAGDataFetcher
+and the agent classes (which call through the router). Each provider/model/
+system-instruction combination is built once. HTTP clients keep their
+connections alive in a sized pool, so connection and TLS setup happen on the
+first request instead of every request.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .prompt_cache import prefix_digest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_KEEPALIVE_SECONDS = 30.0
+DEFAULT_TIMEOUT_SECONDS = 300.0
+
+
+class ClientPool:
+    """
+    Lazily built provider clients, one per key
+
+    ``pool_size`` bounds the kept-alive connections per HTTP client and should
+    be at least the number of concurrent streams (LLM_ASYNC_WORKERS).
+    """
+
+    def __init__(self, pool_size: Optional[int] = None, keepalive_seconds: Optional[float] = None,
+                 timeout_seconds: Optional[float] = None):
+        self.pool_size = pool_size or int(os.getenv("LLM_POOL_SIZE", str(DEFAULT_POOL_SIZE)))
+        self.keepalive_seconds = keepalive_seconds or float(os.getenv("LLM_KEEPALIVE_SECONDS", str(DEFAULT_KEEPALIVE_SECONDS)))
+        self.timeout_seconds = timeout_seconds or float(os.getenv("TIMEOUT_SECONDS", str(DEFAULT_TIMEOUT_SECONDS)))
+        self._clients: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def _get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Client for ``key``, built by ``factory`` the first time only"""
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = factory()
+                self.created += 1
+                logger.info(f"✓ Client pool: created {key[0]} client")
+            return self._clients[key]
+
+    def claude(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+        """Anthropic client with a sized keep-alive connection pool (model is chosen per request)"""
+        api_key = api_key or os.getenv("CLAUDE_API_KEY")
+
+        def build():
+            import anthropic
+            # Same Limits class the SDK uses internally (httpx or its successor)
+            limits = type(anthropic.DEFAULT_CONNECTION_LIMITS)(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size,
+                keepalive_expiry=self.keepalive_seconds
+            )
+            http_client = anthropic.DefaultHttpxClient(limits=limits, timeout=self.timeout_seconds)
+            return anthropic.Anthropic(api_key=api_key, base_url=base_url, http_client=http_client)
+
+        return self._get(("claude", api_key, base_url), build)
+
+    def gemini_model(self, model: str, system_instruction: str = "", api_key: Optional[str] = None):
+        """
+        GenerativeModel per model and system instruction (keyed by its hash); the
+        SDK's transport is shared by all of them
+        """
+        import google.generativeai as genai
+        api_key = api_key or os.getenv("GEMINI_API_KEY")
+        self._get(("gemini-config", api_key), lambda: genai.configure(api_key=api_key) or True)
+        return self._get(
+            ("gemini", api_key, model, prefix_digest(system_instruction)),
+            lambda: genai.GenerativeModel(model, system_instruction=system_instruction or None)
+        )
+
+    def bedrock(self, region: Optional[str] = None):
+        """bedrock-runtime client with ``pool_size`` connections, or None without boto3"""
+        region = region or os.getenv("AWS_REGION", "us-east-1")
+
+        def build():
+            import boto3
+            from botocore.config import Config
+            return boto3.client(
+                "bedrock-runtime",
+                region_name=region,
+                aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+                aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+                config=Config(max_pool_connections=self.pool_size, read_timeout=self.timeout_seconds)
+            )
+
+        try:
+            return self._get(("bedrock", region), build)
+        except ImportError:
+            return None
+
+    def http_session(self, name: str = "default"):
+        """requests.Session with a sized keep-alive pool, for HTTP-only providers and data sources"""
+        def build():
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            return session
+
+        return self._get(("http", name), build)
+
+    def close(self):
+        """Close every pooled client that holds connections"""
+        with self._lock:
+            for client in self._clients.values():
+                close = getattr(client, "close", None)
+                if callable(close):
+                    close()
+            self._clients.clear()
+
+
+# Process-wide pool
+client_pool = ClientPool()
@@ -0,0 +1,109 @@
+"""
+Digital Detox Weaver: Provider Latency Tracker
+
+This module implements SOURCE 4 - Orchestration Framework
+Rolling per-provider time-to-first-token (TTFT), streaming throughput and
+failure streaks. LLMRouter records every provider stream here. In latency
+routing mode it ranks healthy providers by expected response time, and it
+takes hedging deadlines from the TTFT p95.
+"""
+
+import threading
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_WINDOW = 50
+# Consecutive failures after which a provider is ranked behind healthy ones
+DEFAULT_FAILURE_THRESHOLD = 3
+# Samples needed before a provider's quantiles are trusted
+MIN_SAMPLES = 5
+# Response size used to turn throughput into expected time until enough lengths are seen
+DEFAULT_RESPONSE_CHARS = 2000
+
+
+class LatencyTracker:
+    """Thread-safe rolling windows of the last ``window`` observations per provider"""
+
+    def __init__(self, window: int = DEFAULT_WINDOW, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD):
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self._ttft: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._throughput: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._lengths: Deque[int] = deque(maxlen=window)
+        self._failure_streak: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record_first_token(self, provider: str, seconds: float):
+        with self._lock:
+            self._ttft[provider].append(seconds)
+
+    def record_success(self, provider: str, chars: int, streaming_seconds: float):
+        """A completed stream: ``chars`` delivered in ``streaming_seconds`` after the first token"""
+        with self._lock:
+            self._failure_streak[provider] = 0
+            self._lengths.append(chars)
+            if streaming_seconds > 0 and chars:
+                self._throughput[provider].append(chars / streaming_seconds)
+
+    def record_failure(self, provider: str):
+        with self._lock:
+            self._failure_streak[provider] += 1
+
+    def ttft_quantile(self, provider: str, q: float) -> Optional[float]:
+        """TTFT quantile, or None with fewer than MIN_SAMPLES observations"""
+        with self._lock:
+            samples = list(self._ttft[provider])
+        return float(np.quantile(samples, q)) if len(samples) >= MIN_SAMPLES else None
+
+    def throughput(self, provider: str) -> Optional[float]:
+        """Median characters per second while streaming"""
+        with self._lock:
+            samples = list(self._throughput[provider])
+        return float(np.median(samples)) if samples else None
+
+    def healthy(self, provider: str) -> bool:
+        with self._lock:
+            return self._failure_streak[provider] < self.failure_threshold
+
+    def expected_seconds(self, provider: str) -> Optional[float]:
+        """Median TTFT plus the time to stream a typical response, or None without history"""
+        with self._lock:
+            ttft = list(self._ttft[provider])
+            lengths = list(self._lengths)
+        if not ttft:
+            return None
+        seconds = float(np.median(ttft))
+        throughput = self.throughput(provider)
+        if throughput:
+            seconds += (float(np.median(lengths)) if lengths else DEFAULT_RESPONSE_CHARS) / throughput
+        return seconds
+
+    def rank(self, providers: List[str]) -> List[str]:
+        """
+        Healthy providers first, fastest expected first
+
+        Providers without timing history go after measured ones, in their
+        configured order; ties keep the configured order too.
+        """
+        def score(indexed):
+            index, provider = indexed
+            expected = self.expected_seconds(provider)
+            return (not self.healthy(provider), expected is None, expected or 0.0, index)
+
+        return [provider for _, provider in sorted(enumerate(providers), key=score)]
+
+    def snapshot(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Current TTFT p50/p95, throughput and failure streak per provider"""
+        with self._lock:
+            providers = set(self._ttft) | set(self._failure_streak)
+        return {
+            provider: {
+                "ttft_p50": self.ttft_quantile(provider, 0.5),
+                "ttft_p95": self.ttft_quantile(provider, 0.95),
+                "chars_per_second": self.throughput(provider),
+                "failure_streak": self._failure_streak[provider],
+            }
+            for provider in sorted(providers)
+        }
@@ -1,15 +1,33 @@
 import os
+import asyncio
 import logging
-from typing import Iterator, Optional
-from anthropic import Anthropic as AnthropicClient
+import queue
+import threading
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterator, List, Optional
 import google.generativeai as genai
 # import boto3  # Optional AWS dependency
 import json
 from dotenv import load_dotenv
 
+from .circuit_breaker import (
+    OPEN, REQUEST_TIMEOUT, RETRY_ATTEMPTS, CircuitBreakers, backoff_delay, circuit_breakers, is_retryable
+)
+from .client_pool import ClientPool, client_pool
+from .latency import LatencyTracker
+from .prompt_cache import PromptCacheStats, split_prefix
+from .rate_limiter import INTERACTIVE, LimiterTimeout, RateLimiters, rate_limiters
+from .response_cache import DEFAULT_MAX_BYTES, DEFAULT_TTL_SECONDS, ResponseCache
+from .tokens import estimate_tokens, tokens_for_chars
+
 load_dotenv(".env.local")
 logger = logging.getLogger(__name__)
 
+# config.CACHE_DIR; the root config module is not importable from every entry point
+CACHE_PATH = Path(__file__).resolve().parents[2] / "cache" / "llm_responses.sqlite"
+
 class LLMRouter:
     """
     Digital Detox Weaver: Multi-Provider LLM Router
@@ -17,48 +35,122 @@ class LLMRouter:
     This module implements SOURCE 4 - Orchestration Framework
     Routes requests to appropriate LLM provider with automatic failover
     Supports: Claude, Gemini, AWS Bedrock, OpenAI
+    
+    ``agenerate`` is the async counterpart of ``generate``: each stream runs in
+    a bounded thread pool and hands chunks to the event loop, so independent
+    agent steps overlap their network latency instead of blocking the loop.
+    
+    With LLM_RESPONSE_CACHE=1, completed responses are kept in a persistent
+    ``ResponseCache`` (config.CACHE_DIR/llm_responses.sqlite) and identical
+    requests replay them as the same chunk stream without a provider call.
+    
+    Every provider stream feeds a rolling ``LatencyTracker``. LLM_ROUTING=latency
+    tries healthy providers fastest-first instead of primary-then-fallback, and
+    LLM_HEDGE=1 starts the next provider when the first token is later than the
+    current provider's TTFT p95, keeping whichever stream answers first.
+    
+    Each provider sits behind a shared circuit breaker. Failures before the
+    first token are retried up to ``llm_config.retry_attempts`` times with
+    jittered exponential backoff, within ``llm_config.timeout`` seconds per
+    request. While a breaker is open its provider fails in microseconds and
+    requests go straight to the next provider.
+    
+    Every provider call is admitted by the shared per-provider ``rate_limiters``
+    (max concurrent streams, RPM, TPM), with ``INTERACTIVE`` requests queued
+    ahead of ``BATCH`` ones.
+    
+    A static ``prefix`` shared by many prompts (the data sources context) is
+    moved into the system prompt, which Claude receives as a cacheable block
+    (LLM_PROMPT_CACHE, on by default); ``prompt_cache`` counts prefix reuse and
+    the provider's cache reads per provider.
     """
     
-    def __init__(self):
+    def __init__(self, clients: Optional[ClientPool] = None, breakers: Optional[CircuitBreakers] = None,
+                 limiters: Optional[RateLimiters] = None):
         self.primary_provider = os.getenv("LLM_PROVIDER", "claude")
         self.fallback_provider = os.getenv("FALLBACK_PROVIDER", "gemini")
         
+        # Worker threads for async streams (one per concurrent request)
+        self.async_workers = int(os.getenv("LLM_ASYNC_WORKERS", "4"))
+        self._executor = ThreadPoolExecutor(max_workers=self.async_workers, thread_name_prefix="llm-stream")
+        
+        # Provider selection: "fixed" (primary, then fallback) or "latency"
+        self.routing = os.getenv("LLM_ROUTING", "fixed")
+        self.hedge = os.getenv("LLM_HEDGE", "0").lower() in ("1", "true", "yes")
+        # Hedge delay before a provider has enough TTFT samples for a p95
+        self.hedge_default_seconds = float(os.getenv("LLM_HEDGE_DEFAULT_SECONDS", "5"))
+        self.hedge_min_seconds = float(os.getenv("LLM_HEDGE_MIN_SECONDS", "0.25"))
+        self.latency = LatencyTracker()
+        
+        # Failure handling (LLMConfig.retry_attempts / timeout)
+        self.breakers = breakers or circuit_breakers
+        self.retry_attempts = RETRY_ATTEMPTS
+        self.timeout = REQUEST_TIMEOUT
+        self.backoff_base = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+        
+        # Admission control shared by every router and the RAG fetcher
+        self.limiters = limiters or rate_limiters
+        self.hedges = 0
+        self.hedge_wins = 0
+        
+        # Provider-side caching of the static prompt prefix
+        self.prompt_caching = os.getenv("LLM_PROMPT_CACHE", "1").lower() in ("1", "true", "yes")
+        self.prompt_cache = PromptCacheStats()
+        
+        # Opt-in persistent response cache
+        self.response_cache: Optional[ResponseCache] = None
+        if os.getenv("LLM_RESPONSE_CACHE", "0").lower() in ("1", "true", "yes"):
+            self.response_cache = ResponseCache(
+                Path(os.getenv("LLM_CACHE_PATH", str(CACHE_PATH))),
+                ttl_seconds=float(os.getenv("LLM_CACHE_TTL", str(DEFAULT_TTL_SECONDS))),
+                max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", str(DEFAULT_MAX_BYTES / 2**20))) * 2**20)
+            )
+            logger.info(f"✓ LLM response cache enabled ({self.response_cache.path})")
+        
         logger.info(f"Initializing LLM Router: Primary={self.primary_provider}, Fallback={self.fallback_provider}")
         
-        # Initialize clients
+        # Initialize clients (shared, pooled connections; see client_pool)
+        self.clients = clients or client_pool
         if os.getenv("CLAUDE_API_KEY"):
-            self.claude_client = AnthropicClient(api_key=os.getenv("CLAUDE_API_KEY"))
+            self.claude_client = self.clients.claude()
             logger.info("✓ Claude client initialized")
         
         if os.getenv("GEMINI_API_KEY"):
-            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
             logger.info("✓ Gemini client initialized")
         
         # AWS Bedrock optional
         self.bedrock_client = None
         if os.getenv("AWS_ACCESS_KEY_ID"):
-            try:
-                import boto3
-                self.bedrock_client = boto3.client(
-                    "bedrock-runtime",
-                    region_name=os.getenv("AWS_REGION", "us-east-1"),
-                    aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-                    aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY")
-                )
+            self.bedrock_client = self.clients.bedrock()
+            if self.bedrock_client:
                 logger.info("✓ AWS Bedrock client initialized")
-            except ImportError:
+            else:
                 logger.info("⚠️ AWS Bedrock not available (boto3 not installed)")
         
         if os.getenv("OPENAI_API_KEY"):
             logger.info("✓ OpenAI API key configured")
     
+    def model_name(self, provider: Optional[str] = None) -> str:
+        """Model the given provider (default: primary) is called with"""
+        provider = provider or self.primary_provider
+        if provider == "claude":
+            return os.getenv("PRIMARY_MODEL", "claude-3-5-sonnet-20241022")
+        if provider == "gemini":
+            return os.getenv("PRIMARY_MODEL", "gemini-2.0-flash-exp")
+        if provider == "aws":
+            return os.getenv("AWS_BEDROCK_MODEL_ID", "")
+        return os.getenv("PRIMARY_MODEL", "")
+    
     def generate(
         self,
         prompt: str,
         system: str = "",
         temperature: float = 0.7,
         max_tokens: int = 4096,
-        streaming: bool = True
+        streaming: bool = True,
+        priority: int = INTERACTIVE,
+        prefix: str = "",
+        served: Optional[dict] = None
     ) -> Iterator[str]:
         """
         Generate response from primary provider with fallback
@@ -69,61 +161,344 @@ class LLMRouter:
             temperature: Temperature setting (0-1)
             max_tokens: Maximum tokens to generate
             streaming: Enable streaming responses
+            priority: INTERACTIVE (someone is waiting) or BATCH (workflow steps)
+            prefix: Static start of ``prompt`` shared with other requests, sent as a cacheable system block
+            served: Filled with the ``provider`` and ``chunks`` of a complete answer; left
+                empty when every provider failed or the text mixes a partial answer with a fallback's
         
         Yields:
             Text chunks from LLM
         """
+        prompt, system = split_prefix(prompt, system, prefix)
+        served = {} if served is None else served
+        cache = self.response_cache
+        if cache is None:
+            yield from self._provider_generate(prompt, system, temperature, max_tokens, streaming, served, priority)
+            return
         
-        try:
-            if self.primary_provider == "claude":
-                yield from self._claude_generate(prompt, system, temperature, max_tokens, streaming)
-            elif self.primary_provider == "gemini":
-                yield from self._gemini_generate(prompt, system, temperature, max_tokens, streaming)
-            elif self.primary_provider == "aws":
-                yield from self._aws_generate(prompt, system, temperature, max_tokens, streaming)
-            elif self.primary_provider == "openai":
-                yield from self._openai_generate(prompt, system, temperature, max_tokens, streaming)
-        except Exception as e:
-            logger.warning(f"Primary provider ({self.primary_provider}) failed: {e}. Attempting fallback...")
+        # Entries are keyed by the provider that served them; a request replays the
+        # entry of the provider routing would try first, so a fallback's answer is
+        # only reused while that fallback is the preferred provider
+        def key(provider):
+            return ResponseCache.key(f"{provider}/{self.model_name(provider)}", prompt, system, temperature, max_tokens)
+        
+        provider = self.provider_order()[0]
+        cached = cache.get(key(provider))
+        if cached is not None:
+            logger.info(f"✓ Response cache hit ({cache.hits} hits, {cache.misses} misses)")
+            yield from cached
+            served.update(provider=provider, chunks=cached)
+            return
+        
+        # Only responses streamed to completion without a provider error are stored
+        for chunk in self._provider_generate(prompt, system, temperature, max_tokens, streaming, served, priority):
+            yield chunk
+        if served:
+            cache.put(key(served["provider"]), served["chunks"])
+    
+    def provider_order(self) -> List[str]:
+        """Providers to try for the next request, best first"""
+        providers = list(dict.fromkeys([self.primary_provider, self.fallback_provider]))
+        if self.routing == "latency":
+            providers = self.latency.rank(providers)
+        # Providers with an open circuit go last (they fail fast anyway)
+        return sorted(providers, key=lambda provider: self.breakers.get(provider).state == OPEN)
+    
+    def hedge_deadline(self, provider: str) -> float:
+        """Seconds to wait for ``provider``'s first token before hedging"""
+        p95 = self.latency.ttft_quantile(provider, 0.95)
+        return max(self.hedge_min_seconds, p95 if p95 is not None else self.hedge_default_seconds)
+    
+    def _provider_generate(self, prompt: str, system: str, temperature: float, max_tokens: int,
+                           streaming: bool, record: Optional[dict] = None, priority: int = INTERACTIVE) -> Iterator[str]:
+        """
+        Providers in ``provider_order``, falling back on failure; fills
+        ``record`` with a cacheable response's ``chunks`` and the ``provider``
+        that served it
+        
+        Nothing is recorded when every provider fails, or when a provider
+        failed after it had already streamed part of its answer.
+        """
+        args = (prompt, system, temperature, max_tokens, streaming)
+        remaining = self.provider_order()
+        chunks = []
+        partial = False
+        first_error = None
+        while remaining:
+            provider = remaining.pop(0)
+            winner = [provider]
+            if self.hedge and remaining:
+                backup = remaining.pop(0)
+                winner = []
+                stream = self._hedged_stream(provider, backup, args, priority, winner)
+                provider = f"{provider}+{backup}"
+            else:
+                stream = self._provider_stream(provider, *args, priority=priority)
             try:
-                if self.fallback_provider == "gemini" or self.primary_provider != "gemini":
-                    yield from self._gemini_generate(prompt, system, temperature, max_tokens, streaming)
-                elif self.fallback_provider == "aws":
-                    yield from self._aws_generate(prompt, system, temperature, max_tokens, streaming)
+                for chunk in stream:
+                    chunks.append(chunk)
+                    yield chunk
+                break
+            except Exception as e:
+                first_error = first_error or e
+                partial, chunks = partial or bool(chunks), []
+                if remaining:
+                    logger.warning(f"Provider ({provider}) failed: {e}. Attempting fallback...")
                 else:
+                    logger.error(f"Provider ({provider}) failed: {e}")
+        else:
+            yield f"Error: Both primary and fallback providers failed. {str(first_error)}"
+            return
+        if record is not None and not partial:
+            record.update(provider=winner[0], chunks=chunks)
+    
+    def _provider_stream(self, provider: str, prompt: str, system: str, temperature: float,
+                         max_tokens: int, streaming: bool, priority: int = INTERACTIVE) -> Iterator[str]:
+        """
+        One provider's stream through its circuit breaker and rate limiter,
+        timed into ``self.latency``
+        
+        The limiter permit is held for the whole stream and charged the
+        actual prompt + response size when it ends. Time spent queued counts
+        against the request timeout. A request that times out in the queue
+        before reaching the provider gives back a half-open probe it claimed.
+        
+        Failures before the first token are retried with jittered backoff;
+        once text has been streamed a failure propagates, since the caller
+        already has part of the answer. The breaker sees the request as one
+        call: a single failure is recorded once its retries are used up.
+        """
+        generators = {
+            "claude": self._claude_generate,
+            "gemini": self._gemini_generate,
+            "aws": self._aws_generate,
+            "openai": self._openai_generate,
+        }
+        if provider not in generators:
+            raise ValueError(f"Unknown LLM provider: {provider}")
+        
+        breaker = self.breakers.get(provider)
+        limiter = self.limiters.get(provider)
+        prompt_tokens = estimate_tokens(prompt) + estimate_tokens(system)
+        deadline = time.perf_counter() + self.timeout
+        attempt = 0
+        while True:
+            if not attempt:
+                breaker.before_call()
+            try:
+                permit = limiter.acquire(prompt_tokens + max_tokens, priority, timeout=deadline - time.perf_counter())
+            except LimiterTimeout:
+                if attempt:
+                    # Queued for a retry after the provider failed this request
+                    breaker.record_failure()
+                else:
+                    breaker.release_probe()
+                raise
+            self.prompt_cache.record_request(provider, system)
+            stream = generators[provider](prompt, system, temperature, max_tokens, streaming)
+            start = time.perf_counter()
+            first_token = None
+            chars = 0
+            try:
+                for chunk in stream:
+                    if first_token is None:
+                        first_token = time.perf_counter()
+                        self.latency.record_first_token(provider, first_token - start)
+                    chars += len(chunk)
+                    yield chunk
+            except Exception as e:
+                self.latency.record_failure(provider)
+                delay = backoff_delay(attempt, self.backoff_base)
+                if (first_token is not None or attempt >= self.retry_attempts or not is_retryable(e)
+                        or time.perf_counter() + delay >= deadline):
+                    breaker.record_failure()
                     raise
-            except Exception as fallback_error:
-                logger.error(f"Fallback provider also failed: {fallback_error}")
-                yield f"Error: Both primary and fallback providers failed. {str(e)}"
+                attempt += 1
+                logger.warning(f"{provider} failed ({e}); retry {attempt}/{self.retry_attempts} in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+            finally:
+                stream.close()
+                permit.actual_tokens = prompt_tokens + tokens_for_chars(chars)
+                permit.release()
+            breaker.record_success()
+            self.latency.record_success(provider, chars, time.perf_counter() - (first_token or start))
+            return
+    
+    def _hedged_stream(self, first: str, second: str, args: tuple, priority: int = INTERACTIVE,
+                       winner_out: Optional[list] = None) -> Iterator[str]:
+        """
+        Stream from ``first``; if its first token misses ``hedge_deadline``,
+        also start ``second`` and keep whichever produces a token first
+        (appended to ``winner_out``)
+        
+        A provider that fails before its first token hands over to the other
+        one immediately. The losing stream is cancelled after its next chunk
+        (a blocking provider call cannot be interrupted sooner).
+        """
+        events: queue.Queue = queue.Queue()
+        lanes = {}
+        
+        def start(provider):
+            cancelled = lanes[provider] = threading.Event()
+            
+            def pump():
+                stream = self._provider_stream(provider, *args, priority=priority)
+                try:
+                    for chunk in stream:
+                        if cancelled.is_set():
+                            return
+                        events.put((provider, "chunk", chunk))
+                    events.put((provider, "done", None))
+                except Exception as e:
+                    events.put((provider, "error", e))
+                finally:
+                    stream.close()
+            
+            threading.Thread(target=pump, daemon=True, name=f"llm-hedge-{provider}").start()
+        
+        deadline = time.perf_counter() + self.hedge_deadline(first)
+        start(first)
+        winner = None
+        failures = {}
+        try:
+            while True:
+                timeout = None
+                if winner is None and second not in lanes:
+                    timeout = max(0.0, deadline - time.perf_counter())
+                try:
+                    provider, kind, value = events.get(timeout=timeout)
+                except queue.Empty:
+                    logger.info(f"⚡ No first token from {first} within {self.hedge_deadline(first):.2f}s; hedging with {second}")
+                    self.hedges += 1
+                    start(second)
+                    continue
+                
+                if winner is None:
+                    if kind == "error":
+                        failures[provider] = value
+                        if len(failures) == 2:
+                            raise failures[first]
+                        if second not in lanes:
+                            start(second)
+                        continue
+                    winner = provider
+                    if winner_out is not None:
+                        winner_out.append(winner)
+                    for other, cancelled in lanes.items():
+                        if other != winner:
+                            cancelled.set()
+                    if winner == second:
+                        self.hedge_wins += 1
+                        logger.info(f"⚡ Hedged request won by {second}")
+                
+                if provider != winner:
+                    continue
+                if kind == "chunk":
+                    yield value
+                elif kind == "done":
+                    return
+                else:
+                    raise value
+        finally:
+            for cancelled in lanes.values():
+                cancelled.set()
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        system: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        streaming: bool = True,
+        priority: int = INTERACTIVE,
+        prefix: str = "",
+        served: Optional[dict] = None
+    ) -> AsyncIterator[str]:
+        """
+        Async streaming version of ``generate``
+        
+        The synchronous provider stream is consumed in a worker thread and its
+        chunks are forwarded through an asyncio queue. Leaving the ``async for``
+        early stops the worker after its current chunk. ``served`` is filled as
+        in ``generate`` by the time the ``async for`` ends.
+        
+        Yields:
+            Text chunks from LLM
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        cancelled = threading.Event()
+        done = object()
+        
+        def put(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # Event loop already closed; nobody is listening any more
+                cancelled.set()
+        
+        def pump():
+            stream = self.generate(prompt, system, temperature, max_tokens, streaming, priority=priority, prefix=prefix,
+                                   served=served)
+            try:
+                for chunk in stream:
+                    if cancelled.is_set():
+                        break
+                    put(chunk)
+            except Exception as e:
+                put(e)
+            finally:
+                stream.close()
+                put(done)
+        
+        loop.run_in_executor(self._executor, pump)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            cancelled.set()
+    
+    def _claude_system(self, system: str):
+        """The system prompt as one block cached by the provider, when prompt caching is on"""
+        if self.prompt_caching and system:
+            return [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+        return system
     
     def _claude_generate(self, prompt: str, system: str, temperature: float, max_tokens: int, streaming: bool) -> Iterator[str]:
         """Generate using Claude"""
         if streaming:
             with self.claude_client.messages.stream(
-                model=os.getenv("PRIMARY_MODEL", "claude-3-5-sonnet-20241022"),
+                model=self.model_name("claude"),
                 max_tokens=max_tokens,
+                timeout=self.timeout,
                 temperature=temperature,
-                system=system,
+                system=self._claude_system(system),
                 messages=[{"role": "user", "content": prompt}]
             ) as stream:
                 for text in stream.text_stream:
                     yield text
+                self.prompt_cache.record_usage("claude", stream.get_final_message().usage)
         else:
             response = self.claude_client.messages.create(
-                model=os.getenv("PRIMARY_MODEL", "claude-3-5-sonnet-20241022"),
+                model=self.model_name("claude"),
                 max_tokens=max_tokens,
+                timeout=self.timeout,
                 temperature=temperature,
-                system=system,
+                system=self._claude_system(system),
                 messages=[{"role": "user", "content": prompt}]
             )
+            self.prompt_cache.record_usage("claude", response.usage)
             yield response.content.text
     
     def _gemini_generate(self, prompt: str, system: str, temperature: float, max_tokens: int, streaming: bool) -> Iterator[str]:
         """Generate using Gemini"""
-        model = genai.GenerativeModel(
-            os.getenv("PRIMARY_MODEL", "gemini-2.0-flash-exp"),
-            system_instruction=system
-        )
+        model = self.clients.gemini_model(self.model_name("gemini"), system)
         
         if streaming:
             response = model.generate_content(
@@ -132,13 +507,14 @@ class LLMRouter:
                 generation_config=genai.types.GenerationConfig(
                     temperature=temperature,
                     max_output_tokens=max_tokens
-                )
+                ),
+                request_options={"timeout": self.timeout}
             )
             for chunk in response:
                 if chunk.text:
                     yield chunk.text
         else:
-            response = model.generate_content(prompt)
+            response = model.generate_content(prompt, request_options={"timeout": self.timeout})
             yield response.text
     
     def _aws_generate(self, prompt: str, system: str, temperature: float, max_tokens: int, streaming: bool) -> Iterator[str]:
@@ -159,7 +535,7 @@ class LLMRouter:
         
         if streaming:
             response = self.bedrock_client.invoke_model_with_response_stream(
-                modelId=os.getenv("AWS_BEDROCK_MODEL_ID"),
+                modelId=self.model_name("aws"),
                 body=body
             )
             for event in response.get('body', []):
@@ -168,7 +544,7 @@ class LLMRouter:
                     yield chunk['text']
         else:
             response = self.bedrock_client.invoke_model(
-                modelId=os.getenv("AWS_BEDROCK_MODEL_ID"),
+                modelId=self.model_name("aws"),
                 body=body
             )
             result = json.loads(response['body'].read())
@@ -0,0 +1,89 @@
+"""
+Digital Detox Weaver: Prompt Prefix Caching
+
+This module implements SOURCE 4 - Orchestration Framework
+Every agent prompt starts with the same static block
+(``AnalysisPrompts.data_sources_context()``) and every agent has a fixed system
+prompt. ``split_prefix`` moves the static block out of the user prompt and in
+front of the system prompt, so all requests of an agent open with one
+identical system block:
+
+- Claude gets that block marked with ``cache_control``; later requests read
+  the processed prefix from the provider's cache instead of prefilling it
+- Gemini models are built once per system instruction by the client pool, so
+  the block is set up once per prefix hash and reused
+- other providers see the static text first, where their own automatic
+  prefix caching applies
+
+``PromptCacheStats`` counts, per provider, requests, requests whose prefix
+was already sent, and the cache read/write tokens Claude reports.
+"""
+
+import hashlib
+import threading
+from typing import Dict, Optional, Set, Tuple
+
+
+def prefix_digest(text: str) -> str:
+    """Short stable identifier of a static prefix"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def split_prefix(prompt: str, system: str, prefix: str) -> Tuple[str, str]:
+    """
+    (prompt, system) with ``prefix`` moved from the start of the prompt to the
+    start of the system prompt
+
+    Requests whose prompt does not start with ``prefix`` are returned unchanged.
+    """
+    if not prefix or not prompt.startswith(prefix):
+        return prompt, system
+    static = prefix.strip()
+    return prompt[len(prefix):].lstrip("\n"), f"{static}\n\n{system}" if system else static
+
+
+class PromptCacheStats:
+    """Per-provider prefix reuse and provider-reported cache tokens"""
+
+    def __init__(self):
+        self._seen: Dict[str, Set[str]] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _provider(self, provider: str) -> Dict[str, int]:
+        return self._stats.setdefault(provider, {
+            "requests": 0, "prefix_reuses": 0, "cache_read_tokens": 0, "cache_write_tokens": 0, "input_tokens": 0
+        })
+
+    def record_request(self, provider: str, system: str) -> bool:
+        """Count a request; True if this provider has been sent the same system block before"""
+        if not system:
+            return False
+        digest = prefix_digest(system)
+        with self._lock:
+            stats = self._provider(provider)
+            stats["requests"] += 1
+            seen = self._seen.setdefault(provider, set())
+            reused = digest in seen
+            seen.add(digest)
+            stats["prefix_reuses"] += reused
+            return reused
+
+    def record_usage(self, provider: str, usage: Optional[object]):
+        """Add the token counts from a provider's usage object (Anthropic ``Usage``)"""
+        if usage is None:
+            return
+        with self._lock:
+            stats = self._provider(provider)
+            stats["cache_read_tokens"] += getattr(usage, "cache_read_input_tokens", None) or 0
+            stats["cache_write_tokens"] += getattr(usage, "cache_creation_input_tokens", None) or 0
+            stats["input_tokens"] += getattr(usage, "input_tokens", None) or 0
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Counters per provider, plus the share of prompt tokens served from the provider cache"""
+        with self._lock:
+            result = {provider: dict(stats) for provider, stats in self._stats.items()}
+        for stats in result.values():
+            total = stats["cache_read_tokens"] + stats["cache_write_tokens"] + stats["input_tokens"]
+            stats["cached_token_share"] = stats["cache_read_tokens"] / total if total else 0.0
+        return result
@@ -0,0 +1,224 @@
+"""
+Digital Detox Weaver: Provider Rate Limiter
+
+This module implements SOURCE 4 - Orchestration Framework
+Process-wide admission control for LLM calls, one limiter per provider:
+
+- at most ``max_concurrent`` streams in flight
+- requests per minute and tokens per minute as token buckets (0 = unlimited)
+- a priority queue in front of them: interactive dashboard requests are
+  admitted before batch orchestrator steps, FIFO within a priority
+
+Token cost is estimated up front (prompt + max_tokens) and corrected to the
+actual prompt + response size when the stream finishes. Queue depth and wait
+times are kept for monitoring.
+"""
+
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 0
+BATCH = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+DEFAULT_MAX_CONCURRENT = 8
+WAIT_WINDOW = 1000
+
+
+class LimiterTimeout(TimeoutError):
+    """No capacity freed up before the caller's deadline"""
+
+
+class TokenBucket:
+    """``capacity`` units refilled continuously at ``per_minute`` per minute; starts full"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available (after ``refill``)"""
+        return max(0.0, (amount - self.level) / self.rate) if self.rate else 0.0
+
+
+@dataclass
+class Permit:
+    """Admission to call a provider; release it (or use it as a context manager) when the stream ends"""
+    limiter: "ProviderLimiter"
+    tokens: int
+    priority: int
+    waited: float
+    actual_tokens: Optional[int] = None
+    released: bool = field(default=False, repr=False)
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.limiter._release(self)
+
+    def __enter__(self) -> "Permit":
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class ProviderLimiter:
+    """Concurrency cap, RPM/TPM buckets and a priority queue for one provider"""
+
+    def __init__(self, name: str, max_concurrent: int = DEFAULT_MAX_CONCURRENT, rpm: float = 0, tpm: float = 0):
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.in_flight = 0
+        self.admitted = 0
+        self.max_queue_depth = 0
+        self._queue: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._waits: Deque[Tuple[int, float]] = deque(maxlen=WAIT_WINDOW)
+        self._cond = threading.Condition()
+
+    @property
+    def queue_depth(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def _ready_in(self, tokens: int, now: float) -> float:
+        """Seconds until both buckets can cover this request"""
+        wait = 0.0
+        if self.requests:
+            self.requests.refill(now)
+            wait = self.requests.wait_time(1)
+        if self.tokens and tokens:
+            self.tokens.refill(now)
+            wait = max(wait, self.tokens.wait_time(tokens))
+        return wait
+
+    def acquire(self, tokens: int = 0, priority: int = INTERACTIVE, timeout: Optional[float] = None) -> Permit:
+        """
+        Block until this request is at the head of the queue and within all limits
+
+        Raises LimiterTimeout if that takes longer than ``timeout`` seconds.
+        """
+        if self.tokens:
+            tokens = min(tokens, int(self.tokens.capacity))
+        enqueued = time.monotonic()
+        deadline = enqueued + timeout if timeout is not None else None
+        entry = (priority, next(self._sequence))
+        with self._cond:
+            heapq.heappush(self._queue, entry)
+            self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = None
+                    if self._queue[0] == entry and self.in_flight < self.max_concurrent:
+                        wait = self._ready_in(tokens, now)
+                        if wait <= 0:
+                            break
+                    if deadline is not None:
+                        if now >= deadline:
+                            raise LimiterTimeout(f"{self.name}: no capacity within {timeout:.1f}s "
+                                                 f"({len(self._queue)} queued, {self.in_flight} in flight)")
+                        wait = min(wait, deadline - now) if wait is not None else deadline - now
+                    self._cond.wait(wait)
+            except BaseException:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+                raise
+
+            heapq.heappop(self._queue)
+            self.in_flight += 1
+            self.admitted += 1
+            if self.requests:
+                self.requests.level -= 1
+            if self.tokens:
+                self.tokens.level -= tokens
+            waited = now - enqueued
+            self._waits.append((priority, waited))
+            # The next request in line may also fit now
+            self._cond.notify_all()
+        return Permit(self, tokens, priority, waited)
+
+    def _release(self, permit: Permit):
+        with self._cond:
+            self.in_flight -= 1
+            if self.tokens and permit.actual_tokens is not None:
+                # Refund an overestimate, or charge the overrun against future requests
+                self.tokens.refill(time.monotonic())
+                self.tokens.level = min(self.tokens.capacity, self.tokens.level + permit.tokens - permit.actual_tokens)
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, object]:
+        """Queue depth, in-flight streams and wait-time percentiles (overall and per priority)"""
+        with self._cond:
+            waits = list(self._waits)
+            stats: Dict[str, object] = {
+                "queue_depth": len(self._queue),
+                "max_queue_depth": self.max_queue_depth,
+                "in_flight": self.in_flight,
+                "admitted": self.admitted,
+            }
+        seconds = np.array([wait for _, wait in waits])
+        stats["wait_p50"] = float(np.percentile(seconds, 50)) if len(seconds) else 0.0
+        stats["wait_p95"] = float(np.percentile(seconds, 95)) if len(seconds) else 0.0
+        for priority, name in PRIORITY_NAMES.items():
+            by_priority = [wait for p, wait in waits if p == priority]
+            stats[f"wait_mean_{name}"] = float(np.mean(by_priority)) if by_priority else 0.0
+        return stats
+
+
+class RateLimiters:
+    """
+    Lazily created limiters by provider name
+
+    Limits come from LLM_MAX_STREAMS, LLM_RPM and LLM_TPM, overridable per
+    provider (e.g. LLM_RPM_CLAUDE=50).
+    """
+
+    def __init__(self):
+        self._limiters: Dict[str, ProviderLimiter] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _setting(name: str, provider: str, default: str) -> float:
+        return float(os.getenv(f"{name}_{provider.upper()}", os.getenv(name, default)))
+
+    def get(self, provider: str) -> ProviderLimiter:
+        with self._lock:
+            if provider not in self._limiters:
+                self._limiters[provider] = ProviderLimiter(
+                    provider,
+                    max_concurrent=int(self._setting("LLM_MAX_STREAMS", provider, str(DEFAULT_MAX_CONCURRENT))),
+                    rpm=self._setting("LLM_RPM", provider, "0"),
+                    tpm=self._setting("LLM_TPM", provider, "0")
+                )
+            return self._limiters[provider]
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {limiter.name: limiter.stats() for limiter in limiters}
+
+
+# Process-wide limiters, shared by the router and the RAG fetcher
+rate_limiters = RateLimiters()
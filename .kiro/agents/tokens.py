@@ -0,0 +1,21 @@
+"""
+Digital Detox Weaver: Token Estimates
+
+This module implements SOURCE 4 - Orchestration Framework
+The one character-based token estimate used by prompt budgets, the rate
+limiter and the router's usage accounting. It needs no tokenizer and no
+provider, so budgets and limits can be checked before a call is made.
+"""
+
+# Rough English/markdown ratio, good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+
+def tokens_for_chars(chars: int) -> int:
+    """Approximate token count of ``chars`` characters of text"""
+    return -(-chars // CHARS_PER_TOKEN)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of ``text``"""
+    return tokens_for_chars(len(text))
@@ -6,16 +6,23 @@ Contains specialized prompt templates for 4 agents:
 - Visualization prompts (chart design, accessibility)
 - Insight prompts (mechanisms, evidence synthesis)
 - Report prompts (comprehensive narrative, policy framing)
+
+Prompts embedding upstream outputs are fitted to per-step token budgets (budget.py)
 """
 
 from .analysis_prompts import AnalysisPrompts
 from .visualization_prompts import VisualizationPrompts
 from .insight_prompts import InsightPrompts
 from .report_prompts import ReportPrompts
+from .budget import STEP_BUDGETS, budget_prompt, compress_markdown, fit_sections
 
 __all__ = [
     "AnalysisPrompts",
     "VisualizationPrompts",
     "InsightPrompts",
     "ReportPrompts",
+    "STEP_BUDGETS",
+    "budget_prompt",
+    "compress_markdown",
+    "fit_sections",
 ]
\ No newline at end of file
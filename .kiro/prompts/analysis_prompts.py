@@ -4,8 +4,12 @@ Digital Detox Weaver: Analysis Prompts
 This module implements SOURCE 2 - AI-Generated Insights
 Provides structured prompt templates for 4 specialized agents
 Each prompt incorporates data source context and weaving methodology
+Prompts that embed upstream outputs are kept within per-step token budgets
 """
 
+from .budget import STEP_BUDGETS, budget_prompt
+
+
 class AnalysisPrompts:
     """AI prompts for Digital Detox Weaver data analysis workflows"""
     
@@ -89,8 +93,12 @@ class AnalysisPrompts:
         """
     
     @staticmethod
-    def analysis_prompt(data_summary: str) -> str:
+    def analysis_prompt(data_summary: str, max_tokens: int = STEP_BUDGETS["03_analysis"]) -> str:
         """Comprehensive epidemiological analysis"""
+        return budget_prompt(AnalysisPrompts._analysis_template, max_tokens, data_summary=data_summary)
+    
+    @staticmethod
+    def _analysis_template(data_summary: str) -> str:
         return AnalysisPrompts.data_sources_context() + f"""
         
         STEP 3: ANALYZE SOURCE 1 EPIDEMIOLOGICAL DATA
@@ -143,8 +151,12 @@ class AnalysisPrompts:
         """
     
     @staticmethod
-    def visualization_prompt(analysis: str) -> str:
+    def visualization_prompt(analysis: str, max_tokens: int = STEP_BUDGETS["04_visualization_design"]) -> str:
         """Visualization design specifications"""
+        return budget_prompt(AnalysisPrompts._visualization_template, max_tokens, analysis=analysis)
+    
+    @staticmethod
+    def _visualization_template(analysis: str) -> str:
         return AnalysisPrompts.data_sources_context() + f"""
         
         STEP 4: DESIGN VISUALIZATIONS (PARALLEL)
@@ -195,8 +207,12 @@ class AnalysisPrompts:
         """
     
     @staticmethod
-    def health_insights_prompt(analysis: str) -> str:
+    def health_insights_prompt(analysis: str, max_tokens: int = STEP_BUDGETS["05_health_insights"]) -> str:
         """Health mechanism and insights"""
+        return budget_prompt(AnalysisPrompts._health_insights_template, max_tokens, analysis=analysis)
+    
+    @staticmethod
+    def _health_insights_template(analysis: str) -> str:
         return AnalysisPrompts.data_sources_context() + f"""
         
         STEP 5: GENERATE HEALTH INSIGHTS (PARALLEL)
@@ -246,8 +262,12 @@ class AnalysisPrompts:
         """
     
     @staticmethod
-    def policy_prompt(health_findings: str) -> str:
+    def policy_prompt(health_findings: str, max_tokens: int = STEP_BUDGETS["07_policy_recommendations"]) -> str:
         """Policy design and recommendations"""
+        return budget_prompt(AnalysisPrompts._policy_template, max_tokens, health_findings=health_findings)
+    
+    @staticmethod
+    def _policy_template(health_findings: str) -> str:
         return AnalysisPrompts.data_sources_context() + f"""
         
         STEP 7: DESIGN POLICY RECOMMENDATIONS
@@ -301,8 +321,14 @@ class AnalysisPrompts:
         """
     
     @staticmethod
-    def report_prompt(analysis: str, health_findings: str, policy: str) -> str:
+    def report_prompt(analysis: str, health_findings: str, policy: str,
+                      max_tokens: int = STEP_BUDGETS["08_report"]) -> str:
         """Comprehensive final report"""
+        return budget_prompt(AnalysisPrompts._report_template, max_tokens,
+                             analysis=analysis, health_findings=health_findings, policy=policy)
+    
+    @staticmethod
+    def _report_template(analysis: str, health_findings: str, policy: str) -> str:
         return AnalysisPrompts.data_sources_context() + f"""
         
         STEP 8: GENERATE COMPREHENSIVE FINAL REPORT
@@ -0,0 +1,126 @@
+"""
+Digital Detox Weaver: Prompt Token Budgets
+
+This module implements SOURCE 2 - AI-Generated Insights
+Keeps agent prompts within a per-step token budget. Upstream agent outputs
+embedded in a prompt (the analysis in the visualization prompt, all three
+reports in the final report prompt) are shrunk to what the budget leaves
+after the fixed template:
+
+- sections that already fit are passed through untouched
+- the allowance is shared out smallest section first, so short sections
+  keep their full text and long ones absorb the cut
+- an over-long section is replaced by an extractive summary: headings first,
+  then the sentences with the most numbers, in their original order
+
+Compression is deterministic, so identical upstream outputs give identical
+prompts and the step cache keeps hitting.
+"""
+
+import logging
+import re
+from typing import Callable, Dict, List, Mapping, Tuple
+
+from agents.tokens import CHARS_PER_TOKEN, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Prompt budgets (user prompt only, system prompt excluded) by workflow step
+STEP_BUDGETS: Dict[str, int] = {
+    "03_analysis": 3000,
+    "04_visualization_design": 3000,
+    "05_health_insights": 3500,
+    "07_policy_recommendations": 3500,
+    "08_report": 6000,
+}
+
+HEADING = re.compile(r"^\s*(#{1,6}\s|\*\*[^*]+\*\*:?\s*$)")
+# Sentence ends, but not list numbers ("1.") or common abbreviations
+SENTENCE_BREAK = re.compile(r"(?<=[^\d\s][.!?])(?<!\bvs\.)(?<!\be\.g\.)(?<!\bi\.e\.)\s+(?=[A-Z*(])")
+NUMBER = re.compile(r"\d+(?:\.\d+)?")
+HEADING_SCORE = 10
+MAX_NUMBER_SCORE = 3
+
+
+def _units(text: str) -> List[Tuple[int, int, str]]:
+    """(score, line number, text) for every heading and sentence of ``text``, in order"""
+    units = []
+    for line_no, line in enumerate(text.splitlines()):
+        line = line.rstrip()
+        if not line.strip() or line.strip() == "---":
+            continue
+        if HEADING.match(line):
+            units.append((HEADING_SCORE, line_no, line))
+            continue
+        for i, sentence in enumerate(SENTENCE_BREAK.split(line)):
+            # Quantitative sentences carry the findings; a line's opening sentence carries its topic
+            score = min(len(NUMBER.findall(sentence)), MAX_NUMBER_SCORE) + (i == 0)
+            units.append((score, line_no, sentence))
+    return units
+
+
+def compress_markdown(text: str, max_tokens: int) -> str:
+    """
+    ``text`` if it fits in ``max_tokens``, otherwise an extractive summary that does
+
+    Kept headings and sentences stay in document order and the result ends
+    with a marker giving the original size. Falls back to plain truncation
+    when not even one sentence fits.
+    """
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    marker = f"[... extractive summary of ~{tokens} tokens]"
+    budget = max_tokens - estimate_tokens(marker) - 1
+    if budget <= 0:
+        return ""
+
+    units = _units(text)
+    kept = set()
+    used = 0
+    for position in sorted(range(len(units)), key=lambda i: (-units[i][0], i)):
+        cost = estimate_tokens(units[position][2]) + 1
+        if used + cost <= budget:
+            kept.add(position)
+            used += cost
+
+    lines: Dict[int, List[str]] = {}
+    for position, (_, line_no, unit) in enumerate(units):
+        if position in kept:
+            lines.setdefault(line_no, []).append(unit)
+    body = "\n".join(" ".join(parts) for parts in lines.values())
+    if not body:
+        body = text[:budget * CHARS_PER_TOKEN]
+    return f"{body}\n{marker}"
+
+
+def fit_sections(sections: Mapping[str, str], max_tokens: int) -> Dict[str, str]:
+    """Compress ``sections`` so that together they fit in ``max_tokens``"""
+    sizes = {name: estimate_tokens(text) for name, text in sections.items()}
+    if sum(sizes.values()) <= max_tokens:
+        return dict(sections)
+
+    # Smallest first: each section gets an equal share of what is left, or less if it needs less
+    allowance = {}
+    remaining = max(0, max_tokens)
+    pending = sorted(sections, key=lambda name: sizes[name])
+    for i, name in enumerate(pending):
+        allowance[name] = min(sizes[name], remaining // (len(pending) - i))
+        remaining -= allowance[name]
+
+    fitted = {name: compress_markdown(text, allowance[name]) for name, text in sections.items()}
+    logger.info("✓ Prompt budget: " + ", ".join(
+        f"{name} ~{sizes[name]} -> ~{estimate_tokens(fitted[name])}" for name in sections if fitted[name] != sections[name]
+    ) + f" tokens (allowance {max_tokens})")
+    return fitted
+
+
+def budget_prompt(render: Callable[..., str], max_tokens: int, **sections: str) -> str:
+    """
+    ``render(**sections)`` within ``max_tokens``
+
+    The template's own size is measured by rendering it with empty sections;
+    the sections share whatever is left.
+    """
+    overhead = estimate_tokens(render(**{name: "" for name in sections}))
+    return render(**fit_sections(sections, max_tokens - overhead))
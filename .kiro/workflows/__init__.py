@@ -0,0 +1,18 @@
+"""
+Digital Detox Weaver Workflows Module
+
+Contains the declarative workflow engine:
+- WorkflowStep (a step with the artifacts it consumes and produces)
+- WorkflowScheduler (runs ready steps concurrently, reports the critical path)
+- StepCache (content-addressed agent outputs for skipping and resuming steps)
+"""
+
+from .scheduler import WorkflowReport, WorkflowScheduler, WorkflowStep
+from .step_cache import StepCache
+
+__all__ = [
+    "WorkflowStep",
+    "WorkflowScheduler",
+    "WorkflowReport",
+    "StepCache",
+]
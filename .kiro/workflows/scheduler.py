@@ -0,0 +1,163 @@
+"""
+Digital Detox Weaver: Workflow Scheduler
+
+This module implements SOURCE 4 - Orchestration Framework
+Runs a declarative step graph: every step names the artifacts it reads and
+writes, a step starts as soon as the producers of all its inputs finish, and
+at most ``max_concurrency`` steps run at once. The report includes each step's
+wall-clock window and the critical path, the dependency chain that bounds the
+workflow's end-to-end time.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WorkflowStep:
+    """One unit of work and the artifacts it consumes and produces"""
+    name: str
+    run: Callable[[], Awaitable[object]]
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    description: str = ""
+
+
+@dataclass
+class WorkflowReport:
+    """Per-step (start, end) offsets in seconds from the workflow start, plus the critical path"""
+    timings: Dict[str, Tuple[float, float]]
+    wall_seconds: float
+    critical_path: List[str]
+    critical_path_seconds: float
+
+    @property
+    def durations(self) -> Dict[str, float]:
+        return {name: end - start for name, (start, end) in self.timings.items()}
+
+    @property
+    def serial_seconds(self) -> float:
+        """Time the same steps would take run one after another"""
+        return sum(self.durations.values())
+
+    @property
+    def saved_seconds(self) -> float:
+        return max(0.0, self.serial_seconds - self.wall_seconds)
+
+
+class WorkflowScheduler:
+    """
+    Dependency-driven async step runner
+    
+    Dependencies are derived from artifacts: a step depends on every step
+    that produces one of its inputs. Inputs no step produces are treated as
+    pre-existing and impose no ordering.
+    """
+
+    def __init__(self, steps: List[WorkflowStep], max_concurrency: int = 4):
+        self.steps = {step.name: step for step in steps}
+        if len(self.steps) != len(steps):
+            raise ValueError("Workflow step names must be unique")
+        self.max_concurrency = max(1, max_concurrency)
+
+        producers: Dict[str, str] = {}
+        for step in steps:
+            for artifact in step.outputs:
+                if artifact in producers:
+                    raise ValueError(f"Artifact {artifact} is produced by both {producers[artifact]} and {step.name}")
+                producers[artifact] = step.name
+        self.dependencies = {
+            step.name: sorted({producers[artifact] for artifact in step.inputs if artifact in producers})
+            for step in steps
+        }
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        """Steps in declaration order, each after its dependencies; raises on cycles"""
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str, path: List[str]):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Workflow has a dependency cycle: {' -> '.join(path + [name])}")
+            state[name] = "visiting"
+            for dependency in self.dependencies[name]:
+                visit(dependency, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.steps:
+            visit(name, [])
+        return order
+
+    def critical_path(self, durations: Dict[str, float]) -> Tuple[List[str], float]:
+        """Longest dependency chain by the given step durations"""
+        finish: Dict[str, float] = {}
+        previous: Dict[str, str] = {}
+        for name in self.order:
+            start = 0.0
+            for dependency in self.dependencies[name]:
+                if finish[dependency] > start:
+                    start = finish[dependency]
+                    previous[name] = dependency
+            finish[name] = start + durations.get(name, 0.0)
+
+        last = max(finish, key=finish.get)
+        path = [last]
+        while path[-1] in previous:
+            path.append(previous[path[-1]])
+        return path[::-1], finish[last]
+
+    async def run(self) -> WorkflowReport:
+        """
+        Run every step once its dependencies finish, at most ``max_concurrency`` at a time
+
+        The first failing step stops new steps from starting; steps already
+        running are allowed to finish, then the error is raised.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        done_events = {name: asyncio.Event() for name in self.steps}
+        timings: Dict[str, Tuple[float, float]] = {}
+        failed: List[BaseException] = []
+        workflow_start = time.perf_counter()
+
+        async def run_step(name: str):
+            step = self.steps[name]
+            try:
+                for dependency in self.dependencies[name]:
+                    await done_events[dependency].wait()
+                async with semaphore:
+                    if failed:
+                        return
+                    start = time.perf_counter() - workflow_start
+                    logger.info(f"▶ {name}: {step.description or 'started'}")
+                    try:
+                        await step.run()
+                    except BaseException as e:
+                        failed.append(e)
+                        logger.error(f"✗ {name} failed: {e}")
+                        raise
+                    finally:
+                        timings[name] = (start, time.perf_counter() - workflow_start)
+                logger.info(f"✓ {name} finished in {timings[name][1] - timings[name][0]:.1f}s")
+            finally:
+                # Release dependants either way; they return early once a step failed
+                done_events[name].set()
+
+        results = await asyncio.gather(*(run_step(name) for name in self.order), return_exceptions=True)
+        if failed:
+            raise failed[0]
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        wall = time.perf_counter() - workflow_start
+        path, path_seconds = self.critical_path({name: end - start for name, (start, end) in timings.items()})
+        return WorkflowReport(timings, wall, path, path_seconds)
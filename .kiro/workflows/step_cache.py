@@ -0,0 +1,85 @@
+"""
+Digital Detox Weaver: Workflow Step Cache
+
+This module implements SOURCE 4 - Orchestration Framework
+Content-addressed store for agent step outputs. An entry's key is a hash of
+everything that determines the LLM call: prompt, system prompt, temperature
+and provider/model. Because downstream prompts embed upstream outputs, a
+changed or regenerated step changes the keys of its dependants. Unchanged
+steps are reused, and a rerun after a failure resumes where the last run
+stopped.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the key recipe or entry format changes
+STEP_CACHE_VERSION = 1
+
+
+class StepCache:
+    """
+    One JSON file per (step input hash) under ``directory``
+
+    Steps named in ``force`` skip lookups but still store their fresh output,
+    so the next run reuses it. ``enabled=False`` turns the cache off entirely.
+    """
+
+    def __init__(self, directory: Path, force: Iterable[str] = (), enabled: bool = True):
+        self.directory = Path(directory)
+        self.force = set(force)
+        self.enabled = enabled
+        self.hits: List[str] = []
+        self.misses: List[str] = []
+
+    @staticmethod
+    def key(prompt: str, system: str, temperature: float, model: str) -> str:
+        """SHA-256 over the full step input"""
+        payload = json.dumps(
+            {"version": STEP_CACHE_VERSION, "prompt": prompt, "system": system,
+             "temperature": temperature, "model": model},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, step: str, key: str) -> Optional[str]:
+        """Cached output for this input, or None when missing, forced or disabled"""
+        path = self._path(key)
+        if not self.enabled or step in self.force or not path.exists():
+            self.misses.append(step)
+            return None
+        try:
+            text = json.loads(path.read_text(encoding="utf-8"))["text"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable step cache entry {path.name}: {e}")
+            self.misses.append(step)
+            return None
+        self.hits.append(step)
+        return text
+
+    def put(self, step: str, key: str, text: str, model: str = ""):
+        """Store a step output; written atomically so a crash never leaves a partial entry"""
+        if not self.enabled:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # A temp file per writer: concurrent steps with the same input never share one
+        fd, tmp = tempfile.mkstemp(prefix=f".{key[:12]}.", suffix=".json", dir=self.directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({
+                "step": step,
+                "model": model,
+                "created": datetime.now().isoformat(),
+                "text": text
+            }, f)
+        os.replace(tmp, self._path(key))
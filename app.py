@@ -8,7 +8,9 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from data_generators import get_all_data
+from data_cache import load_datasets
+from policy_simulation import simulate_policies
+from bootstrap import bootstrap_ci
 from pathlib import Path
 try:
     from rag_integration import get_live_health_metrics, get_trending_topics, get_policy_updates
@@ -216,10 +218,15 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Load data
-@st.cache_data
+# Load data (lazily read from the on-disk dataset cache, shared by all sessions)
+@st.cache_resource
 def load_data():
-    return get_all_data()
+    return load_datasets()
+
+# Monte Carlo policy intervals, computed once per policy table
+@st.cache_data
+def load_policy_simulation(policy_data):
+    return simulate_policies(policy_data)
 
 def main():
     # Initialize session state
@@ -551,18 +558,25 @@ def main():
         col1, col2, col3, col4 = st.columns(4)
         
         # KPI cards with RAG integration and fallback
-        global_data = data['global_epidemiology']
+        numeric_cols = ['avg_screen_time_hours', 'depression_rate', 'anxiety_rate', 'sleep_disorders']
+        global_data = data.select('global_epidemiology', ['year'] + numeric_cols)
         latest_data = global_data[global_data['year'] == 2025]
         
         # Ensure we have valid data, fallback to 2024 if 2025 is empty
         if latest_data.empty or latest_data['avg_screen_time_hours'].isna().all():
             latest_data = global_data[global_data['year'] == 2024]
         
-        # RAG Enhancement indicator with fallback
+        # 95% bootstrap CIs across countries for each KPI
+        kpi_ci = bootstrap_ci(latest_data, numeric_cols).set_index('column')
+        
+        # RAG Enhancement indicator with fallback (served from the process-wide
+        # live metrics cache; the Gemini call runs in a background thread)
         if RAG_AVAILABLE:
             try:
                 live_metrics = get_live_health_metrics()
-                if live_metrics.get('status') != 'error':
+                if live_metrics.get('status') == 'refreshing':
+                    st.info("🔴 Live RAG data loading in the background - showing enhanced 2025 projections")
+                elif live_metrics.get('status') != 'error':
                     st.success(f"🔴 Live RAG Data Active - Source: {live_metrics.get('source', 'Gemini API')}")
                 else:
                     st.info("🔴 RAG Fallback Mode - Using enhanced simulated data")
@@ -578,9 +592,10 @@ def main():
             <div class="metric-card">
                 <h3 style="color: #00D4AA; margin-bottom: 0.5rem; font-size: 1rem;">📱 Avg Screen Time (2025)</h3>
                 <h2 style="color: #FAFAFA; margin: 0; font-size: 2.5rem; font-weight: 700;">{:.1f} <span style="font-size: 1rem; color: #B0B0B0;">hours</span></h2>
+                <p style="color: #B0B0B0; margin: 0.25rem 0 0 0; font-size: 0.8rem;">95% CI {:.1f}–{:.1f}</p>
                 <p style="color: #FF6B6B; margin: 0.5rem 0 0 0; font-size: 0.9rem;">↑ 385% since 2010 • 🔴 Live</p>
             </div>
-            """.format(avg_screen_time), unsafe_allow_html=True)
+            """.format(avg_screen_time, kpi_ci.loc['avg_screen_time_hours', 'ci_low'], kpi_ci.loc['avg_screen_time_hours', 'ci_high']), unsafe_allow_html=True)
         
         with col2:
             depression_rate = latest_data['depression_rate'].mean()
@@ -588,9 +603,10 @@ def main():
             <div class="metric-card">
                 <h3 style="color: #00D4AA; margin-bottom: 0.5rem; font-size: 1rem;">😔 Depression Rate</h3>
                 <h2 style="color: #FAFAFA; margin: 0; font-size: 2.5rem; font-weight: 700;">{:.1%}</h2>
+                <p style="color: #B0B0B0; margin: 0.25rem 0 0 0; font-size: 0.8rem;">95% CI {:.1%}–{:.1%}</p>
                 <p style="color: #FF6B6B; margin: 0.5rem 0 0 0; font-size: 0.9rem;">↑ 200% since 2010 • 🔴 Live</p>
             </div>
-            """.format(depression_rate), unsafe_allow_html=True)
+            """.format(depression_rate, kpi_ci.loc['depression_rate', 'ci_low'], kpi_ci.loc['depression_rate', 'ci_high']), unsafe_allow_html=True)
         
         with col3:
             anxiety_rate = latest_data['anxiety_rate'].mean()
@@ -598,9 +614,10 @@ def main():
             <div class="metric-card">
                 <h3 style="color: #00D4AA; margin-bottom: 0.5rem; font-size: 1rem;">😰 Anxiety Rate</h3>
                 <h2 style="color: #FAFAFA; margin: 0; font-size: 2.5rem; font-weight: 700;">{:.1%}</h2>
+                <p style="color: #B0B0B0; margin: 0.25rem 0 0 0; font-size: 0.8rem;">95% CI {:.1%}–{:.1%}</p>
                 <p style="color: #FF6B6B; margin: 0.5rem 0 0 0; font-size: 0.9rem;">↑ 245% since 2010 • 🔴 Live</p>
             </div>
-            """.format(anxiety_rate), unsafe_allow_html=True)
+            """.format(anxiety_rate, kpi_ci.loc['anxiety_rate', 'ci_low'], kpi_ci.loc['anxiety_rate', 'ci_high']), unsafe_allow_html=True)
         
         with col4:
             sleep_disorders = latest_data['sleep_disorders'].mean()
@@ -608,13 +625,13 @@ def main():
             <div class="metric-card">
                 <h3 style="color: #00D4AA; margin-bottom: 0.5rem; font-size: 1rem;">😴 Sleep Disorders</h3>
                 <h2 style="color: #FAFAFA; margin: 0; font-size: 2.5rem; font-weight: 700;">{:.1%}</h2>
+                <p style="color: #B0B0B0; margin: 0.25rem 0 0 0; font-size: 0.8rem;">95% CI {:.1%}–{:.1%}</p>
                 <p style="color: #FF6B6B; margin: 0.5rem 0 0 0; font-size: 0.9rem;">↑ 180% since 2010 • 🔴 Live</p>
             </div>
-            """.format(sleep_disorders), unsafe_allow_html=True)
+            """.format(sleep_disorders, kpi_ci.loc['sleep_disorders', 'ci_low'], kpi_ci.loc['sleep_disorders', 'ci_high']), unsafe_allow_html=True)
         
         # Enhanced global trends chart
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        numeric_cols = ['avg_screen_time_hours', 'depression_rate', 'anxiety_rate', 'sleep_disorders']
         trend_data = global_data.groupby('year')[numeric_cols].mean().reset_index()
         
         fig = px.line(trend_data, x='year', y='avg_screen_time_hours',
@@ -639,7 +656,7 @@ def main():
         age_data = data['age_stratification']
         
         # Vulnerability by age group
-        vulnerability_summary = age_data.groupby('age_group')['vulnerability_multiplier'].first().reset_index()
+        vulnerability_summary = age_data.groupby('age_group', observed=True)['vulnerability_multiplier'].first().reset_index()
         fig = px.bar(vulnerability_summary, x='age_group', y='vulnerability_multiplier',
                     title='Vulnerability Multiplier by Age Group',
                     color='vulnerability_multiplier',
@@ -653,12 +670,18 @@ def main():
         fig2.update_layout(height=400, plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', font_color='#FAFAFA')
         st.plotly_chart(fig2, use_container_width=True)
         
+        # Mean health impact per age group with 95% bootstrap CI
+        age_ci = bootstrap_ci(age_data, ['health_impact_score', 'depression_risk'], by='age_group')
+        st.subheader("Mean Health Impact by Age Group (95% CI)")
+        st.dataframe(age_ci[['age_group', 'column', 'estimate', 'ci_low', 'ci_high']].round(3), hide_index=True, use_container_width=True)
+        
         st.markdown("**Key Finding:** Adolescents (13-17) are **5.5x more vulnerable** than adults (50+)")
     
     with tab3:
         st.header("Platform Comparison")
         
-        platform_data = data['platform_comparison']
+        # Copy: the cached datasets are shared across sessions
+        platform_data = data['platform_comparison'].copy()
         
         # Bubble chart: Engagement vs Harm
         fig = px.scatter(platform_data, x='engagement_score', y='harm_score',
@@ -685,7 +708,8 @@ def main():
         pivot_data = mechanisms_data.pivot_table(values='pathway_strength', 
                                                 index='mechanism', 
                                                 columns='outcome', 
-                                                fill_value=0)
+                                                fill_value=0,
+                                                observed=True)
         
         fig = px.imshow(pivot_data, 
                        title='Mechanism-Outcome Pathway Strengths',
@@ -725,8 +749,15 @@ def main():
         ses_data = data['ses_inequality']
         
         # Health impact by income level
-        ses_summary = ses_data.groupby('income_level')[['health_impact_multiplier', 'screen_time_multiplier', 'access_to_interventions']].mean().reset_index()
+        ses_summary = ses_data.groupby('income_level', observed=True)[['health_impact_multiplier', 'screen_time_multiplier', 'access_to_interventions']].mean().reset_index()
+        # 95% bootstrap CIs across countries, as asymmetric error bars
+        ses_ci = bootstrap_ci(ses_data, ['health_impact_multiplier', 'access_to_interventions'], by='income_level')
+        for column in ['health_impact_multiplier', 'access_to_interventions']:
+            ci = ses_ci[ses_ci['column'] == column].set_index('income_level')
+            ses_summary[f'{column}_plus'] = ses_summary['income_level'].map(ci['ci_high']).astype(float) - ses_summary[column]
+            ses_summary[f'{column}_minus'] = ses_summary[column] - ses_summary['income_level'].map(ci['ci_low']).astype(float)
         fig = px.bar(ses_summary, x='income_level', y='health_impact_multiplier',
+                    error_y='health_impact_multiplier_plus', error_y_minus='health_impact_multiplier_minus',
                     title='Health Impact Multiplier by Income Level',
                     color='health_impact_multiplier',
                     color_continuous_scale='Reds')
@@ -737,6 +768,7 @@ def main():
         
         # Access to interventions
         fig2 = px.bar(ses_summary, x='income_level', y='access_to_interventions',
+                     error_y='access_to_interventions_plus', error_y_minus='access_to_interventions_minus',
                      title='Access to Interventions by Income Level')
         fig2.update_layout(height=400, plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', font_color='#FAFAFA')
         st.plotly_chart(fig2, use_container_width=True)
@@ -767,7 +799,7 @@ def main():
     with tab8:
         st.header("Policy Recommendations")
         
-        policy_data = data['policy_interventions']
+        policy_data = data['policy_interventions'].copy()
         
         # Effectiveness vs Implementation difficulty
         fig = px.scatter(policy_data, x='implementation_difficulty', y='effectiveness_score',
@@ -777,16 +809,41 @@ def main():
         fig.update_layout(height=500, plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', font_color='#FAFAFA')
         st.plotly_chart(fig, use_container_width=True)
         
-        # Top recommendations
-        policy_data['priority_score'] = (policy_data['effectiveness_score'] * policy_data['political_feasibility']) / policy_data['implementation_difficulty']
-        top_policies = policy_data.nlargest(5, 'priority_score')
+        # Monte Carlo uncertainty over single interventions and packages of up to three
+        simulation = load_policy_simulation(policy_data)
+        ranking = simulation.ranking
+        st.caption(f"Monte Carlo: {simulation.n_scenarios:,} scenarios in {simulation.seconds:.2f}s, 90% intervals")
+        
+        top_packages = ranking.head(10).iloc[::-1]
+        fig = go.Figure(go.Scatter(
+            x=top_packages['priority_median'], y=top_packages['package'].str.replace('_', ' '), mode='markers',
+            error_x=dict(type='data', symmetric=False,
+                         array=top_packages['priority_high'] - top_packages['priority_median'],
+                         arrayminus=top_packages['priority_median'] - top_packages['priority_low']),
+            marker=dict(color='#00D4AA', size=10)
+        ))
+        fig.update_layout(title='Priority Score with 90% Interval (Top 10 Packages)', xaxis_title='Priority score',
+                          height=500, plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', font_color='#FAFAFA')
+        st.plotly_chart(fig, use_container_width=True)
+        
+        fig = px.scatter(ranking, x='cost_median', y='effectiveness_median', color='pareto_optimal',
+                        hover_name='package', hover_data=['size', 'priority_median'],
+                        title='Cost vs Effectiveness of Intervention Packages (Pareto Frontier)')
+        fig.add_trace(go.Scatter(x=simulation.frontier['cost_median'], y=simulation.frontier['effectiveness_median'],
+                                 mode='lines', line=dict(color='#FF6B6B', dash='dash'), name='Pareto frontier'))
+        fig.update_layout(height=500, plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', font_color='#FAFAFA')
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Top recommendations: single interventions ranked by median priority score
+        top_policies = ranking[ranking['size'] == 1].head(5).merge(policy_data, left_on='package', right_on='intervention')
         
         st.subheader("Top 5 Policy Recommendations")
         for i, row in top_policies.iterrows():
             st.markdown(f"**{row['intervention'].replace('_', ' ').title()}**")
-            st.markdown(f"- Effectiveness: {row['effectiveness_score']:.1%}")
+            st.markdown(f"- Effectiveness: {row['effectiveness_score']:.1%} (90% interval {row['effectiveness_low']:.1%} - {row['effectiveness_high']:.1%})")
             st.markdown(f"- Cost per person: ${row['cost_per_person']:.0f}")
             st.markdown(f"- Political feasibility: {row['political_feasibility']:.1%}")
+            st.markdown(f"- Priority score: {row['priority_median']:.2f} ({row['priority_low']:.2f} - {row['priority_high']:.2f}), best in {row['probability_best']:.0%} of scenarios")
             st.markdown("---")
         
         # Check for AI policy analysis
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Client Pool Benchmark
+Per-request overhead of a fresh provider client vs the pooled keep-alive client
+
+A local mock provider speaks the Anthropic streaming messages API over plain
+HTTP/1.1 with keep-alive. Every new TCP connection pays HANDSHAKE_MS in the
+server, which stands in for TCP + TLS setup to a remote API. Responses are
+streamed immediately, so the timings are client and connection overhead only.
+"""
+
+import json
+import socketserver
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.append(str(Path(__file__).resolve().parent.parent / ".kiro"))
+
+import anthropic
+
+from agents.client_pool import ClientPool
+
+REQUESTS = 50
+HANDSHAKE_MS = [0, 20]
+CHUNKS = ["Screen ", "time ", "and ", "sleep ", "quality"]
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+STREAM_BODY = "".join([
+    _sse("message_start", {"type": "message_start", "message": {
+        "id": "msg_mock", "type": "message", "role": "assistant", "content": [], "model": "mock",
+        "stop_reason": None, "stop_sequence": None, "usage": {"input_tokens": 10, "output_tokens": 1}}}),
+    _sse("content_block_start", {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}),
+    *[_sse("content_block_delta", {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": text}})
+      for text in CHUNKS],
+    _sse("content_block_stop", {"type": "content_block_stop", "index": 0}),
+    _sse("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                           "usage": {"output_tokens": len(CHUNKS)}}),
+    _sse("message_stop", {"type": "message_stop"}),
+]).encode()
+
+
+class MockProvider(BaseHTTPRequestHandler):
+    """POST /v1/messages with a canned stream; each new connection costs ``handshake`` seconds"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    handshake = 0.0
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+        time.sleep(self.handshake)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(STREAM_BODY)))
+        self.end_headers()
+        self.wfile.write(STREAM_BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def _stream(client):
+    with client.messages.stream(model="mock", max_tokens=64, messages=[{"role": "user", "content": "hi"}]) as stream:
+        return "".join(stream.text_stream)
+
+
+def _time(label, call):
+    MockProvider.connections = 0
+    call()  # warm-up (first pooled connection)
+    samples = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        text = call()
+        samples.append((time.perf_counter() - start) * 1000)
+    assert text == "".join(CHUNKS)
+    print(f"  {label:<34} {statistics.median(samples):>7.2f} ms median  "
+          f"{statistics.quantiles(samples, n=20)[-1]:>7.2f} ms p95  {MockProvider.connections:>4} new connections")
+    return statistics.median(samples)
+
+
+def main():
+    print("=" * 70)
+    print("DIGITAL DETOX WEAVER: CLIENT POOL BENCHMARK")
+    print("=" * 70)
+    socketserver.TCPServer.allow_reuse_address = True
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockProvider)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    pool = ClientPool(pool_size=4)
+
+    for handshake_ms in HANDSHAKE_MS:
+        MockProvider.handshake = handshake_ms / 1000
+        print(f"\n{REQUESTS} streamed requests, {handshake_ms} ms connection setup")
+        fresh = _time("new client per request (before)",
+                      lambda: _stream(anthropic.Anthropic(api_key="mock", base_url=base_url, max_retries=0)))
+        pooled = _time("pooled client (after)", lambda: _stream(pool.claude(api_key="mock", base_url=base_url)))
+        print(f"  per-request overhead saved: {fresh - pooled:.2f} ms ({fresh / pooled:.1f}x)")
+
+    pool.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Data Generator Benchmark
+Rows/second of the vectorized SOURCE 1 generators at 1x, 100x and 10,000x scale
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import data_generators
+
+SCALES = [1, 100, 10_000]
+
+
+def bench_scale(scale: int) -> None:
+    """Time every generator at one scale and print rows/second"""
+    np.random.seed(42)
+    print(f"\nscale={scale:,}x")
+    total_rows = 0
+    total_seconds = 0.0
+    for name, generator in [
+        ('global_epidemiology', data_generators.generate_global_epidemiology),
+        ('age_stratification', data_generators.generate_age_stratification),
+        ('platform_comparison', data_generators.generate_platform_comparison),
+        ('mechanisms', data_generators.generate_mechanisms),
+        ('disease_timeline', data_generators.generate_disease_timeline),
+        ('ses_inequality', data_generators.generate_ses_inequality),
+        ('detox_timeline', data_generators.generate_detox_timeline),
+        ('policy_interventions', data_generators.generate_policy_interventions),
+    ]:
+        start = time.perf_counter()
+        df = generator(scale)
+        elapsed = time.perf_counter() - start
+        total_rows += len(df)
+        total_seconds += elapsed
+        print(f"  {name:<22} {len(df):>12,} rows  {elapsed * 1000:>9.2f} ms  {len(df) / elapsed:>14,.0f} rows/s")
+    print(f"  {'TOTAL':<22} {total_rows:>12,} rows  {total_seconds * 1000:>9.2f} ms  {total_rows / total_seconds:>14,.0f} rows/s")
+
+
+def main():
+    print("=" * 70)
+    print("DIGITAL DETOX WEAVER: DATA GENERATOR BENCHMARK")
+    print("=" * 70)
+    for scale in SCALES:
+        bench_scale(scale)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Dataset Memory Benchmark
+Per-worker memory when several processes load the cached datasets (Linux only)
+
+Compares the Parquet cache (every worker decodes its own copy) with the
+memory-mapped Arrow cache (workers share the mapped file's pages).
+"""
+
+import multiprocessing
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data_cache import load_datasets
+
+SCALES = [1, 100, 1_000]
+WORKERS = 4
+
+
+def _memory_kb() -> dict:
+    """Private and proportional-set memory of this process from /proc/self/smaps_rollup"""
+    fields = {}
+    for line in Path("/proc/self/smaps_rollup").read_text().splitlines()[1:]:
+        key, value = line.split(":", 1)
+        fields[key] = int(value.split()[0])
+    return {
+        "private": fields["Private_Clean"] + fields["Private_Dirty"],
+        "pss": fields["Pss"],
+    }
+
+
+def _worker(args):
+    """Load every dataset like a dashboard replica would and report memory growth"""
+    cache_dir, fmt, scale = args
+    before = _memory_kb()
+    data = load_datasets(scale=scale, cache_dir=Path(cache_dir), fmt=fmt)
+    for name in data:
+        data[name]  # touch every dataset
+    # Read every numeric value so mapped pages are actually resident
+    total = sum(float(df.select_dtypes("number").to_numpy().sum()) for df in data.values())
+    after = _memory_kb()
+    return {key: after[key] - before[key] for key in after}, total
+
+
+def main():
+    print("=" * 70)
+    print("DIGITAL DETOX WEAVER: DATASET MEMORY BENCHMARK")
+    print("=" * 70)
+    context = multiprocessing.get_context("spawn")
+    for scale in SCALES:
+        print(f"\nscale={scale:,}x, {WORKERS} workers")
+        for fmt in ["parquet", "arrow"]:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                load_datasets(scale=scale, cache_dir=Path(cache_dir), fmt=fmt)  # populate once
+                with context.Pool(WORKERS) as pool:
+                    results = pool.map(_worker, [(cache_dir, fmt, scale)] * WORKERS)
+            private = sum(r[0]["private"] for r in results) / WORKERS / 1024
+            pss = sum(r[0]["pss"] for r in results) / WORKERS / 1024
+            print(f"  {fmt:<8} private/worker {private:>9.1f} MiB   PSS/worker {pss:>9.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Microsimulation Benchmark
+People simulated per second at 1M and 10M people, in-process and across cores
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from microsimulation import run_microsimulation
+
+POPULATIONS = [1_000_000, 10_000_000]
+
+
+def main():
+    print("=" * 70)
+    print("DIGITAL DETOX WEAVER: MICROSIMULATION BENCHMARK")
+    print("=" * 70)
+    worker_counts = sorted({1, os.cpu_count() or 1})
+    for n_people in POPULATIONS:
+        print(f"\nn_people={n_people:,}")
+        for workers in worker_counts:
+            result = run_microsimulation(n_people=n_people, workers=workers)
+            print(f"  workers={workers:<3} chunks={result.chunks:<4} {result.seconds:>7.2f} s  "
+                  f"{result.people_per_second:>14,.0f} people/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Streaming Generation Benchmark
+Streams global_epidemiology to year-partitioned Parquet at growing scales and
+reports throughput and peak RSS, which should stay flat as the row count grows
+"""
+
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data_cache import write_partitioned
+from data_generators import iter_dataset
+
+SCALES = [1_000, 10_000, 50_000]
+CHUNK_SIZE = 250_000
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far (Linux reports KiB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    print("=" * 70)
+    print("DIGITAL DETOX WEAVER: STREAMING GENERATION BENCHMARK")
+    print("=" * 70)
+    print(f"chunk_size={CHUNK_SIZE:,} rows, partitioned by year\n")
+    for scale in SCALES:
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            chunks = iter_dataset('global_epidemiology', scale=scale, chunk_size=CHUNK_SIZE, seed=42)
+            rows = write_partitioned(chunks, Path(tmp) / "epi", partition_cols=['year'])
+            elapsed = time.perf_counter() - start
+        print(f"  scale={scale:>7,}x  {rows:>12,} rows  {elapsed:>7.2f} s  "
+              f"{rows / elapsed:>12,.0f} rows/s  peak RSS {peak_rss_mb():>7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Vector Index Benchmark
+Recall@10 and queries/second of the IVF index against brute force at 10k, 100k and 1M chunks
+
+The report corpus is a few hundred passages, so the chunks are synthetic:
+unit vectors drawn around random topic centres, which clusters them the way
+embedded passages cluster. Queries are perturbed copies of stored chunks.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+from vector_index import IVFIndex, VectorStore, exact_search
+
+SIZES = [10_000, 100_000, 1_000_000]
+DIM = 128
+TOPICS = 2_000
+QUERIES = 200
+K = 10
+NPROBES = [4, 16, 64]
+INSERT_BATCH = 50_000
+
+
+def synthetic_chunks(rng: np.random.Generator, centres: np.ndarray, n: int, noise: float = 0.6) -> np.ndarray:
+    """``n`` unit vectors scattered around randomly chosen topic centres"""
+    vectors = centres[rng.integers(len(centres), size=n)] + rng.standard_normal((n, DIM), dtype=np.float32) * noise / np.sqrt(DIM)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def bench_size(n: int, directory: Path) -> None:
+    """Build the store and index for ``n`` chunks and compare search to brute force"""
+    rng = np.random.default_rng(42)
+    centres = rng.standard_normal((TOPICS, DIM), dtype=np.float32)
+    centres /= np.linalg.norm(centres, axis=1, keepdims=True)
+    print(f"\nchunks={n:,}")
+
+    store = VectorStore(directory / f"n{n}", DIM)
+    start = time.perf_counter()
+    for offset in range(0, n, INSERT_BATCH):
+        store.add(synthetic_chunks(rng, centres, min(INSERT_BATCH, n - offset)))
+    insert_seconds = time.perf_counter() - start
+    print(f"  batch insert      {insert_seconds:>8.2f} s  {n / insert_seconds:>12,.0f} vectors/s  "
+          f"{store.path.stat().st_size / 2 ** 20:>7.1f} MB float16")
+
+    index = IVFIndex(store)
+    start = time.perf_counter()
+    index.build()
+    print(f"  IVF build         {time.perf_counter() - start:>8.2f} s  {len(index.centroids):>12,} lists")
+
+    picks = rng.choice(n, QUERIES, replace=False)
+    queries = np.asarray(store.vectors[picks], dtype=np.float32)
+    queries += rng.standard_normal(queries.shape, dtype=np.float32) * 0.3 / np.sqrt(DIM)
+
+    start = time.perf_counter()
+    _, truth = exact_search(store.vectors, queries, K)
+    exact_seconds = time.perf_counter() - start
+    print(f"  brute force       recall@{K} 1.000  {QUERIES / exact_seconds:>10,.0f} q/s (batch of {QUERIES})")
+
+    for nprobe in NPROBES:
+        start = time.perf_counter()
+        _, found = index.search(queries, K, nprobe=nprobe)
+        seconds = time.perf_counter() - start
+        recall = np.mean([len(set(f) & set(t)) / K for f, t in zip(found, truth)])
+        print(f"  IVF nprobe={nprobe:<3}    recall@{K} {recall:.3f}  {QUERIES / seconds:>10,.0f} q/s  "
+              f"({exact_seconds / seconds:,.1f}x brute force)")
+
+
+def main():
+    print("=" * 70)
+    print("DIGITAL DETOX WEAVER: VECTOR INDEX BENCHMARK")
+    print("=" * 70)
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in SIZES:
+            bench_size(n, Path(tmp))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Digital Detox Weaver: Bootstrap Confidence Intervals
+Percentile bootstrap CIs for grouped aggregates over the SOURCE 1 datasets
+
+Each group is resampled with one index matrix of shape (resamples, rows), so
+every resample's statistic comes out of a single vectorized reduction. Large
+groups are split into resample batches to bound memory. Groups can fan out
+across a process pool, and results are cached by a content fingerprint of the
+data plus the request, so dashboard reruns and repeated agent runs reuse them.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from data_cache import frame_fingerprint
+
+logger = logging.getLogger(__name__)
+
+STATISTICS = {
+    'mean': np.mean,
+    'median': np.median,
+    'sum': np.sum,
+    'std': lambda values, axis: np.std(values, axis=axis, ddof=1),
+}
+# Upper bound on resampled values held at once (resamples x rows x columns)
+MAX_BATCH_ELEMENTS = 4_000_000
+CACHE_SIZE = 256
+
+# Least recently used results are evicted first
+_cache: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _resample_group(values, statistic, n_resamples, confidence, seed_sequence):
+    """
+    Point estimate and percentile CI for every column of one group.
+
+    ``values`` is (rows, columns); returns a (3, columns) array of estimate, low, high.
+    Module-level so process pools can pickle it.
+    """
+    reduce = STATISTICS[statistic]
+    rng = np.random.default_rng(seed_sequence)
+    n_rows, n_columns = values.shape
+    batch = max(1, MAX_BATCH_ELEMENTS // max(1, n_rows * n_columns))
+
+    resampled = np.empty((n_resamples, n_columns))
+    for first in range(0, n_resamples, batch):
+        size = min(batch, n_resamples - first)
+        indices = rng.integers(0, n_rows, size=(size, n_rows))
+        resampled[first:first + size] = reduce(values[indices], axis=1)
+
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(resampled, [alpha, 1 - alpha], axis=0)
+    return np.vstack([reduce(values, axis=0), low, high])
+
+
+def bootstrap_ci(df: pd.DataFrame, columns: List[str], by: Optional[Union[str, List[str]]] = None,
+                 statistic: str = 'mean', n_resamples: int = 2000, confidence: float = 0.95,
+                 seed: int = 42, workers: int = 1) -> pd.DataFrame:
+    """
+    Bootstrap confidence intervals for ``statistic`` of ``columns``, per ``by`` group.
+
+    Returns one row per (group, column) with ``estimate``, ``ci_low``, ``ci_high``
+    and ``n``. Every group draws from its own child of ``seed``, so results are
+    identical for any ``workers``; ``workers > 1`` spreads groups over a process pool.
+    """
+    if statistic not in STATISTICS:
+        raise ValueError(f"Unsupported statistic: {statistic} (expected one of {list(STATISTICS)})")
+    keys = [by] if isinstance(by, str) else list(by or [])
+
+    fingerprint = frame_fingerprint(df[keys + list(columns)])
+    cache_key = f"{fingerprint}:{keys}:{list(columns)}:{statistic}:{n_resamples}:{confidence}:{seed}"
+    with _cache_lock:
+        if cache_key in _cache:
+            _cache.move_to_end(cache_key)
+            return _cache[cache_key].copy()
+
+    values = df[columns].to_numpy(np.float64)
+    if keys:
+        groups = df.groupby(keys, observed=True, sort=True).indices
+    else:
+        groups = {'all': np.arange(len(df))}
+    seeds = np.random.SeedSequence(seed).spawn(len(groups))
+    tasks = [(values[rows], statistic, n_resamples, confidence, child) for rows, child in zip(groups.values(), seeds)]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            estimates = list(executor.map(_resample_group, *zip(*tasks)))
+    else:
+        estimates = [_resample_group(*task) for task in tasks]
+
+    records = []
+    for group, rows, estimate in zip(groups, groups.values(), estimates):
+        labels = dict(zip(keys, group if isinstance(group, tuple) else (group,))) if keys else {}
+        for i, column in enumerate(columns):
+            records.append({**labels, 'column': column, 'estimate': estimate[0, i],
+                            'ci_low': estimate[1, i], 'ci_high': estimate[2, i], 'n': len(rows)})
+    result = pd.DataFrame(records)
+
+    with _cache_lock:
+        if len(_cache) >= CACHE_SIZE:
+            _cache.popitem(last=False)
+        _cache[cache_key] = result.copy()
+    logger.info(f"✓ Bootstrapped {len(columns)} columns over {len(groups)} groups ({n_resamples} resamples)")
+    return result
+
+
+def format_ci(row: pd.Series, fmt: str = '{:.2f}', label: str = '95% CI') -> str:
+    """``estimate (95% CI: low-high)`` for one bootstrap_ci row"""
+    return f"{fmt.format(row['estimate'])} ({label}: {fmt.format(row['ci_low'])}-{fmt.format(row['ci_high'])})"
+
+
+if __name__ == "__main__":
+    from data_cache import load_datasets
+
+    data = load_datasets()
+    latest = data['global_epidemiology'][data['global_epidemiology']['year'] == 2025]
+    print("2025 global KPIs:")
+    for _, row in bootstrap_ci(latest, ['avg_screen_time_hours', 'depression_rate', 'anxiety_rate', 'sleep_disorders']).iterrows():
+        print(f"  {row['column']}: {format_ci(row, '{:.3f}')}")
+    print("\nHealth impact by age group:")
+    for _, row in bootstrap_ci(data['age_stratification'], ['health_impact_score'], by='age_group').iterrows():
+        print(f"  {row['age_group']}: {format_ci(row, '{:.3f}')}")
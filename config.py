@@ -18,6 +18,15 @@ ARCHIVES_DIR = PROJECT_ROOT / "archives"
 for dir_path in [OUTPUTS_DIR, CACHE_DIR, ARCHIVES_DIR]:
     dir_path.mkdir(exist_ok=True)
 
+# On-disk dataset cache format: parquet, feather, or arrow (memory-mapped,
+# shared between worker processes on the same host)
+DATASET_CACHE_FORMAT = os.getenv("DATASET_CACHE_FORMAT", "parquet")
+
+# Live RAG metrics shown on the dashboard: seconds a fetched value stays fresh,
+# and seconds without readers after which background refreshing stops
+LIVE_METRICS_TTL_SECONDS = float(os.getenv("LIVE_METRICS_TTL_SECONDS", "300"))
+LIVE_METRICS_IDLE_SECONDS = float(os.getenv("LIVE_METRICS_IDLE_SECONDS", "1800"))
+
 # Dashboard configuration
 DASHBOARD_CONFIG = {
     "title": "🧵 Digital Detox Weaver",
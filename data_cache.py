@@ -0,0 +1,263 @@
+"""
+Digital Detox Weaver: Dataset Cache
+Columnar on-disk cache of the SOURCE 1 datasets under config.CACHE_DIR
+
+Each dataset collection is written once as Parquet (or Feather) files in a
+directory keyed by generator version, seed and scale. Readers load datasets
+lazily and can project columns, so a cold start is a file read instead of a
+regeneration.
+
+``write_partitioned`` streams chunks from ``data_generators.iter_dataset`` into a
+partitioned Parquet directory (for example by year or country) for datasets too
+large to build in memory.
+
+The ``arrow`` format writes uncompressed Arrow IPC files that every process
+memory-maps read-only: numeric and string columns point straight into the
+mapped file, so replicas on one host share the same physical pages.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import CACHE_DIR, DATASET_CACHE_FORMAT
+from data_generators import DATASET_GENERATORS, GENERATOR_VERSION, get_all_data
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {"parquet": ".parquet", "feather": ".feather", "arrow": ".arrow"}
+
+
+def cache_key(scale: int = 1, seed: Optional[int] = None) -> str:
+    """Directory name identifying one generated dataset collection"""
+    return f"v{GENERATOR_VERSION}_seed-{'global' if seed is None else seed}_scale-{scale}"
+
+
+def generate_datasets(scale: int = 1, seed: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Generate the datasets reproducibly, independent of prior draws.
+
+    Without a seed the global stream is reset to the import-time seed (42) for
+    the duration of the call and restored afterwards.
+    """
+    if seed is not None:
+        return get_all_data(scale, seed=seed)
+
+    state = np.random.get_state()
+    np.random.seed(42)
+    try:
+        return get_all_data(scale)
+    finally:
+        np.random.set_state(state)
+
+
+def frame_fingerprint(*frames: pd.DataFrame) -> str:
+    """Content hash of one or more DataFrames (columns, dtypes and values, not the index)"""
+    digest = hashlib.blake2b(digest_size=16)
+    for df in frames:
+        digest.update(repr(list(zip(df.columns, map(str, df.dtypes)))).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _arrow_string_types(arrow_type):
+    """Keep Arrow string columns Arrow-backed instead of copying them into Python objects"""
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.StringDtype("pyarrow")
+    return None
+
+
+class DatasetCache:
+    """On-disk store for one (generator version, seed, scale) dataset collection"""
+
+    def __init__(self, scale: int = 1, seed: Optional[int] = None, cache_dir: Path = CACHE_DIR, fmt: str = DATASET_CACHE_FORMAT):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported cache format: {fmt} (expected one of {list(FORMATS)})")
+        self.scale = scale
+        self.seed = seed
+        self.fmt = fmt
+        self.directory = Path(cache_dir) / "datasets" / cache_key(scale, seed)
+        # Without pyarrow nothing is written; datasets are kept in memory instead
+        self._memory: Optional[Dict[str, pd.DataFrame]] = None
+        self._lock = threading.Lock()
+
+    def path(self, name: str) -> Path:
+        """File holding one dataset"""
+        return self.directory / f"{name}{FORMATS[self.fmt]}"
+
+    def is_complete(self) -> bool:
+        """Whether every dataset has been written"""
+        return all(self.path(name).exists() for name in DATASET_GENERATORS)
+
+    def write(self, data: Dict[str, pd.DataFrame]) -> None:
+        """Write datasets atomically (temp file + rename) so readers never see partial files"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for name, df in data.items():
+            path = self.path(name)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            if self.fmt == "parquet":
+                df.to_parquet(tmp_path, index=False)
+            elif self.fmt == "feather":
+                df.to_feather(tmp_path)
+            else:
+                # Uncompressed, so readers can map the buffers without decoding
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                with pa.OSFile(str(tmp_path), "wb") as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+            os.replace(tmp_path, path)
+
+    def ensure(self) -> None:
+        """Generate and write the collection unless it is already cached"""
+        with self._lock:
+            if not ARROW_AVAILABLE:
+                if self._memory is None:
+                    logger.warning("pyarrow not installed - dataset cache disabled, generating in memory")
+                    self._memory = generate_datasets(self.scale, self.seed)
+                return
+            if self.is_complete():
+                return
+            logger.info(f"Dataset cache miss ({self.directory.name}) - generating SOURCE 1 data...")
+            self.write(generate_datasets(self.scale, self.seed))
+            logger.info(f"✓ Datasets cached in {self.directory}")
+
+    def read(self, name: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read one dataset, optionally only the given columns"""
+        self.ensure()
+        if self._memory is not None:
+            df = self._memory[name]
+            return df[columns].copy() if columns is not None else df.copy()
+        if self.fmt == "parquet":
+            return pd.read_parquet(self.path(name), columns=columns)
+        if self.fmt == "feather":
+            return pd.read_feather(self.path(name), columns=columns)
+        return self._read_mapped(name, columns)
+
+    def _read_mapped(self, name: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Zero-copy read: DataFrame columns are read-only views into the memory-mapped file"""
+        table = pa.ipc.open_file(pa.memory_map(str(self.path(name)), "r")).read_all()
+        if columns is not None:
+            table = table.select(columns)
+        # One block per column keeps numeric columns as views; strings stay Arrow-backed
+        return table.to_pandas(split_blocks=True, types_mapper=_arrow_string_types)
+
+    def num_rows(self, name: str) -> int:
+        """
+        Row count from file metadata: the Parquet footer or the Arrow IPC record batch headers
+
+        pyarrow releases without ``RecordBatchFileReader.count_rows`` fall back to
+        mapping each record batch (compressed Feather batches are then decompressed).
+        """
+        self.ensure()
+        if self._memory is not None:
+            return len(self._memory[name])
+        if self.fmt == "parquet":
+            return pq.read_metadata(self.path(name)).num_rows
+        with pa.memory_map(str(self.path(name))) as source:
+            reader = pa.ipc.open_file(source)
+            if hasattr(reader, "count_rows"):
+                return reader.count_rows()
+            return sum(reader.get_record_batch(i).num_rows for i in range(reader.num_record_batches))
+
+
+class LazyDatasets(Mapping):
+    """
+    Read-only ``{name: DataFrame}`` mapping backed by a DatasetCache.
+
+    A dataset is read on first access and kept; ``select`` reads just the
+    requested columns. Safe to share across Streamlit sessions as long as
+    callers do not mutate the returned frames in place.
+    """
+
+    def __init__(self, cache: DatasetCache):
+        self.cache = cache
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> pd.DataFrame:
+        if name not in DATASET_GENERATORS:
+            raise KeyError(name)
+        with self._lock:
+            if name not in self._frames:
+                self._frames[name] = self.cache.read(name)
+            return self._frames[name]
+
+    def __iter__(self):
+        return iter(DATASET_GENERATORS)
+
+    def __len__(self) -> int:
+        return len(DATASET_GENERATORS)
+
+    def select(self, name: str, columns: List[str]) -> pd.DataFrame:
+        """Column projection: read only ``columns`` unless the full dataset is already loaded"""
+        if name not in DATASET_GENERATORS:
+            raise KeyError(name)
+        if name in self._frames:
+            return self._frames[name][columns]
+        return self.cache.read(name, columns=columns)
+
+    def num_rows(self, name: str) -> int:
+        """Row count of a dataset without loading it"""
+        if name in self._frames:
+            return len(self._frames[name])
+        return self.cache.num_rows(name)
+
+
+def load_datasets(scale: int = 1, seed: Optional[int] = None, cache_dir: Path = CACHE_DIR, fmt: str = DATASET_CACHE_FORMAT) -> LazyDatasets:
+    """
+    Get all datasets as a lazily loaded mapping, generating and caching them on first use
+
+    Multi-worker deployments should use ``fmt="arrow"`` (or set
+    ``DATASET_CACHE_FORMAT=arrow``): the first worker writes the files, and every
+    worker maps them read-only.
+    """
+    cache = DatasetCache(scale=scale, seed=seed, cache_dir=cache_dir, fmt=fmt)
+    cache.ensure()
+    return LazyDatasets(cache)
+
+
+def write_partitioned(chunks: Iterable[pd.DataFrame], path: Path, partition_cols: Optional[List[str]] = None) -> int:
+    """
+    Write DataFrame chunks to a Parquet dataset directory, one chunk at a time.
+
+    Each chunk becomes one file per partition (``year=2015/part-00003-0.parquet``),
+    so only a single chunk is ever held in memory. Returns the number of rows written.
+    """
+    if not ARROW_AVAILABLE:
+        raise ImportError("pyarrow is required to write partitioned Parquet datasets")
+
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    rows = 0
+    for chunk_index, chunk in enumerate(chunks):
+        pq.write_to_dataset(
+            pa.Table.from_pandas(chunk, preserve_index=False),
+            root_path=str(path),
+            partition_cols=partition_cols,
+            basename_template=f"part-{chunk_index:05d}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        rows += len(chunk)
+    logger.info(f"✓ Wrote {rows:,} rows to {path}")
+    return rows
+
+
+if __name__ == "__main__":
+    data = load_datasets()
+    print(f"Dataset cache: {data.cache.directory}")
+    for name in data:
+        print(f"  {name}: {data.num_rows(name)} records")
@@ -1,8 +1,27 @@
 """
 Digital Detox Weaver: Data Generators (SOURCE 1)
 Generates 800+ epidemiological records across 8 datasets
+
+Every generator is vectorized: rows are built from broadcast NumPy arrays and
+lookup tables instead of per-row Python loops. ``scale`` multiplies the size of
+each dataset's entity axis (countries, age groups, platforms, ...); replicas are
+labelled ``<name>_<k>`` (e.g. ``USA_2``). At ``scale=1`` the output matches the
+original row-by-row generators draw for draw on the global ``np.random`` stream.
+
+Columns follow the compact per-dataset ``SCHEMAS``: labels are categoricals,
+rates and scores float32, years and counts small ints.
+
+Passing ``rng`` (a ``np.random.Generator``) instead draws from that stream, which
+is what ``get_all_data(seed=...)`` uses to build datasets independently and in
+parallel. ``offset`` skips whole replicas so ``iter_dataset`` can build a large
+dataset chunk by chunk.
 """
 
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterator
+
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -10,293 +29,534 @@ from datetime import datetime, timedelta
 # Set seed for reproducibility
 np.random.seed(42)
 
-def generate_global_epidemiology():
-    """Generate global epidemiology data (180 records)"""
-    countries = ['USA', 'UK', 'Germany', 'France', 'Japan', 'Australia', 'Canada', 'Sweden', 'Netherlands', 'South Korea', 'Brazil', 'India']
-    years = list(range(2010, 2026))  # Include 2025 for RAG-enhanced real-time data
-    
-    data = []
-    for country in countries:
-        for year in years:
-            # Non-linear growth in screen time
-            base_screen_time = 2.5 + (year - 2010) * 0.8 + np.random.normal(0, 0.3)
-            if year >= 2020:  # COVID acceleration
-                base_screen_time *= 1.4
-            
-            data.append({
-                'country': country,
-                'year': year,
-                'avg_screen_time_hours': max(1.0, base_screen_time),
-                'depression_rate': min(0.4, 0.08 + base_screen_time * 0.025 + np.random.normal(0, 0.01)),
-                'anxiety_rate': min(0.35, 0.06 + base_screen_time * 0.022 + np.random.normal(0, 0.01)),
-                'sleep_disorders': min(0.3, 0.05 + base_screen_time * 0.018 + np.random.normal(0, 0.008))
-            })
-    
-    return pd.DataFrame(data)
-
-def generate_age_stratification():
-    """Generate age stratification data (80 records)"""
-    age_groups = ['13-17', '18-24', '25-34', '35-49', '50+']
-    screen_times = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16]
-    
-    data = []
-    for age_group in age_groups:
-        for screen_time in screen_times:
-            # Age-specific vulnerability multipliers
-            if age_group == '13-17':
-                vulnerability = 5.5  # Highest vulnerability
-            elif age_group == '18-24':
-                vulnerability = 3.2
-            elif age_group == '25-34':
-                vulnerability = 2.1
-            elif age_group == '35-49':
-                vulnerability = 1.4
-            else:  # 50+
-                vulnerability = 1.0  # Baseline
-            
-            # Non-linear dose-response
-            health_impact = vulnerability * (screen_time ** 1.3) / 100
-            
-            data.append({
-                'age_group': age_group,
-                'screen_time_hours': screen_time,
-                'vulnerability_multiplier': vulnerability,
-                'health_impact_score': min(1.0, health_impact),
-                'depression_risk': min(0.6, health_impact * 0.8),
-                'sleep_quality_loss': min(0.7, health_impact * 0.9)
-            })
-    
-    return pd.DataFrame(data)
-
-def generate_platform_comparison():
-    """Generate platform comparison data (7 records)"""
-    platforms = ['TikTok', 'Instagram', 'YouTube', 'Facebook', 'Twitter', 'Snapchat', 'WhatsApp']
-    
-    data = []
-    for platform in platforms:
-        # Platform-specific characteristics
-        if platform == 'TikTok':
-            engagement = 9.2
-            harm_score = 8.7
-            addiction_potential = 9.1
-        elif platform == 'Instagram':
-            engagement = 8.5
-            harm_score = 8.2
-            addiction_potential = 8.4
-        elif platform == 'YouTube':
-            engagement = 8.8
-            harm_score = 6.9
-            addiction_potential = 7.8
-        elif platform == 'Facebook':
-            engagement = 7.2
-            harm_score = 6.5
-            addiction_potential = 6.8
-        elif platform == 'Twitter':
-            engagement = 7.8
-            harm_score = 7.1
-            addiction_potential = 7.3
-        elif platform == 'Snapchat':
-            engagement = 8.1
-            harm_score = 7.4
-            addiction_potential = 7.9
-        else:  # WhatsApp
-            engagement = 6.5
-            harm_score = 4.2
-            addiction_potential = 5.1
-        
-        data.append({
-            'platform': platform,
-            'engagement_score': engagement,
-            'harm_score': harm_score,
-            'addiction_potential': addiction_potential,
-            'user_base_millions': np.random.randint(500, 3000),
-            'avg_session_minutes': np.random.randint(15, 90)
-        })
-    
-    return pd.DataFrame(data)
-
-def generate_mechanisms():
-    """Generate mechanisms data (41 records)"""
-    mechanisms = ['circadian_disruption', 'dopamine_dysregulation', 'social_comparison', 'sleep_displacement']
-    outcomes = ['depression', 'anxiety', 'sleep_disorders', 'obesity', 'ADHD', 'social_isolation', 'academic_decline', 'body_dysmorphia', 'eating_disorders', 'aggression']
-    
-    data = []
-    for mechanism in mechanisms:
-        for outcome in outcomes:
-            # Mechanism-outcome strength
-            if mechanism == 'circadian_disruption' and outcome in ['sleep_disorders', 'depression', 'obesity']:
-                strength = np.random.uniform(0.7, 0.9)
-            elif mechanism == 'dopamine_dysregulation' and outcome in ['ADHD', 'depression', 'academic_decline']:
-                strength = np.random.uniform(0.6, 0.8)
-            elif mechanism == 'social_comparison' and outcome in ['depression', 'anxiety', 'body_dysmorphia', 'eating_disorders']:
-                strength = np.random.uniform(0.7, 0.9)
-            elif mechanism == 'sleep_displacement' and outcome in ['sleep_disorders', 'academic_decline', 'obesity']:
-                strength = np.random.uniform(0.6, 0.8)
-            else:
-                strength = np.random.uniform(0.2, 0.5)
-            
-            data.append({
-                'mechanism': mechanism,
-                'outcome': outcome,
-                'pathway_strength': strength,
-                'evidence_quality': np.random.choice(['high', 'moderate', 'low'], p=[0.3, 0.5, 0.2])
-            })
-    
-    # Add one more record to reach 41
-    data.append({
-        'mechanism': 'blue_light_exposure',
-        'outcome': 'circadian_disruption',
-        'pathway_strength': 0.85,
-        'evidence_quality': 'high'
+# Bump whenever generator output changes; part of the on-disk dataset cache key
+GENERATOR_VERSION = 3
+
+# Lookup tables
+COUNTRIES = ['USA', 'UK', 'Germany', 'France', 'Japan', 'Australia', 'Canada', 'Sweden', 'Netherlands', 'South Korea', 'Brazil', 'India']
+SES_COUNTRIES = COUNTRIES + ['Mexico', 'Italy', 'Spain', 'Poland', 'Turkey', 'Chile', 'South Africa', 'Nigeria']
+START_YEAR = 2010
+N_YEARS = 16  # 2010-2025, includes 2025 for RAG-enhanced real-time data
+
+AGE_GROUPS = ['13-17', '18-24', '25-34', '35-49', '50+']
+AGE_VULNERABILITY = np.array([5.5, 3.2, 2.1, 1.4, 1.0])  # 50+ is the baseline
+SCREEN_TIME_HOURS = np.arange(1, 17)
+DOSE_RESPONSE_EXPONENT = 1.3
+# Evaluated with Python's pow so the table is bit-identical on every platform
+DOSE_RESPONSE = np.array([int(hours) ** DOSE_RESPONSE_EXPONENT for hours in SCREEN_TIME_HOURS])
+
+PLATFORMS = ['TikTok', 'Instagram', 'YouTube', 'Facebook', 'Twitter', 'Snapchat', 'WhatsApp']
+# engagement, harm_score, addiction_potential
+PLATFORM_TRAITS = np.array([
+    [9.2, 8.7, 9.1],
+    [8.5, 8.2, 8.4],
+    [8.8, 6.9, 7.8],
+    [7.2, 6.5, 6.8],
+    [7.8, 7.1, 7.3],
+    [8.1, 7.4, 7.9],
+    [6.5, 4.2, 5.1],
+])
+
+MECHANISMS = ['circadian_disruption', 'dopamine_dysregulation', 'social_comparison', 'sleep_displacement']
+OUTCOMES = ['depression', 'anxiety', 'sleep_disorders', 'obesity', 'ADHD', 'social_isolation', 'academic_decline', 'body_dysmorphia', 'eating_disorders', 'aggression']
+# mechanism -> (strongly linked outcomes, strength range); all other pairs draw from WEAK_PATHWAY
+STRONG_PATHWAYS = {
+    'circadian_disruption': (['sleep_disorders', 'depression', 'obesity'], (0.7, 0.9)),
+    'dopamine_dysregulation': (['ADHD', 'depression', 'academic_decline'], (0.6, 0.8)),
+    'social_comparison': (['depression', 'anxiety', 'body_dysmorphia', 'eating_disorders'], (0.7, 0.9)),
+    'sleep_displacement': (['sleep_disorders', 'academic_decline', 'obesity'], (0.6, 0.8)),
+}
+WEAK_PATHWAY = (0.2, 0.5)
+EVIDENCE_QUALITY = np.array(['high', 'moderate', 'low'])
+EVIDENCE_QUALITY_P = np.array([0.3, 0.5, 0.2])
+
+DISEASES = ['depression', 'anxiety', 'sleep_disorders', 'obesity', 'ADHD', 'social_isolation', 'eating_disorders']
+# base rate in 2010, yearly increase
+DISEASE_TRENDS = np.array([
+    [0.08, 0.008],
+    [0.06, 0.009],
+    [0.05, 0.007],
+    [0.12, 0.005],
+    [0.04, 0.006],
+    [0.03, 0.012],
+    [0.02, 0.004],
+])
+COVID_YEAR = 2020
+
+INCOME_LEVELS = ['low', 'middle', 'high']
+# screen_time_multiplier, health_impact_multiplier (2.2x disparity), access_to_interventions
+SES_PROFILES = np.array([
+    [1.4, 2.2, 0.3],
+    [1.1, 1.3, 0.6],
+    [0.9, 1.0, 0.9],
+])
+
+DETOX_WEEKS = 13  # 0-12 weeks
+
+INTERVENTIONS = [
+    'screen_time_limits',
+    'bedroom_phone_bans',
+    'social_media_age_restrictions',
+    'digital_literacy_education',
+    'algorithm_transparency',
+    'mental_health_warnings',
+    'parental_controls_mandate',
+    'tech_company_liability'
+]
+# effectiveness range, implementation difficulty range
+INTERVENTION_PROFILES = np.array([
+    [0.65, 0.85, 0.3, 0.5],
+    [0.65, 0.85, 0.3, 0.5],
+    [0.35, 0.55, 0.5, 0.7],
+    [0.45, 0.65, 0.4, 0.6],
+    [0.55, 0.75, 0.7, 0.9],
+    [0.35, 0.55, 0.5, 0.7],
+    [0.45, 0.65, 0.4, 0.6],
+    [0.55, 0.75, 0.7, 0.9],
+])
+
+
+# Declared column dtypes per dataset
+SCHEMAS = {
+    'global_epidemiology': {
+        'country': 'category',
+        'year': 'int16',
+        'avg_screen_time_hours': 'float32',
+        'depression_rate': 'float32',
+        'anxiety_rate': 'float32',
+        'sleep_disorders': 'float32'
+    },
+    'age_stratification': {
+        'age_group': 'category',
+        'screen_time_hours': 'int16',
+        'vulnerability_multiplier': 'float32',
+        'health_impact_score': 'float32',
+        'depression_risk': 'float32',
+        'sleep_quality_loss': 'float32'
+    },
+    'platform_comparison': {
+        'platform': 'category',
+        'engagement_score': 'float32',
+        'harm_score': 'float32',
+        'addiction_potential': 'float32',
+        'user_base_millions': 'int16',
+        'avg_session_minutes': 'int16'
+    },
+    'mechanisms': {
+        'mechanism': 'category',
+        'outcome': 'category',
+        'pathway_strength': 'float32',
+        'evidence_quality': 'category'
+    },
+    'disease_timeline': {
+        'disease': 'category',
+        'year': 'int16',
+        'prevalence_rate': 'float32',
+        'screen_time_attribution': 'float32'
+    },
+    'ses_inequality': {
+        'country': 'category',
+        'income_level': 'category',
+        'screen_time_multiplier': 'float32',
+        'health_impact_multiplier': 'float32',
+        'access_to_interventions': 'float32'
+    },
+    'detox_timeline': {
+        'week': 'int32',  # grows with scale, can exceed int16
+        'sleep_quality_improvement': 'float32',
+        'mood_improvement': 'float32',
+        'attention_improvement': 'float32',
+        'relapse_risk': 'float32'
+    },
+    'policy_interventions': {
+        'intervention': 'category',
+        'effectiveness_score': 'float32',
+        'implementation_difficulty': 'float32',
+        'cost_per_person': 'float32',
+        'political_feasibility': 'float32'
+    }
+}
+
+
+def _apply_schema(name, columns):
+    """Build a dataset's DataFrame with its declared ``SCHEMAS`` dtypes"""
+    return pd.DataFrame(columns).astype(SCHEMAS[name])
+
+
+def _categorical(categories, codes):
+    """Categorical column built from integer codes, without materializing one string per row"""
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def _scaled_labels(base, n, offset=0):
+    """
+    ``n`` labels of ``base`` followed by numbered replicas (``USA``, ..., ``USA_2``, ...),
+    starting ``offset`` labels in, plus each label's index into ``base``
+    """
+    first_rep = offset // len(base)
+    last_rep = -(-(offset + n) // len(base))
+    labels = [label if k == 1 else f"{label}_{k}" for k in range(first_rep + 1, last_rep + 1) for label in base]
+    skip = offset - first_rep * len(base)
+    return np.array(labels[skip:skip + n]), np.tile(np.arange(len(base)), last_rep - first_rep)[skip:skip + n]
+
+
+def _random_source(rng):
+    """The ``np.random`` module (legacy global stream) or the given Generator"""
+    return np.random if rng is None else rng
+
+
+def _uniform(low, high, raw):
+    """Map raw ``random_sample`` draws onto ``[low, high)`` exactly like ``np.random.uniform``"""
+    return low + (high - low) * raw
+
+
+def _normal_uniform_pairs(n, sigma, low, high):
+    """
+    Draw ``n`` alternating ``normal(0, sigma)`` / ``uniform(low, high)`` pairs in one pass.
+
+    Consumes the global stream exactly like calling ``np.random.normal`` and
+    ``np.random.uniform`` in turn inside a loop. The legacy polar method draws
+    doubles two at a time and caches every second Gaussian, so the stream splits
+    into aligned double-pairs that are either a polar attempt or two uniforms.
+    """
+    normals = np.empty(n)
+    uniforms = np.empty(n)
+    if n == 0:
+        return normals, uniforms
+
+    state = np.random.get_state()
+    has_gauss, cached_gauss = state[3], state[4]
+    first = 0
+    if has_gauss:
+        # Row 0 takes the cached Gaussian and a single uniform
+        normals[0] = cached_gauss
+        first = 1
+    rows = n - first
+    needed = -(-rows // 2)
+
+    budget = int(needed * 1.4) + 16
+    while True:
+        np.random.set_state(state)
+        raw = np.random.random_sample(first + 2 * budget)
+        pairs = raw[first:].reshape(-1, 2)
+        x1 = 2.0 * pairs[:, 0] - 1.0
+        x2 = 2.0 * pairs[:, 1] - 1.0
+        r2 = x1 * x1 + x2 * x2
+        acceptable = (r2 < 1.0) & (r2 != 0.0)
+        # Inside a run of acceptable pairs, attempts and uniform pairs alternate
+        idx = np.arange(len(pairs))
+        run_start = np.maximum.accumulate(np.where(acceptable, -1, idx)) + 1
+        accepted = np.flatnonzero(acceptable & ((idx - run_start) % 2 == 0))[:needed]
+        if len(accepted) == needed and (needed == 0 or accepted[-1] + 1 < len(pairs)):
+            break
+        budget *= 2
+
+    if has_gauss:
+        uniforms[0] = raw[0]
+    if needed:
+        f = np.sqrt(-2.0 * np.log(r2[accepted]) / r2[accepted])
+        uniform_pairs = pairs[accepted + 1]
+        normals[first::2] = f * x2[accepted]
+        normals[first + 1::2] = (f * x1[accepted])[:rows // 2]
+        uniforms[first::2] = uniform_pairs[:, 0]
+        uniforms[first + 1::2] = uniform_pairs[:rows // 2, 1]
+
+    # Rewind and advance by exactly the doubles the loop would have consumed
+    consumed = first
+    if needed:
+        consumed += 2 * (accepted[-1] + 1) + (2 if rows % 2 == 0 else 1)
+    np.random.set_state(state)
+    np.random.random_sample(consumed)
+    if rows % 2:
+        gauss_state = (1, float(f[-1] * x1[accepted[-1]]))
+    else:
+        gauss_state = (0, 0.0)
+    np.random.set_state(np.random.get_state()[:3] + gauss_state)
+
+    return sigma * normals, _uniform(low, high, uniforms)
+
+
+def generate_global_epidemiology(scale=1, n_countries=None, n_years=None, rng=None, offset=0):
+    """Generate global epidemiology data (192 records at scale=1)"""
+    countries, _ = _scaled_labels(COUNTRIES, n_countries or len(COUNTRIES) * scale, offset * len(COUNTRIES))
+    years = np.arange(START_YEAR, START_YEAR + (n_years or N_YEARS))
+    year = np.tile(years, len(countries))
+    noise = _random_source(rng).normal(0, [0.3, 0.01, 0.01, 0.008], size=(len(year), 4))
+
+    # Non-linear growth in screen time with COVID acceleration
+    base_screen_time = 2.5 + (year - START_YEAR) * 0.8 + noise[:, 0]
+    base_screen_time = np.where(year >= COVID_YEAR, base_screen_time * 1.4, base_screen_time)
+
+    return _apply_schema('global_epidemiology', {
+        'country': _categorical(countries, np.repeat(np.arange(len(countries)), len(years))),
+        'year': year,
+        'avg_screen_time_hours': np.maximum(1.0, base_screen_time),
+        'depression_rate': np.minimum(0.4, 0.08 + base_screen_time * 0.025 + noise[:, 1]),
+        'anxiety_rate': np.minimum(0.35, 0.06 + base_screen_time * 0.022 + noise[:, 2]),
+        'sleep_disorders': np.minimum(0.3, 0.05 + base_screen_time * 0.018 + noise[:, 3])
     })
-    
-    return pd.DataFrame(data)
-
-def generate_disease_timeline():
-    """Generate disease timeline data (112 records)"""
-    diseases = ['depression', 'anxiety', 'sleep_disorders', 'obesity', 'ADHD', 'social_isolation', 'eating_disorders']
-    years = list(range(2010, 2026))  # Include 2025 for RAG-enhanced projections
-    
-    data = []
-    for disease in diseases:
-        for year in years:
-            # Disease-specific trends
-            if disease == 'depression':
-                base_rate = 0.08 + (year - 2010) * 0.008
-            elif disease == 'anxiety':
-                base_rate = 0.06 + (year - 2010) * 0.009
-            elif disease == 'sleep_disorders':
-                base_rate = 0.05 + (year - 2010) * 0.007
-            elif disease == 'obesity':
-                base_rate = 0.12 + (year - 2010) * 0.005
-            elif disease == 'ADHD':
-                base_rate = 0.04 + (year - 2010) * 0.006
-            elif disease == 'social_isolation':
-                base_rate = 0.03 + (year - 2010) * 0.012
-            else:  # eating_disorders
-                base_rate = 0.02 + (year - 2010) * 0.004
-            
-            # COVID impact
-            if year >= 2020:
-                base_rate *= 1.3
-            
-            data.append({
-                'disease': disease,
-                'year': year,
-                'prevalence_rate': min(0.5, base_rate + np.random.normal(0, 0.005)),
-                'screen_time_attribution': np.random.uniform(0.15, 0.45)
-            })
-    
-    return pd.DataFrame(data)
-
-def generate_ses_inequality():
-    """Generate SES inequality data (60 records)"""
-    income_levels = ['low', 'middle', 'high']
-    countries = ['USA', 'UK', 'Germany', 'France', 'Japan', 'Australia', 'Canada', 'Sweden', 'Netherlands', 'South Korea', 'Brazil', 'India', 'Mexico', 'Italy', 'Spain', 'Poland', 'Turkey', 'Chile', 'South Africa', 'Nigeria']
-    
-    data = []
-    for country in countries:
-        for income_level in income_levels:
-            # SES-based disparities
-            if income_level == 'low':
-                screen_time_multiplier = 1.4
-                health_impact_multiplier = 2.2  # 2.2x disparity
-                access_to_interventions = 0.3
-            elif income_level == 'middle':
-                screen_time_multiplier = 1.1
-                health_impact_multiplier = 1.3
-                access_to_interventions = 0.6
-            else:  # high
-                screen_time_multiplier = 0.9
-                health_impact_multiplier = 1.0
-                access_to_interventions = 0.9
-            
-            data.append({
-                'country': country,
-                'income_level': income_level,
-                'screen_time_multiplier': screen_time_multiplier,
-                'health_impact_multiplier': health_impact_multiplier,
-                'access_to_interventions': access_to_interventions
-            })
-    
-    return pd.DataFrame(data)
-
-def generate_detox_timeline():
-    """Generate detox timeline data (13 records)"""
-    weeks = list(range(0, 13))  # 0-12 weeks
-    
-    data = []
-    for week in weeks:
-        # Recovery trajectories
-        sleep_improvement = min(1.0, week * 0.12 + np.random.normal(0, 0.05))
-        mood_improvement = min(1.0, week * 0.08 + np.random.normal(0, 0.04))
-        attention_improvement = min(1.0, week * 0.10 + np.random.normal(0, 0.06))
-        
-        data.append({
-            'week': week,
-            'sleep_quality_improvement': max(0, sleep_improvement),
-            'mood_improvement': max(0, mood_improvement),
-            'attention_improvement': max(0, attention_improvement),
-            'relapse_risk': max(0, 0.8 - week * 0.06)
-        })
-    
-    return pd.DataFrame(data)
-
-def generate_policy_interventions():
-    """Generate policy interventions data (8 records)"""
-    interventions = [
-        'screen_time_limits',
-        'bedroom_phone_bans',
-        'social_media_age_restrictions',
-        'digital_literacy_education',
-        'algorithm_transparency',
-        'mental_health_warnings',
-        'parental_controls_mandate',
-        'tech_company_liability'
-    ]
-    
-    data = []
-    for intervention in interventions:
-        # Intervention effectiveness
-        if intervention in ['bedroom_phone_bans', 'screen_time_limits']:
-            effectiveness = np.random.uniform(0.65, 0.85)
-            implementation_difficulty = np.random.uniform(0.3, 0.5)
-        elif intervention in ['digital_literacy_education', 'parental_controls_mandate']:
-            effectiveness = np.random.uniform(0.45, 0.65)
-            implementation_difficulty = np.random.uniform(0.4, 0.6)
-        elif intervention in ['algorithm_transparency', 'tech_company_liability']:
-            effectiveness = np.random.uniform(0.55, 0.75)
-            implementation_difficulty = np.random.uniform(0.7, 0.9)
+
+
+def generate_age_stratification(scale=1, rng=None, offset=0):
+    """Generate age stratification data (80 records at scale=1)"""
+    age_groups, group_idx = _scaled_labels(AGE_GROUPS, len(AGE_GROUPS) * scale, offset * len(AGE_GROUPS))
+    n_hours = len(SCREEN_TIME_HOURS)
+
+    # Age-specific vulnerability multipliers with non-linear dose-response
+    vulnerability = np.repeat(AGE_VULNERABILITY[group_idx], n_hours)
+    health_impact = vulnerability * np.tile(DOSE_RESPONSE, len(age_groups)) / 100
+
+    return _apply_schema('age_stratification', {
+        'age_group': _categorical(age_groups, np.repeat(np.arange(len(age_groups)), n_hours)),
+        'screen_time_hours': np.tile(SCREEN_TIME_HOURS, len(age_groups)),
+        'vulnerability_multiplier': vulnerability,
+        'health_impact_score': np.minimum(1.0, health_impact),
+        'depression_risk': np.minimum(0.6, health_impact * 0.8),
+        'sleep_quality_loss': np.minimum(0.7, health_impact * 0.9)
+    })
+
+
+def generate_platform_comparison(scale=1, rng=None, offset=0):
+    """Generate platform comparison data (7 records at scale=1)"""
+    platforms, platform_idx = _scaled_labels(PLATFORMS, len(PLATFORMS) * scale, offset * len(PLATFORMS))
+    traits = PLATFORM_TRAITS[platform_idx]
+    # user_base_millions and avg_session_minutes, drawn row by row
+    if rng is None:
+        draws = np.random.randint([500, 15], [3000, 90], size=(len(platforms), 2))
+    else:
+        draws = rng.integers([500, 15], [3000, 90], size=(len(platforms), 2))
+
+    return _apply_schema('platform_comparison', {
+        'platform': _categorical(platforms, np.arange(len(platforms))),
+        'engagement_score': traits[:, 0],
+        'harm_score': traits[:, 1],
+        'addiction_potential': traits[:, 2],
+        'user_base_millions': draws[:, 0],
+        'avg_session_minutes': draws[:, 1]
+    })
+
+
+def generate_mechanisms(scale=1, rng=None, offset=0):
+    """Generate mechanisms data (41 records at scale=1)"""
+    mechanisms, mechanism_idx = _scaled_labels(MECHANISMS, len(MECHANISMS) * scale, offset * len(MECHANISMS))
+    n_outcomes = len(OUTCOMES)
+
+    # Mechanism-outcome strength ranges
+    strength_range = np.tile(WEAK_PATHWAY, (len(MECHANISMS), n_outcomes, 1))
+    for i, mechanism in enumerate(MECHANISMS):
+        linked, bounds = STRONG_PATHWAYS[mechanism]
+        strength_range[i, [OUTCOMES.index(outcome) for outcome in linked]] = bounds
+    strength_range = strength_range[mechanism_idx].reshape(-1, 2)
+
+    # One uniform draw for the strength, one for np.random.choice, per row
+    raw = _random_source(rng).random((len(strength_range), 2))
+    cdf = EVIDENCE_QUALITY_P.cumsum()
+    cdf /= cdf[-1]
+
+    mechanism_codes = np.repeat(np.arange(len(mechanisms)), n_outcomes)
+    outcomes = list(OUTCOMES)
+    outcome_codes = np.tile(np.arange(n_outcomes), len(mechanisms))
+    strength = _uniform(strength_range[:, 0], strength_range[:, 1], raw[:, 0])
+    quality_codes = cdf.searchsorted(raw[:, 1], side='right')
+
+    if offset == 0:
+        # Add one more record to reach 41 (once, in the first chunk)
+        mechanisms = np.append(mechanisms, 'blue_light_exposure')
+        mechanism_codes = np.append(mechanism_codes, len(mechanisms) - 1)
+        outcomes.append('circadian_disruption')
+        outcome_codes = np.append(outcome_codes, n_outcomes)
+        strength = np.append(strength, 0.85)
+        quality_codes = np.append(quality_codes, 0)  # high
+
+    return _apply_schema('mechanisms', {
+        'mechanism': _categorical(mechanisms, mechanism_codes),
+        'outcome': _categorical(outcomes, outcome_codes),
+        'pathway_strength': strength,
+        'evidence_quality': _categorical(EVIDENCE_QUALITY, quality_codes)
+    })
+
+
+def generate_disease_timeline(scale=1, n_years=None, rng=None, offset=0):
+    """Generate disease timeline data (112 records at scale=1)"""
+    diseases, disease_idx = _scaled_labels(DISEASES, len(DISEASES) * scale, offset * len(DISEASES))
+    years = np.arange(START_YEAR, START_YEAR + (n_years or N_YEARS))
+    year = np.tile(years, len(diseases))
+    trends = np.repeat(DISEASE_TRENDS[disease_idx], len(years), axis=0)
+
+    # Disease-specific trends with COVID impact
+    base_rate = trends[:, 0] + (year - START_YEAR) * trends[:, 1]
+    base_rate = np.where(year >= COVID_YEAR, base_rate * 1.3, base_rate)
+    if rng is None:
+        noise, attribution = _normal_uniform_pairs(len(year), 0.005, 0.15, 0.45)
+    else:
+        noise = rng.normal(0, 0.005, len(year))
+        attribution = rng.uniform(0.15, 0.45, len(year))
+
+    return _apply_schema('disease_timeline', {
+        'disease': _categorical(diseases, np.repeat(np.arange(len(diseases)), len(years))),
+        'year': year,
+        'prevalence_rate': np.minimum(0.5, base_rate + noise),
+        'screen_time_attribution': attribution
+    })
+
+
+def generate_ses_inequality(scale=1, n_countries=None, rng=None, offset=0):
+    """Generate SES inequality data (60 records at scale=1)"""
+    countries, _ = _scaled_labels(SES_COUNTRIES, n_countries or len(SES_COUNTRIES) * scale, offset * len(SES_COUNTRIES))
+    # SES-based disparities
+    profiles = np.tile(SES_PROFILES, (len(countries), 1))
+
+    return _apply_schema('ses_inequality', {
+        'country': _categorical(countries, np.repeat(np.arange(len(countries)), len(INCOME_LEVELS))),
+        'income_level': _categorical(INCOME_LEVELS, np.tile(np.arange(len(INCOME_LEVELS)), len(countries))),
+        'screen_time_multiplier': profiles[:, 0],
+        'health_impact_multiplier': profiles[:, 1],
+        'access_to_interventions': profiles[:, 2]
+    })
+
+
+def generate_detox_timeline(scale=1, rng=None, offset=0):
+    """Generate detox timeline data (13 records at scale=1, one per week)"""
+    week = np.arange(DETOX_WEEKS * offset, DETOX_WEEKS * (offset + scale))
+    noise = _random_source(rng).normal(0, [0.05, 0.04, 0.06], size=(len(week), 3))
+
+    # Recovery trajectories
+    return _apply_schema('detox_timeline', {
+        'week': week,
+        'sleep_quality_improvement': np.maximum(0, np.minimum(1.0, week * 0.12 + noise[:, 0])),
+        'mood_improvement': np.maximum(0, np.minimum(1.0, week * 0.08 + noise[:, 1])),
+        'attention_improvement': np.maximum(0, np.minimum(1.0, week * 0.10 + noise[:, 2])),
+        'relapse_risk': np.maximum(0, 0.8 - week * 0.06)
+    })
+
+
+def generate_policy_interventions(scale=1, rng=None, offset=0):
+    """Generate policy interventions data (8 records at scale=1)"""
+    interventions, intervention_idx = _scaled_labels(INTERVENTIONS, len(INTERVENTIONS) * scale, offset * len(INTERVENTIONS))
+    profiles = INTERVENTION_PROFILES[intervention_idx]
+    # Four uniform draws per row: effectiveness, difficulty, cost, feasibility
+    raw = _random_source(rng).random((len(interventions), 4))
+
+    return _apply_schema('policy_interventions', {
+        'intervention': _categorical(interventions, np.arange(len(interventions))),
+        'effectiveness_score': _uniform(profiles[:, 0], profiles[:, 1], raw[:, 0]),
+        'implementation_difficulty': _uniform(profiles[:, 2], profiles[:, 3], raw[:, 1]),
+        'cost_per_person': _uniform(10, 200, raw[:, 2]),
+        'political_feasibility': _uniform(0.2, 0.8, raw[:, 3])
+    })
+
+
+DATASET_GENERATORS = {
+    'global_epidemiology': generate_global_epidemiology,
+    'age_stratification': generate_age_stratification,
+    'platform_comparison': generate_platform_comparison,
+    'mechanisms': generate_mechanisms,
+    'disease_timeline': generate_disease_timeline,
+    'ses_inequality': generate_ses_inequality,
+    'detox_timeline': generate_detox_timeline,
+    'policy_interventions': generate_policy_interventions
+}
+
+
+def dataset_seed(seed, name):
+    """
+    Child SeedSequence for one dataset.
+
+    Keyed by the dataset name rather than spawn order, so adding, removing or
+    reordering datasets never changes the others.
+    """
+    return np.random.SeedSequence(seed, spawn_key=(zlib.crc32(name.encode()),))
+
+
+def _generate_seeded(name, scale, seed_sequence):
+    """Build one dataset from its own Generator (module-level so process pools can pickle it)"""
+    return DATASET_GENERATORS[name](scale, rng=np.random.default_rng(seed_sequence))
+
+
+def get_all_data(scale=1, seed=None, workers=None, processes=False):
+    """
+    Get all datasets as a dictionary
+
+    Without ``seed`` the datasets are drawn one after another from the global
+    ``np.random`` stream (seed 42 at import). With ``seed`` every dataset gets
+    its own Generator from ``dataset_seed`` and they are built concurrently in a
+    thread pool (or a process pool with ``processes=True``); ``workers=1``
+    builds them in-process. The result is identical for any worker count.
+    """
+    if seed is None:
+        return {name: generator(scale) for name, generator in DATASET_GENERATORS.items()}
+
+    seeds = {name: dataset_seed(seed, name) for name in DATASET_GENERATORS}
+    if workers == 1:
+        return {name: _generate_seeded(name, scale, seeds[name]) for name in DATASET_GENERATORS}
+
+    executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    workers = workers or min(len(DATASET_GENERATORS), os.cpu_count() or 1)
+    with executor_class(max_workers=workers) as executor:
+        futures = {name: executor.submit(_generate_seeded, name, scale, seeds[name]) for name in DATASET_GENERATORS}
+        # Collect in declaration order, whatever order the workers finish in
+        return {name: future.result() for name, future in futures.items()}
+
+
+def iter_dataset(name, scale=1, chunk_size=100_000, seed=None, **kwargs) -> Iterator[pd.DataFrame]:
+    """
+    Yield one dataset at ``scale`` as a sequence of DataFrame chunks.
+
+    Each chunk holds whole replicas and at most ``chunk_size`` rows (at least one
+    replica), so peak memory is bounded by the chunk size, not the total. Without
+    ``seed`` chunks are drawn from the global stream and concatenate to exactly
+    ``generate_<name>(scale)``; with ``seed`` every chunk gets its own Generator,
+    so the output depends on ``seed`` and ``chunk_size``. The fixed 41st mechanisms
+    row is emitted with the first chunk. Extra keyword arguments
+    (such as ``n_years``) are passed to the generator.
+    """
+    generator = DATASET_GENERATORS[name]
+    # A replica past the first leaves out fixed rows such as the 41st mechanism
+    rows_per_replica = len(generator(1, rng=np.random.default_rng(0), offset=1, **kwargs))
+    replicas_per_chunk = max(1, chunk_size // rows_per_replica)
+
+    for chunk_index, offset in enumerate(range(0, scale, replicas_per_chunk)):
+        rng = None
+        if seed is not None:
+            rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(zlib.crc32(name.encode()), chunk_index)))
+        yield generator(min(replicas_per_chunk, scale - offset), rng=rng, offset=offset, **kwargs)
+
+
+def _widen(df):
+    """The same data in the original layout: object strings, float64 and int64"""
+    columns = {}
+    for column, dtype in df.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            columns[column] = df[column].astype(object)
+        elif dtype.kind == 'f':
+            columns[column] = df[column].astype('float64')
+        elif dtype.kind == 'i':
+            columns[column] = df[column].astype('int64')
         else:
-            effectiveness = np.random.uniform(0.35, 0.55)
-            implementation_difficulty = np.random.uniform(0.5, 0.7)
-        
-        data.append({
-            'intervention': intervention,
-            'effectiveness_score': effectiveness,
-            'implementation_difficulty': implementation_difficulty,
-            'cost_per_person': np.random.uniform(10, 200),
-            'political_feasibility': np.random.uniform(0.2, 0.8)
+            columns[column] = df[column]
+    return pd.DataFrame(columns)
+
+
+def memory_report(data):
+    """Deep memory usage of each dataset, compact schema vs the original object/float64/int64 layout"""
+    rows = []
+    for name, df in data.items():
+        compact_bytes = int(df.memory_usage(deep=True).sum())
+        wide_bytes = int(_widen(df).memory_usage(deep=True).sum())
+        rows.append({
+            'dataset': name,
+            'records': len(df),
+            'compact_bytes': compact_bytes,
+            'wide_bytes': wide_bytes,
+            'reduction': wide_bytes / compact_bytes
         })
-    
-    return pd.DataFrame(data)
-
-def get_all_data():
-    """Get all datasets as a dictionary"""
-    return {
-        'global_epidemiology': generate_global_epidemiology(),
-        'age_stratification': generate_age_stratification(),
-        'platform_comparison': generate_platform_comparison(),
-        'mechanisms': generate_mechanisms(),
-        'disease_timeline': generate_disease_timeline(),
-        'ses_inequality': generate_ses_inequality(),
-        'detox_timeline': generate_detox_timeline(),
-        'policy_interventions': generate_policy_interventions()
-    }
+    return pd.DataFrame(rows)
 
 if __name__ == "__main__":
     data = get_all_data()
     total_records = sum(len(df) for df in data.values())
     print(f"Generated {total_records} records across {len(data)} datasets:")
     for name, df in data.items():
-        print(f"  {name}: {len(df)} records")
\ No newline at end of file
+        print(f"  {name}: {len(df)} records")
+    print("\nMemory usage (deep):")
+    print(memory_report(data).to_string(index=False))
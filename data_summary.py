@@ -0,0 +1,270 @@
+"""
+Digital Detox Weaver: Data Summary Engine (SOURCE 1 -> SOURCE 2)
+Precomputed statistics of the SOURCE 1 datasets, rendered for the agent prompts
+
+One vectorized pass over the eight datasets computes descriptive statistics,
+yearly trends with their inflection points, correlations and the key age,
+SES, platform and policy contrasts. Sections are rendered in priority order
+until a token budget is used up. Computed sections are cached by data
+fingerprint, in memory and as JSON under CACHE_DIR, so repeated workflow runs
+skip the computation entirely.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Mapping
+
+import numpy as np
+import pandas as pd
+
+from bootstrap import bootstrap_ci, format_ci
+from config import CACHE_DIR
+from data_cache import LazyDatasets, frame_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the computed sections change; part of the cache key
+SUMMARY_VERSION = 1
+DEFAULT_MAX_TOKENS = 1200
+# Rough English/markdown ratio, good enough for budgeting (the same estimate as
+# .kiro/agents/tokens.py; root modules do not depend on .kiro being importable)
+CHARS_PER_TOKEN = 4
+
+_sections_cache: Dict[str, "OrderedDict[str, List[str]]"] = {}
+_cache_lock = threading.Lock()
+
+GLOBAL_METRICS = ['avg_screen_time_hours', 'depression_rate', 'anxiety_rate', 'sleep_disorders']
+# Grid axes, not measurements; left out of the descriptive statistics
+AXIS_COLUMNS = ['year', 'week', 'screen_time_hours']
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of ``text``"""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def data_fingerprint(data: Mapping[str, pd.DataFrame]) -> str:
+    """
+    Identity of a dataset collection.
+
+    Cached collections are identified by their cache directory (generator
+    version, seed and scale) without loading anything; other mappings are
+    hashed by content.
+    """
+    if isinstance(data, LazyDatasets):
+        return data.cache.directory.name
+    return frame_fingerprint(*(data[name] for name in sorted(data)))
+
+
+def _slopes(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Least-squares slope of every column of ``y`` against ``x``"""
+    centered = x - x.mean()
+    return centered @ (y - y.mean(axis=0)) / (centered @ centered)
+
+
+def _inflections(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """For every column of ``y``, the ``x`` where the year-over-year change shifts most"""
+    if len(x) < 3:
+        return np.full(y.shape[1], x[0])
+    return x[1:-1][np.abs(np.diff(y, n=2, axis=0)).argmax(axis=0)]
+
+
+def _fmt(value: float) -> str:
+    return f"{value:.3g}"
+
+
+def _trend_line(label: str, years: np.ndarray, values: np.ndarray, slope: float, inflection: int) -> str:
+    first, last = values[0], values[-1]
+    change = (last / first - 1) if first else np.nan
+    return (f"- {label}: {_fmt(first)} ({years[0]}) -> {_fmt(last)} ({years[-1]}), {change:+.0%}, "
+            f"slope {_fmt(slope)}/yr, inflection {inflection}")
+
+
+def compute_sections(data: Mapping[str, pd.DataFrame]) -> "OrderedDict[str, List[str]]":
+    """All summary sections, highest priority first, each a list of markdown lines"""
+    sections: "OrderedDict[str, List[str]]" = OrderedDict()
+
+    # Global trends: country means per year, with 95% bootstrap CIs for the latest year
+    epi = data['global_epidemiology']
+    yearly = epi.groupby('year', observed=True)[GLOBAL_METRICS].mean()
+    years = yearly.index.to_numpy()
+    values = yearly.to_numpy(np.float64)
+    slopes = _slopes(years.astype(np.float64), values)
+    inflections = _inflections(years, values)
+    lines = [_trend_line(column, years, values[:, i], slopes[i], inflections[i]) for i, column in enumerate(GLOBAL_METRICS)]
+    latest = epi[epi['year'] == years[-1]]
+    for _, row in bootstrap_ci(latest, GLOBAL_METRICS).iterrows():
+        lines.append(f"- {years[-1]} {row['column']} across {row['n']} countries: {format_ci(row, '{:.3f}')}")
+    sections[f"Global trends ({epi['country'].nunique()} countries, {years[0]}-{years[-1]})"] = lines
+
+    # Correlations across country-years, platforms and disease-years
+    corr = np.corrcoef(epi[GLOBAL_METRICS].to_numpy(np.float64), rowvar=False)[0, 1:]
+    platforms = data['platform_comparison']
+    traits = platforms[['harm_score', 'addiction_potential', 'engagement_score']].to_numpy(np.float64)
+    platform_corr = np.corrcoef(traits, rowvar=False)[0, 1:]
+    disease = data['disease_timeline']
+    disease_corr = np.corrcoef(disease['prevalence_rate'], disease['screen_time_attribution'])[0, 1]
+    sections["Correlations (Pearson r)"] = [
+        "- screen time vs " + ", ".join(f"{column} {r:.2f}" for column, r in zip(GLOBAL_METRICS[1:], corr)),
+        f"- platform harm vs addiction {platform_corr[0]:.2f}, vs engagement {platform_corr[1]:.2f}",
+        f"- disease prevalence vs screen-time attribution {disease_corr:.2f}",
+    ]
+
+    # Age vulnerability and the fitted dose-response exponent
+    age = data['age_stratification']
+    by_age = age.groupby('age_group', observed=True, sort=False).agg(
+        vulnerability=('vulnerability_multiplier', 'first'), impact=('health_impact_score', 'mean'))
+    lines = ["- mean health impact: " + ", ".join(f"{group} {row['impact']:.3f} ({row['vulnerability']:.1f}x)"
+                                                  for group, row in by_age.iterrows())]
+    uncapped = age[(age['health_impact_score'] < 1.0) & (age['health_impact_score'] > 0)]
+    if len(uncapped) > 2:
+        exponent = np.polyfit(np.log(uncapped['screen_time_hours'].to_numpy(np.float64)),
+                              np.log(uncapped['health_impact_score'].to_numpy(np.float64) / uncapped['vulnerability_multiplier'].to_numpy(np.float64)), 1)[0]
+        lines.append(f"- dose-response exponent (log-log fit, uncapped rows): {exponent:.2f}")
+    if {'13-17', '50+'} <= set(by_age.index):
+        lines.append(f"- 13-17 vs 50+ mean impact ratio: {by_age.loc['13-17', 'impact'] / by_age.loc['50+', 'impact']:.1f}x")
+    sections["Age vulnerability"] = lines
+
+    # SES inequality
+    ses = data['ses_inequality'].groupby('income_level', observed=True, sort=False)[
+        ['screen_time_multiplier', 'health_impact_multiplier', 'access_to_interventions']].mean()
+    lines = [f"- {level}: screen time {row['screen_time_multiplier']:.2f}x, health impact {row['health_impact_multiplier']:.2f}x, "
+             f"intervention access {row['access_to_interventions']:.0%}" for level, row in ses.iterrows()]
+    if {'low', 'high'} <= set(ses.index):
+        lines.append(f"- low vs high income health impact: {ses.loc['low', 'health_impact_multiplier'] / ses.loc['high', 'health_impact_multiplier']:.1f}x")
+    sections["SES inequality"] = lines
+
+    # Disease trends: one slope and inflection per disease from a year x disease pivot
+    prevalence = disease.pivot_table(index='year', columns='disease', values='prevalence_rate', observed=True)
+    disease_years = prevalence.index.to_numpy()
+    disease_values = prevalence.to_numpy(np.float64)
+    disease_slopes = _slopes(disease_years.astype(np.float64), disease_values)
+    disease_inflections = _inflections(disease_years, disease_values)
+    order = np.argsort(-disease_slopes)
+    sections["Disease prevalence trends (fastest growing first)"] = [
+        _trend_line(str(prevalence.columns[i]), disease_years, disease_values[:, i], disease_slopes[i], disease_inflections[i])
+        for i in order
+    ]
+
+    # Platforms ranked by harm
+    ranked = platforms.sort_values('harm_score', ascending=False)
+    sections["Platforms (by harm score)"] = [
+        "- " + "; ".join(f"{row.platform} harm {row.harm_score:.1f}, addiction {row.addiction_potential:.1f}, "
+                         f"{row.avg_session_minutes} min/session" for row in ranked.head(7).itertuples())
+    ]
+
+    # Mechanisms: strongest pathways and evidence mix
+    mechanisms = data['mechanisms']
+    strongest = mechanisms.nlargest(5, 'pathway_strength')
+    evidence = mechanisms['evidence_quality'].value_counts(normalize=True)
+    sections["Mechanisms"] = [
+        "- strongest pathways: " + ", ".join(f"{row.mechanism} -> {row.outcome} {row.pathway_strength:.2f}" for row in strongest.itertuples()),
+        "- evidence quality: " + ", ".join(f"{quality} {share:.0%}" for quality, share in evidence.items()),
+    ]
+
+    # Detox recovery milestones
+    detox = data['detox_timeline']
+    lines = []
+    for column in ['sleep_quality_improvement', 'mood_improvement', 'attention_improvement']:
+        reached = detox.loc[detox[column] >= 0.5, 'week']
+        lines.append(f"- {column} reaches 50% by week {reached.min() if len(reached) else 'n/a'}")
+    lines.append(f"- relapse risk {detox['relapse_risk'].iloc[0]:.0%} at week {detox['week'].iloc[0]}, "
+                 f"{detox['relapse_risk'].min():.0%} by week {detox.loc[detox['relapse_risk'].idxmin(), 'week']}")
+    sections["Detox recovery"] = lines
+
+    # Policy: the Tab 8 priority score
+    policy = data['policy_interventions']
+    priority = policy['effectiveness_score'] * policy['political_feasibility'] / policy['implementation_difficulty']
+    top = policy.assign(priority=priority).nlargest(3, 'priority')
+    sections["Top policy interventions (effectiveness x feasibility / difficulty)"] = [
+        f"- {row.intervention}: priority {row.priority:.2f}, effectiveness {row.effectiveness_score:.0%}, ${row.cost_per_person:.0f}/person"
+        for row in top.itertuples()
+    ]
+
+    # Descriptive statistics, one aggregate call per dataset
+    lines = []
+    for name in data:
+        df = data[name]
+        numeric = df.select_dtypes('number').drop(columns=AXIS_COLUMNS, errors='ignore')
+        stats = numeric.agg(['mean', 'std', 'min', 'max'])
+        columns = ", ".join(f"{column} {_fmt(stats.at['mean', column])}±{_fmt(stats.at['std', column])} "
+                            f"[{_fmt(stats.at['min', column])}, {_fmt(stats.at['max', column])}]" for column in numeric.columns)
+        lines.append(f"- {name} ({len(df)} rows): {columns}")
+    sections["Descriptive statistics (mean±std [min, max])"] = lines
+
+    return sections
+
+
+def render_summary(sections: Mapping[str, List[str]], max_tokens: int = DEFAULT_MAX_TOKENS) -> str:
+    """
+    Render sections in priority order within ``max_tokens``.
+
+    Lines that would overflow the budget are dropped; a section whose first
+    line does not fit is left out along with its header.
+    """
+    output: List[str] = []
+    used = 0
+    for title, lines in sections.items():
+        header = f"### {title}"
+        kept = []
+        cost = estimate_tokens(header) + 1
+        for line in lines:
+            line_cost = estimate_tokens(line) + 1
+            if used + cost + line_cost > max_tokens:
+                break
+            kept.append(line)
+            cost += line_cost
+        if kept:
+            output.extend([header] + kept)
+            used += cost
+    return "\n".join(output)
+
+
+def _cache_path(fingerprint: str, cache_dir: Path) -> Path:
+    return Path(cache_dir) / "summaries" / f"v{SUMMARY_VERSION}_{fingerprint}.json"
+
+
+def get_sections(data: Mapping[str, pd.DataFrame], cache_dir: Path = CACHE_DIR) -> "OrderedDict[str, List[str]]":
+    """Summary sections for ``data``, from memory, then disk, then computed"""
+    fingerprint = data_fingerprint(data)
+    with _cache_lock:
+        if fingerprint in _sections_cache:
+            return _sections_cache[fingerprint]
+
+    path = _cache_path(fingerprint, cache_dir)
+    if path.exists():
+        sections = OrderedDict(json.loads(path.read_text()))
+        logger.info(f"✓ Data summary loaded from {path}")
+    else:
+        sections = compute_sections(data)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A temp file per writer, so concurrent first builds never share one
+        fd, tmp = tempfile.mkstemp(prefix=f".{path.stem}.", suffix=".json", dir=path.parent)
+        with os.fdopen(fd, "w") as f:
+            json.dump(list(sections.items()), f)
+        os.replace(tmp, path)
+        logger.info(f"✓ Data summary computed and cached at {path}")
+
+    with _cache_lock:
+        _sections_cache[fingerprint] = sections
+    return sections
+
+
+def build_data_summary(data: Mapping[str, pd.DataFrame], max_tokens: int = DEFAULT_MAX_TOKENS, cache_dir: Path = CACHE_DIR) -> str:
+    """Token-budgeted text summary of the SOURCE 1 datasets for the analysis prompts"""
+    summary = render_summary(get_sections(data, cache_dir), max_tokens)
+    logger.info(f"✓ Data summary: ~{estimate_tokens(summary)} tokens (budget {max_tokens})")
+    return summary
+
+
+if __name__ == "__main__":
+    from data_cache import load_datasets
+
+    summary = build_data_summary(load_datasets())
+    print(summary)
+    print(f"\n~{estimate_tokens(summary)} tokens")
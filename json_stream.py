@@ -0,0 +1,168 @@
+"""
+Digital Detox Weaver: Streaming JSON Extraction
+The first JSON object of an LLM answer, read chunk by chunk as it streams in
+
+LLM answers wrap their JSON in markdown fences and prose. ``JSONObjectExtractor``
+skips everything before the first ``{``, tracks brace depth (ignoring braces
+inside strings) across chunk boundaries and parses the object as soon as its
+closing brace arrives, so callers can stop reading the stream there. Chunks
+are kept in a list and joined once per candidate, and each character is
+scanned once and parsed at most once. A balanced candidate that is not valid
+JSON (a ``{placeholder}`` in prose) is dropped and the scan resumes after it,
+so an object nested inside such a candidate is not found.
+
+``validate`` checks parsed data against a typed schema written with ``typing``:
+a dict of field schemas for objects, ``List[X]`` for lists, ``Optional[X]`` for
+fields that may be missing or null, and ``float``/``int``/``str``/``bool``.
+``typing`` only accepts types as parameters (``List[{...}]`` raises TypeError
+before Python 3.11), so a list of objects is written as a one-element list,
+``[{"name": str}]``; ``[X]`` works for any item schema.
+"""
+
+import json
+import re
+import typing
+from typing import Any, Iterable, List, Optional
+
+# Outside strings only braces and quotes matter; inside, only quotes and escapes
+STRUCTURE = re.compile(r'[{}"]')
+STRING = re.compile(r'["\\]')
+TYPE_NAMES = {float: "a number", int: "an integer", str: "a string", bool: "a boolean"}
+
+
+class JSONObjectExtractor:
+    """Incremental scanner for the first complete JSON object in streamed text"""
+
+    def __init__(self):
+        self.value: Any = None
+        self.done = False
+        # Characters fed so far (for token accounting)
+        self.chars = 0
+        # Pieces of the current candidate, joined once when its braces balance
+        self._parts: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> bool:
+        """Scan the next chunk; True once the object is complete (``value`` holds it)"""
+        if self.done:
+            return True
+        if not chunk:
+            return False
+        self.chars += len(chunk)
+        pos = 0
+        while True:
+            begin = 0
+            if not self._depth:
+                begin = chunk.find("{", pos)
+                if begin < 0:
+                    return False
+                self._parts, self._depth, self._in_string, self._escaped = [], 1, False, False
+                pos = begin + 1
+            end = self._scan(chunk, pos)
+            if end is None:
+                self._parts.append(chunk[begin:])
+                return False
+            self._parts.append(chunk[begin:end])
+            candidate, self._parts = "".join(self._parts), []
+            try:
+                self.value = json.loads(candidate)
+            except json.JSONDecodeError:
+                # Not JSON (a ``{placeholder}`` in prose): look for an object after it
+                pos = end
+                continue
+            self.done = True
+            return True
+
+    def _scan(self, chunk: str, pos: int) -> Optional[int]:
+        """Offset in ``chunk`` just past the brace that closes the candidate, else None"""
+        if self._escaped:
+            # The escaped character opens this chunk
+            self._escaped = False
+            pos += 1
+        while True:
+            if self._in_string:
+                match = STRING.search(chunk, pos)
+                if match is None:
+                    return None
+                if match.group() == "\\":
+                    if match.end() == len(chunk):
+                        self._escaped = True
+                        return None
+                    pos = match.end() + 1
+                    continue
+                self._in_string = False
+                pos = match.end()
+                continue
+            match = STRUCTURE.search(chunk, pos)
+            if match is None:
+                return None
+            pos = match.end()
+            char = match.group()
+            if char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if not self._depth:
+                    return pos
+
+
+def extract_json(chunks: Iterable[str]) -> Optional[Any]:
+    """
+    The first JSON object in ``chunks``, or None if there is none
+
+    Stops pulling from ``chunks`` as soon as the object is complete.
+    """
+    extractor = JSONObjectExtractor()
+    for chunk in chunks:
+        if extractor.feed(chunk):
+            return extractor.value
+    return None
+
+
+def _optional(schema) -> Optional[Any]:
+    """X for a schema written ``Optional[X]``, else None"""
+    if typing.get_origin(schema) is typing.Union:
+        args = [arg for arg in typing.get_args(schema) if arg is not type(None)]
+        if len(args) == 1 and len(typing.get_args(schema)) == 2:
+            return args[0]
+    return None
+
+
+def validate(data: Any, schema, path: str = "") -> Any:
+    """
+    ``data`` checked against ``schema``; returned unchanged
+
+    Raises ValueError naming the first field that is missing or mistyped.
+    Object keys not in the schema are allowed.
+    """
+    name = path or "response"
+    inner = _optional(schema)
+    if inner is not None:
+        return data if data is None else validate(data, inner, path)
+    if isinstance(schema, dict):
+        if not isinstance(data, dict):
+            raise ValueError(f"{name}: expected an object")
+        prefix = f"{path}." if path else ""
+        for key, field in schema.items():
+            if key not in data and _optional(field) is None:
+                raise ValueError(f"{prefix}{key}: missing")
+            validate(data.get(key), field, f"{prefix}{key}")
+        return data
+    if isinstance(schema, list) or typing.get_origin(schema) is list:
+        if not isinstance(data, list):
+            raise ValueError(f"{name}: expected a list")
+        (item,) = schema if isinstance(schema, list) else typing.get_args(schema)
+        for i, value in enumerate(data):
+            validate(value, item, f"{name}[{i}]")
+        return data
+    valid = isinstance(data, (int, float) if schema is float else schema)
+    # bool is an int subclass, but never a valid number
+    if isinstance(data, bool) and schema is not bool:
+        valid = False
+    if not valid:
+        raise ValueError(f"{name}: expected {TYPE_NAMES.get(schema, schema.__name__)}")
+    return data
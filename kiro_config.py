@@ -0,0 +1,27 @@
+"""
+Digital Detox Weaver: Orchestration Configuration
+SOURCE 4 (Orchestration Framework) - the .kiro/config package under the name ``kiro_config``
+
+The root config.py and the .kiro/config package (llm_config, agent_config)
+are both called ``config``, and whichever comes first on sys.path hides the
+other. Importing this module loads .kiro/config as a regular package named
+``kiro_config`` (its ``__init__`` runs as usual), so
+
+    from kiro_config.llm_config import llm_config
+    from kiro_config.agent_config import agent_config
+
+resolve regardless of path order, while ``config`` stays the root module.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+PACKAGE_DIR = Path(__file__).resolve().parent / ".kiro" / "config"
+
+_spec = importlib.util.spec_from_file_location(__name__, PACKAGE_DIR / "__init__.py",
+                                               submodule_search_locations=[str(PACKAGE_DIR)])
+_package = importlib.util.module_from_spec(_spec)
+# The import system returns sys.modules[__name__], so the package replaces this loader module
+sys.modules[__name__] = _package
+_spec.loader.exec_module(_package)
@@ -7,11 +7,14 @@ Implements SOURCE 4 - Orchestration Framework
 Integrates all 4 data sources into unified analysis pipeline
 """
 
+import argparse
 import asyncio
+import json
 import logging
+import os
 import sys
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 # Add .kiro to path for imports
@@ -19,8 +22,14 @@ sys.path.append(str(Path(__file__).parent / ".kiro"))
 
 try:
     from agents.llm_router import llm_router
-    from config.agent_config import agent_config
+    from agents.rate_limiter import BATCH
+    from agents.tokens import estimate_tokens
+    from kiro_config.agent_config import agent_config
     from prompts.analysis_prompts import analysis_prompts
+    from prompts.budget import STEP_BUDGETS
+    from workflows.scheduler import WorkflowScheduler, WorkflowStep
+    from workflows.step_cache import StepCache
+    from config import CACHE_DIR
 except ImportError as e:
     print(f"Import error: {e}")
     print("Make sure all .kiro files are created first")
@@ -49,12 +58,27 @@ class KiroOrchestrator:
     Handles multi-LLM routing with streaming
     """
     
-    def __init__(self):
+    def __init__(self, step_cache: Optional[StepCache] = None):
         self.llm_router = llm_router
         self.agent_config = agent_config
         self.prompts = analysis_prompts
         self.output_dir = Path("outputs")
         self.output_dir.mkdir(exist_ok=True)
+        self.lineage_file = Path(".kiro") / "data_lineage.md"
+        
+        # Agent outputs keyed by their full LLM input, reused across runs
+        self.step_cache = step_cache or StepCache(CACHE_DIR / "steps")
+        
+        # SOURCE 1 datasets and upstream agent outputs fed into later prompts
+        self.data = None
+        self.step_outputs: Dict[str, str] = {}
+        
+        # Estimated prompt/response tokens per agent step, for the token report
+        self.token_usage: Dict[str, Dict[str, Any]] = {}
+        
+        # Set by run_dashboard_workflow: console echo and the scheduler's timing report
+        self.echo_stream = True
+        self.workflow_report = None
         
         # Data source tracking
         self.data_sources_status = {
@@ -101,7 +125,46 @@ class KiroOrchestrator:
             status += f"  • {source_info['name']}: {source_info['status']} ({source_info['location']})\n"
         return status
     
-    async def run_dashboard_workflow(self):
+    def workflow_steps(self) -> List[WorkflowStep]:
+        """
+        The 10-step pipeline as a dependency graph
+        
+        Each step declares the artifacts it reads and writes; initialization,
+        data generation and lineage do not depend on the LLM analysis chain,
+        and steps 4-5 both only need the analysis.
+        """
+        datasets = "SOURCE 1 datasets"
+        analysis = "outputs/03_analysis.md"
+        visualization = "outputs/04_visualization_design.md"
+        health = "outputs/05_health_insights.md"
+        policy = "outputs/06_policy_recommendations.md"
+        report = "outputs/FINAL_REPORT.md"
+        lineage = ".kiro/data_lineage.md"
+        return [
+            WorkflowStep("01_initialization", self.initialization_step, [], ["outputs/01_initialization.md"],
+                         "📋 Initializing project"),
+            WorkflowStep("02_data_generation", self.data_generation_step, [], [datasets],
+                         "📊 Generating SOURCE 1 epidemiological data"),
+            WorkflowStep("03_analysis", self.analysis_step, [datasets], [analysis],
+                         "🔬 Analyzing SOURCE 1 data"),
+            WorkflowStep("04_visualization_design", self.visualization_design_task, [analysis], [visualization],
+                         "🎨 Designing visualizations"),
+            WorkflowStep("05_health_insights", self.health_insights_task, [analysis], [health],
+                         "🧠 Generating health insights"),
+            WorkflowStep("06_dashboard_code", self.dashboard_code_step, [datasets], ["dashboard"],
+                         "📱 Generating dashboard code (SOURCE 3)"),
+            WorkflowStep("07_policy_recommendations", self.policy_recommendations_step, [health], [policy],
+                         "📋 Policy recommendations"),
+            WorkflowStep("08_report", self.report_generation_step, [analysis, health, policy], [report],
+                         "📄 Generating comprehensive report"),
+            WorkflowStep("09_data_lineage", self.data_lineage_step, [], [lineage],
+                         "🔗 Documenting data lineage"),
+            WorkflowStep("10_finalization", self.finalization_step,
+                         ["outputs/01_initialization.md", visualization, report, lineage, "dashboard"], [],
+                         "✅ Finalizing and deploying"),
+        ]
+    
+    async def run_dashboard_workflow(self, max_concurrency: Optional[int] = None):
         """
         Execute complete 10-step Digital Detox Weaver workflow
         
@@ -116,51 +179,26 @@ class KiroOrchestrator:
         8. Generate report
         9. Document data lineage
         10. Finalize and deploy
+        
+        Steps start as soon as their inputs exist, up to ``max_concurrency``
+        at a time (WORKFLOW_MAX_CONCURRENCY, default 4), so the run takes
+        about as long as its critical path.
+        Agent steps whose LLM input is unchanged since an earlier run reuse
+        the cached output from ``self.step_cache`` instead of calling the LLM.
         """
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("WORKFLOW_MAX_CONCURRENCY", "4"))
+        # Echo agent output live only when steps cannot interleave on the console;
+        # concurrent steps print their whole response when they finish
+        self.echo_stream = max_concurrency == 1
         
         logger.info("\n" + "═" * 70)
-        logger.info("🚀 Starting Digital Detox Weaver Workflow")
+        logger.info(f"🚀 Starting Digital Detox Weaver Workflow (max {max_concurrency} concurrent steps)")
         logger.info("═" * 70)
         
         try:
-            # Step 1: Initialization
-            logger.info("\n📋 STEP 1: Initializing project...")
-            self.data_sources_status["source_2_ai_analysis"]["status"] = "generating"
-            await self.initialization_step()
-            
-            # Step 2: Data Generation (SOURCE 1)
-            logger.info("\n📊 STEP 2: Generating SOURCE 1 epidemiological data...")
-            self.data_sources_status["source_1_epidemiological"]["status"] = "generated"
-            await self.data_generation_step()
-            
-            # Step 3: Analysis
-            logger.info("\n🔬 STEP 3: Analyzing SOURCE 1 data...")
-            await self.analysis_step()
-            
-            # Step 4-5: Parallel Insights
-            logger.info("\n🎨 STEPS 4-5: Parallel insights generation...")
-            await self.parallel_insights_step()
-            
-            # Step 6: Dashboard Generation (SOURCE 3)
-            logger.info("\n📱 STEP 6: Generating dashboard code (SOURCE 3)...")
-            self.data_sources_status["source_3_project_code"]["status"] = "operational"
-            await self.dashboard_code_step()
-            
-            # Step 7: Policy
-            logger.info("\n📋 STEP 7: Policy recommendations...")
-            await self.policy_recommendations_step()
-            
-            # Step 8: Report
-            logger.info("\n📄 STEP 8: Generating comprehensive report...")
-            await self.report_generation_step()
-            
-            # Step 9: Data Lineage
-            logger.info("\n🔗 STEP 9: Documenting data lineage...")
-            await self.data_lineage_step()
-            
-            # Step 10: Finalization
-            logger.info("\n✅ STEP 10: Finalizing and deploying...")
-            await self.finalization_step()
+            scheduler = WorkflowScheduler(self.workflow_steps(), max_concurrency=max_concurrency)
+            self.workflow_report = await scheduler.run()
             
             # Summary
             self._log_completion_summary()
@@ -169,21 +207,83 @@ class KiroOrchestrator:
             logger.error(f"Workflow failed: {e}", exc_info=True)
             raise
     
+    def _echo(self, chunk: str):
+        """Stream a chunk to the console when steps run one at a time"""
+        if self.echo_stream:
+            print(chunk, end="", flush=True)
+    
+    def _echo_step(self, step: str, response_text: str):
+        """Print a finished step's response in one piece when steps run concurrently"""
+        if not self.echo_stream:
+            print(f"\n── {step} ──\n{response_text}", flush=True)
+    
+    async def _generate(self, step: str, prompt: str, system: str, temperature: float, echo: bool = False) -> str:
+        """
+        Stream one agent response, or reuse the cached output for identical input
+        
+        Only answers the router reports as complete are cached (not provider
+        errors, nor a partial answer followed by a fallback's), keyed by the
+        provider that served them, so the next run retries the rest. Lookups
+        use the provider routing would try first, as the response cache does.
+        """
+        def model(provider):
+            return f"{provider}/{self.llm_router.model_name(provider)}"
+        
+        key = StepCache.key(prompt, system, temperature, model(self.llm_router.provider_order()[0]))
+        cached = self.step_cache.get(step, key)
+        if cached is not None:
+            logger.info(f"✓ {step}: inputs unchanged, reusing cached output ({key[:12]})")
+            self._record_tokens(step, prompt, system, cached, cached=True)
+            return cached
+        
+        response_text = ""
+        served = {}
+        async for chunk in self.llm_router.agenerate(
+            prompt=prompt,
+            system=system,
+            temperature=temperature,
+            streaming=True,
+            priority=BATCH,
+            prefix=self.prompts.data_sources_context(),
+            served=served
+        ):
+            response_text += chunk
+            if echo:
+                self._echo(chunk)
+        if echo:
+            self._echo_step(step, response_text)
+        
+        if served:
+            served_model = model(served["provider"])
+            self.step_cache.put(step, StepCache.key(prompt, system, temperature, served_model), response_text, served_model)
+        self._record_tokens(step, prompt, system, response_text, cached=False)
+        return response_text
+    
+    def _record_tokens(self, step: str, prompt: str, system: str, response: str, cached: bool):
+        """Log and keep the estimated tokens in (prompt + system) and out for one step"""
+        usage = {
+            "prompt_tokens": estimate_tokens(prompt),
+            "system_tokens": estimate_tokens(system),
+            "response_tokens": estimate_tokens(response),
+            "budget": STEP_BUDGETS.get(step),
+            "cached": cached
+        }
+        self.token_usage[step] = usage
+        budget = f" (prompt budget {usage['budget']})" if usage["budget"] else ""
+        logger.info(f"✓ {step}: ~{usage['prompt_tokens'] + usage['system_tokens']} tokens in{budget}, "
+                    f"~{usage['response_tokens']} out{' (cached)' if cached else ''}")
+    
     async def initialization_step(self):
         """Step 1: Initialize project with research framework"""
+        self.data_sources_status["source_2_ai_analysis"]["status"] = "generating"
         prompt = self.prompts.initialization_prompt()
         
-        response_text = ""
         logger.info("Generating initialization framework from SOURCE 2 (Data Analyst Agent)...")
         
-        for chunk in self.llm_router.generate(
-            prompt=prompt,
-            system=agent_config.DATA_ANALYST_SYSTEM_PROMPT,
-            temperature=agent_config.AGENT_TEMPERATURES["data_analyst"],
-            streaming=True
-        ):
-            response_text += chunk
-            print(chunk, end="", flush=True)
+        response_text = await self._generate(
+            "01_initialization", prompt, agent_config.DATA_ANALYST_SYSTEM_PROMPT,
+            agent_config.AGENT_TEMPERATURES["data_analyst"], echo=True
+        )
         
         output_file = self.output_dir / "01_initialization.md"
         output_file.write_text(response_text)
@@ -191,16 +291,20 @@ class KiroOrchestrator:
     
     async def data_generation_step(self):
         """Step 2: Generate SOURCE 1 epidemiological data"""
+        self.data_sources_status["source_1_epidemiological"]["status"] = "generated"
         logger.info("Executing SOURCE 1: Epidemiological Data Generator...")
         
         try:
-            from data_generators import get_all_data
-            data = get_all_data()
+            from data_cache import load_datasets
+            data = load_datasets()
+            self.data = data
             
-            record_count = sum(len(df) for df in data.values())
+            # Row counts come from file metadata; no dataset is loaded here
+            record_count = sum(data.num_rows(name) for name in data)
             dataset_count = len(data)
             
             logger.info(f"✓ SOURCE 1 Generated: {record_count} records across {dataset_count} datasets")
+            logger.info(f"✓ SOURCE 1 cached in {data.cache.directory}")
             self.data_sources_status["source_1_epidemiological"]["records"] = record_count
             
         except ImportError as e:
@@ -211,73 +315,53 @@ class KiroOrchestrator:
         """Step 3: Analyze SOURCE 1 data"""
         logger.info("Conducting epidemiological analysis of SOURCE 1 data...")
         
-        prompt = self.prompts.analysis_prompt("data_summary_placeholder")
-        response_text = ""
+        from data_cache import load_datasets
+        from data_summary import build_data_summary
+        data_summary = build_data_summary(self.data if self.data is not None else load_datasets())
         
-        for chunk in self.llm_router.generate(
-            prompt=prompt,
-            system=agent_config.DATA_ANALYST_SYSTEM_PROMPT,
-            temperature=agent_config.AGENT_TEMPERATURES["data_analyst"],
-            streaming=True
-        ):
-            response_text += chunk
-            print(chunk, end="", flush=True)
+        prompt = self.prompts.analysis_prompt(data_summary)
+        response_text = await self._generate(
+            "03_analysis", prompt, agent_config.DATA_ANALYST_SYSTEM_PROMPT,
+            agent_config.AGENT_TEMPERATURES["data_analyst"], echo=True
+        )
         
+        self.step_outputs["analysis"] = response_text
         output_file = self.output_dir / "03_analysis.md"
         output_file.write_text(response_text)
         logger.info(f"\n✓ Analysis saved to {output_file}")
     
-    async def parallel_insights_step(self):
-        """Steps 4-5: Parallel visualization design and health insights"""
-        tasks = [
-            self.visualization_design_task(),
-            self.health_insights_task()
-        ]
-        
-        logger.info("Executing parallel tasks (Visualization Expert + Health Researcher)...")
-        results = await asyncio.gather(*tasks)
-        logger.info("✓ Parallel tasks completed")
-    
     async def visualization_design_task(self):
         """Step 4: Design visualizations (PARALLEL)"""
-        logger.info("  └─ Designing visualizations (Visualization Expert Agent)...")
+        logger.info("Designing visualizations (Visualization Expert Agent)...")
         
-        prompt = self.prompts.visualization_prompt("analysis_placeholder")
-        response_text = ""
-        
-        for chunk in self.llm_router.generate(
-            prompt=prompt,
-            system=agent_config.VISUALIZATION_EXPERT_SYSTEM_PROMPT,
-            temperature=agent_config.AGENT_TEMPERATURES["visualization_expert"],
-            streaming=True
-        ):
-            response_text += chunk
+        prompt = self.prompts.visualization_prompt(self.step_outputs.get("analysis", ""))
+        response_text = await self._generate(
+            "04_visualization_design", prompt, agent_config.VISUALIZATION_EXPERT_SYSTEM_PROMPT,
+            agent_config.AGENT_TEMPERATURES["visualization_expert"]
+        )
         
         output_file = self.output_dir / "04_visualization_design.md"
         output_file.write_text(response_text)
-        logger.info(f"  ✓ Visualization design saved to {output_file}")
+        logger.info(f"✓ Visualization design saved to {output_file}")
     
     async def health_insights_task(self):
         """Step 5: Generate health insights (PARALLEL)"""
-        logger.info("  └─ Generating health insights (Health Researcher Agent)...")
-        
-        prompt = self.prompts.health_insights_prompt("analysis_placeholder")
-        response_text = ""
+        logger.info("Generating health insights (Health Researcher Agent)...")
         
-        for chunk in self.llm_router.generate(
-            prompt=prompt,
-            system=agent_config.HEALTH_RESEARCHER_SYSTEM_PROMPT,
-            temperature=agent_config.AGENT_TEMPERATURES["health_researcher"],
-            streaming=True
-        ):
-            response_text += chunk
+        prompt = self.prompts.health_insights_prompt(self.step_outputs.get("analysis", ""))
+        response_text = await self._generate(
+            "05_health_insights", prompt, agent_config.HEALTH_RESEARCHER_SYSTEM_PROMPT,
+            agent_config.AGENT_TEMPERATURES["health_researcher"]
+        )
         
+        self.step_outputs["health_findings"] = response_text
         output_file = self.output_dir / "05_health_insights.md"
         output_file.write_text(response_text)
-        logger.info(f"  ✓ Health insights saved to {output_file}")
+        logger.info(f"✓ Health insights saved to {output_file}")
     
     async def dashboard_code_step(self):
         """Step 6: Generate dashboard code using SOURCE 3"""
+        self.data_sources_status["source_3_project_code"]["status"] = "operational"
         logger.info("Integrating SOURCE 3 with SOURCE 1 data...")
         logger.info("✓ Dashboard framework integrated with generated data")
     
@@ -285,18 +369,13 @@ class KiroOrchestrator:
         """Step 7: Policy recommendations"""
         logger.info("Generating policy recommendations (Policy Advisor Agent)...")
         
-        prompt = self.prompts.policy_prompt("health_findings_placeholder")
-        response_text = ""
-        
-        for chunk in self.llm_router.generate(
-            prompt=prompt,
-            system=agent_config.POLICY_ADVISOR_SYSTEM_PROMPT,
-            temperature=agent_config.AGENT_TEMPERATURES["policy_advisor"],
-            streaming=True
-        ):
-            response_text += chunk
-            print(chunk, end="", flush=True)
+        prompt = self.prompts.policy_prompt(self.step_outputs.get("health_findings", ""))
+        response_text = await self._generate(
+            "07_policy_recommendations", prompt, agent_config.POLICY_ADVISOR_SYSTEM_PROMPT,
+            agent_config.AGENT_TEMPERATURES["policy_advisor"], echo=True
+        )
         
+        self.step_outputs["policy"] = response_text
         output_file = self.output_dir / "06_policy_recommendations.md"
         output_file.write_text(response_text)
         logger.info(f"\n✓ Policy recommendations saved to {output_file}")
@@ -306,20 +385,15 @@ class KiroOrchestrator:
         logger.info("Generating comprehensive final report...")
         
         prompt = self.prompts.report_prompt(
-            "analysis_summary",
-            "health_findings",
-            "policy_recommendations"
+            self.step_outputs.get("analysis", ""),
+            self.step_outputs.get("health_findings", ""),
+            self.step_outputs.get("policy", "")
         )
         
-        response_text = ""
-        for chunk in self.llm_router.generate(
-            prompt=prompt,
-            system=agent_config.HEALTH_RESEARCHER_SYSTEM_PROMPT,
-            temperature=agent_config.AGENT_TEMPERATURES["health_researcher"],
-            streaming=True
-        ):
-            response_text += chunk
-            print(chunk, end="", flush=True)
+        response_text = await self._generate(
+            "08_report", prompt, agent_config.HEALTH_RESEARCHER_SYSTEM_PROMPT,
+            agent_config.AGENT_TEMPERATURES["health_researcher"], echo=True
+        )
         
         output_file = self.output_dir / "FINAL_REPORT.md"
         output_file.write_text(response_text)
@@ -367,7 +441,7 @@ class KiroOrchestrator:
 - ✓ SOURCE 4: Orchestration active ✓
 """
         
-        lineage_file = Path(".kiro") / "data_lineage.md"
+        lineage_file = self.lineage_file
         lineage_file.parent.mkdir(parents=True, exist_ok=True)
         lineage_file.write_text(lineage_content)
         logger.info(f"✓ Data lineage saved to {lineage_file}")
@@ -380,6 +454,48 @@ class KiroOrchestrator:
         logger.info("✓ Dashboard accessible at: http://localhost:8501")
         logger.info("✓ All reports generated in: ./outputs/")
     
+    def _log_timing_report(self):
+        """Log per-step wall-clock times and the critical path; write them to .kiro/logs/timing_report.json"""
+        report = self.workflow_report
+        logger.info("\nTIMING REPORT:")
+        for step, (start, end) in report.timings.items():
+            marker = "*" if step in report.critical_path else " "
+            logger.info(f" {marker}{step:<28} {start:>7.1f}s -> {end:>7.1f}s  ({end - start:.1f}s)")
+        logger.info(f"  {'workflow wall-clock':<28} {report.wall_seconds:>8.1f}s")
+        logger.info(f"  {'steps run back-to-back':<28} {report.serial_seconds:>8.1f}s")
+        logger.info(f"  {'saved by concurrency':<28} {report.saved_seconds:>8.1f}s")
+        logger.info(f"  critical path (*): {' -> '.join(report.critical_path)} ({report.critical_path_seconds:.1f}s)")
+        
+        timing = {
+            "steps": {step: {"start": start, "end": end} for step, (start, end) in report.timings.items()},
+            "wall_seconds": report.wall_seconds,
+            "serial_seconds": report.serial_seconds,
+            "saved_seconds": report.saved_seconds,
+            "critical_path": report.critical_path,
+            "critical_path_seconds": report.critical_path_seconds,
+            "timestamp": datetime.now().isoformat()
+        }
+        (log_dir / "timing_report.json").write_text(json.dumps(timing, indent=2))
+    
+    def _log_token_report(self):
+        """Log estimated tokens in/out per agent step; write them to .kiro/logs/token_report.json"""
+        logger.info("\nTOKEN REPORT (estimated):")
+        totals = {"in": 0, "out": 0, "generated_in": 0, "generated_out": 0}
+        for step, usage in self.token_usage.items():
+            tokens_in = usage["prompt_tokens"] + usage["system_tokens"]
+            logger.info(f"  {step:<28} {tokens_in:>7} in {usage['response_tokens']:>7} out"
+                        f"{'  (cached)' if usage['cached'] else ''}")
+            totals["in"] += tokens_in
+            totals["out"] += usage["response_tokens"]
+            if not usage["cached"]:
+                totals["generated_in"] += tokens_in
+                totals["generated_out"] += usage["response_tokens"]
+        logger.info(f"  {'total':<28} {totals['in']:>7} in {totals['out']:>7} out "
+                    f"({totals['generated_in']} in / {totals['generated_out']} out sent to providers)")
+        
+        report = {"steps": self.token_usage, "totals": totals, "timestamp": datetime.now().isoformat()}
+        (log_dir / "token_report.json").write_text(json.dumps(report, indent=2))
+    
     def _log_completion_summary(self):
         """Log comprehensive completion summary"""
         logger.info("\n" + "═" * 70)
@@ -402,21 +518,59 @@ class KiroOrchestrator:
         logger.info("\nSOURCE 4 - Orchestration Framework:")
         logger.info("  ✓ Multi-LLM routing active (Claude, Gemini, AWS, OpenAI)")
         logger.info("  ✓ 4 agents initialized and specialized")
-        logger.info("  ✓ 10-step workflow executed")
+        logger.info("  ✓ 10-step workflow executed as a dependency graph")
         logger.info("─" * 70)
         logger.info("\nOUTPUT ARTIFACTS:")
         for output_file in self.output_dir.glob("*.md"):
             file_size = output_file.stat().st_size
             logger.info(f"  ✓ {output_file.name} ({file_size} bytes)")
         logger.info("─" * 70)
+        cache = self.step_cache
+        logger.info(f"STEP CACHE: {len(cache.hits)} reused, {len(cache.misses)} generated ({cache.directory})")
+        if cache.hits:
+            logger.info(f"  reused: {', '.join(cache.hits)}")
+        for provider, stats in self.llm_router.limiters.stats().items():
+            logger.info(f"LLM QUEUE ({provider}): {stats['admitted']} calls, max depth {stats['max_queue_depth']}, "
+                        f"wait p50 {stats['wait_p50']:.2f}s / p95 {stats['wait_p95']:.2f}s")
+        for provider, stats in self.llm_router.prompt_cache.stats().items():
+            logger.info(f"PROMPT CACHE ({provider}): {stats['prefix_reuses']}/{stats['requests']} requests reused a sent prefix, "
+                        f"{stats['cache_read_tokens']} tokens read from cache, {stats['cache_write_tokens']} written "
+                        f"({stats['cached_token_share']:.0%} of prompt tokens)")
+        self._log_timing_report()
+        self._log_token_report()
+        logger.info("─" * 70)
         logger.info("\nREADY FOR:")
         logger.info("  ✓ Streamlit dashboard: streamlit run app.py")
         logger.info("  ✓ Kiro Challenge submission with comprehensive documentation")
         logger.info("═" * 70 + "\n")
 
-async def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Command-line options for cache control"""
+    parser = argparse.ArgumentParser(description="Run the Digital Detox Weaver workflow")
+    parser.add_argument("--force", action="append", default=[], metavar="STEP",
+                        help="Regenerate STEP even if its inputs are unchanged (e.g. 08_report or 8); repeatable, or 'all'")
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor write the step cache")
+    return parser.parse_args(argv)
+
+def resolve_steps(requested: List[str], names: List[str]) -> List[str]:
+    """Map --force values (full name, number or 'all') to step names"""
+    resolved = []
+    for value in requested:
+        if value == "all":
+            return list(names)
+        matches = [name for name in names if name == value or (value.isdigit() and int(name.split("_")[0]) == int(value))]
+        if not matches:
+            raise ValueError(f"Unknown step {value!r}; expected one of: {', '.join(names)}")
+        resolved.extend(matches)
+    return resolved
+
+async def main(argv: Optional[List[str]] = None):
     """Main entry point"""
+    args = parse_args(argv)
     orchestrator = KiroOrchestrator()
+    names = [step.name for step in orchestrator.workflow_steps()]
+    orchestrator.step_cache.force = set(resolve_steps(args.force, names))
+    orchestrator.step_cache.enabled = not args.no_cache
     await orchestrator.run_dashboard_workflow()
 
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+"""
+Digital Detox Weaver: Live Metrics Service
+Process-wide, background-refreshed values for the dashboard's live RAG data
+
+A ``LiveValue`` wraps a slow fetch (a Gemini round trip) so that readers never
+wait for it:
+
+- a fresh value (younger than ``ttl_seconds``) is returned as is
+- a stale value is returned immediately while a refresh runs in the
+  background (stale-while-revalidate)
+- before the first fetch completes, readers get ``default`` (or wait up to
+  ``wait`` seconds for the first value)
+
+One daemon worker per value does all fetching, so concurrent readers share a
+single in-flight fetch. It refreshes ahead of expiry while the value is being
+read and stops after ``idle_seconds`` without readers; the next read restarts
+it. A fetch that raises keeps the last good value and is retried after a
+backoff, so ``fetch`` must raise on failure rather than return fallback data.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Generic, Optional, TypeVar, Union
+
+from config import LIVE_METRICS_IDLE_SECONDS, LIVE_METRICS_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Refresh once a value has used up this share of its TTL, so readers rarely see it stale
+REFRESH_AHEAD = 0.8
+# After a failed fetch, wait this long (at most one TTL) before the next attempt
+ERROR_RETRY_SECONDS = 30.0
+
+
+class LiveValue(Generic[T]):
+    """A value kept warm by a background worker, read without blocking"""
+
+    def __init__(self, name: str, fetch: Callable[[], T], ttl_seconds: float = LIVE_METRICS_TTL_SECONDS,
+                 default: Union[T, Callable[[], T], None] = None, idle_seconds: float = LIVE_METRICS_IDLE_SECONDS):
+        self.name = name
+        self.fetch = fetch
+        self.ttl_seconds = ttl_seconds
+        self.default = default
+        self.idle_seconds = idle_seconds
+        self._value: Optional[T] = None
+        self._fetched_at: Optional[float] = None
+        self._requested = False
+        self._fetching = False
+        self._retry_at = 0.0
+        self._last_read = 0.0
+        self._worker: Optional[threading.Thread] = None
+        self._stopped = False
+        self._cond = threading.Condition()
+        self.fetches = 0
+        self.errors = 0
+        self.fresh_reads = 0
+        self.stale_reads = 0
+        self.empty_reads = 0
+        self.last_error: Optional[str] = None
+        self.last_fetch_seconds: Optional[float] = None
+
+    def age(self) -> Optional[float]:
+        """Seconds since the current value was fetched, or None before the first fetch"""
+        with self._cond:
+            return None if self._fetched_at is None else time.monotonic() - self._fetched_at
+
+    def get(self, wait: float = 0.0) -> T:
+        """
+        The current value without waiting for a fetch
+
+        Stale values trigger a background refresh. Before the first value
+        exists, waits up to ``wait`` seconds for it, then returns ``default``.
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._last_read = now
+            self._ensure_worker()
+            if self._fetched_at is not None and now - self._fetched_at < self.ttl_seconds:
+                self.fresh_reads += 1
+                return self._value
+            if not self._fetching:
+                self._requested = True
+                self._cond.notify_all()
+            if self._fetched_at is None and wait > 0:
+                self._cond.wait_for(lambda: self._fetched_at is not None, wait)
+            if self._fetched_at is not None:
+                self.stale_reads += 1
+                return self._value
+            self.empty_reads += 1
+        return self.default() if callable(self.default) else self.default
+
+    def refresh(self, timeout: Optional[float] = None) -> Optional[T]:
+        """Ask the worker for a new value and wait for it (or for ``timeout``)"""
+        with self._cond:
+            fetches = self.fetches + self.errors
+            self._last_read = time.monotonic()
+            self._ensure_worker()
+            self._requested = True
+            self._retry_at = 0.0
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self.fetches + self.errors > fetches, timeout)
+            return self._value
+
+    def stop(self):
+        """Stop the background worker (it restarts on the next read)"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+            worker = self._worker
+        if worker is not None:
+            worker.join()
+        with self._cond:
+            self._stopped = False
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, daemon=True, name=f"live-{self.name}")
+            self._worker.start()
+
+    def _seconds_until_due(self, now: float) -> float:
+        if self._requested or self._fetched_at is None:
+            due = 0.0
+        else:
+            due = self._fetched_at + self.ttl_seconds * REFRESH_AHEAD - now
+        return max(due, self._retry_at - now)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    if self._stopped or now - self._last_read > self.idle_seconds:
+                        self._worker = None
+                        return
+                    due = self._seconds_until_due(now)
+                    if due <= 0:
+                        break
+                    self._cond.wait(min(due, self._last_read + self.idle_seconds - now + 0.01))
+                self._requested = False
+                self._fetching = True
+            self._fetch_once()
+
+    def _fetch_once(self):
+        start = time.monotonic()
+        try:
+            value = self.fetch()
+        except Exception as e:
+            logger.warning(f"Live metric {self.name}: fetch failed ({e}); keeping the previous value")
+            with self._cond:
+                self.errors += 1
+                self.last_error = str(e)
+                self._fetching = False
+                self._requested = False
+                self._retry_at = time.monotonic() + min(self.ttl_seconds, ERROR_RETRY_SECONDS)
+                self._cond.notify_all()
+            return
+        with self._cond:
+            self._value = value
+            self._fetched_at = time.monotonic()
+            self.fetches += 1
+            self.last_fetch_seconds = self._fetched_at - start
+            self._fetching = False
+            self._cond.notify_all()
+        logger.info(f"✓ Live metric {self.name} refreshed in {self.last_fetch_seconds:.2f}s")
+
+    def stats(self) -> Dict[str, object]:
+        with self._cond:
+            return {
+                "fetches": self.fetches,
+                "errors": self.errors,
+                "fresh_reads": self.fresh_reads,
+                "stale_reads": self.stale_reads,
+                "empty_reads": self.empty_reads,
+                "age_seconds": None if self._fetched_at is None else time.monotonic() - self._fetched_at,
+                "last_fetch_seconds": self.last_fetch_seconds,
+                "last_error": self.last_error,
+            }
@@ -0,0 +1,215 @@
+"""
+Digital Detox Weaver: Person-Level Microsimulation (SOURCE 1)
+Simulates individual people and aggregates them into the epidemiology tables
+
+Each synthetic person gets a country, survey year, age group, income level and
+primary platform. Their daily screen time follows the global screen-time trend
+(with the COVID step) scaled by the SES screen-time multiplier. Health impact
+applies the same model as ``generate_age_stratification``: the age
+vulnerability multiplier (5.5x for 13-17) times the dose-response curve
+(hours ** 1.3) / 100. It is further multiplied by the SES health-impact
+multiplier (2.2x for low income) and the platform's relative harm score.
+Outcomes are Bernoulli draws on the resulting risks.
+
+People are simulated in fixed-size chunks, each from its own Generator, and
+every chunk reduces to per-group sums, so memory stays bounded and chunks run
+concurrently in a process (or thread) pool. The result is identical for any
+worker count.
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from data_generators import (
+    AGE_GROUPS, AGE_VULNERABILITY, COUNTRIES, COVID_YEAR, DOSE_RESPONSE_EXPONENT, INCOME_LEVELS,
+    N_YEARS, PLATFORM_TRAITS, SCREEN_TIME_HOURS, SES_COUNTRIES, SES_PROFILES, START_YEAR,
+    _apply_schema, _categorical,
+)
+
+logger = logging.getLogger(__name__)
+
+# Population mix (shares sum to 1); countries and years are uniform
+AGE_SHARES = np.array([0.10, 0.14, 0.20, 0.24, 0.32])
+INCOME_SHARES = np.array([0.30, 0.45, 0.25])
+PLATFORM_SHARES = np.array([0.18, 0.22, 0.20, 0.16, 0.07, 0.08, 0.09])
+
+# Platform harm relative to the population-weighted average, so the mix is risk-neutral overall
+PLATFORM_RELATIVE_HARM = PLATFORM_TRAITS[:, 1] / (PLATFORM_SHARES @ PLATFORM_TRAITS[:, 1])
+# Anxiety and sleep-disorder risk relative to depression risk (global table slopes 0.022 and 0.018 vs 0.025)
+ANXIETY_RATIO = 0.88
+SLEEP_DISORDER_RATIO = 0.72
+SCREEN_TIME_SIGMA = 0.35  # log-normal spread of individual screen time around the yearly mean
+MAX_SCREEN_TIME = 24.0
+
+
+@dataclass
+class MicrosimulationResult:
+    """Aggregated tables plus throughput of one microsimulation run"""
+    tables: Dict[str, pd.DataFrame]
+    n_people: int
+    seconds: float
+    workers: int = 1
+    chunks: int = 1
+
+    @property
+    def people_per_second(self) -> float:
+        return self.n_people / self.seconds if self.seconds else float('inf')
+
+
+def _draw_codes(raw, shares):
+    """Map uniforms onto category codes with the given shares"""
+    return np.cumsum(shares)[:-1].searchsorted(raw, side='right')
+
+
+def _group_sums(key, n_groups, columns):
+    """Per-group sums of each column, stacked as an (n_groups, len(columns)) array"""
+    return np.column_stack([np.bincount(key, weights=column, minlength=n_groups) for column in columns])
+
+
+def simulate_chunk(n_people, seed_sequence):
+    """
+    Simulate ``n_people`` and reduce them to per-group sums for the three tables.
+
+    Module-level so process pools can pickle it.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    raw = rng.random((7, n_people), dtype=np.float32)
+
+    country = (raw[0] * len(SES_COUNTRIES)).astype(np.int32)
+    year_idx = rng.integers(0, N_YEARS, n_people, dtype=np.int32)
+    age = _draw_codes(raw[1], AGE_SHARES)
+    income = _draw_codes(raw[2], INCOME_SHARES)
+    platform = _draw_codes(raw[3], PLATFORM_SHARES)
+
+    # Yearly mean screen time (global table trend with COVID acceleration), shifted by SES
+    year = START_YEAR + year_idx
+    mean_hours = (2.5 + year_idx * 0.8) * np.where(year >= COVID_YEAR, 1.4, 1.0) * SES_PROFILES[income, 0]
+    spread = rng.standard_normal(n_people, dtype=np.float32) * SCREEN_TIME_SIGMA - SCREEN_TIME_SIGMA ** 2 / 2
+    hours = np.clip(mean_hours * np.exp(spread), 1.0, MAX_SCREEN_TIME)
+
+    # Age-table dose-response, scaled by SES and platform harm
+    relative_risk = AGE_VULNERABILITY[age] * SES_PROFILES[income, 1] * PLATFORM_RELATIVE_HARM[platform]
+    health_impact = np.minimum(1.0, relative_risk * hours ** DOSE_RESPONSE_EXPONENT / 100)
+    depression_risk = np.minimum(0.6, health_impact * 0.8)
+    sleep_quality_loss = np.minimum(0.7, health_impact * 0.9)
+
+    depressed = raw[4] < depression_risk
+    anxious = raw[5] < depression_risk * ANXIETY_RATIO
+    sleep_disorder = raw[6] < depression_risk * SLEEP_DISORDER_RATIO
+    access = rng.random(n_people, dtype=np.float32) < SES_PROFILES[income, 2]
+    ones = np.ones(n_people)
+
+    # Global table covers the first len(COUNTRIES) countries only
+    in_global = country < len(COUNTRIES)
+    global_key = country[in_global] * N_YEARS + year_idx[in_global]
+    hour_bin = np.clip(np.rint(hours), SCREEN_TIME_HOURS[0], SCREEN_TIME_HOURS[-1]).astype(np.int32) - SCREEN_TIME_HOURS[0]
+
+    return {
+        'global_epidemiology': _group_sums(
+            global_key, len(COUNTRIES) * N_YEARS,
+            [column[in_global] for column in [ones, hours, depressed, anxious, sleep_disorder]]
+        ),
+        'age_stratification': _group_sums(
+            age * len(SCREEN_TIME_HOURS) + hour_bin, len(AGE_GROUPS) * len(SCREEN_TIME_HOURS),
+            [ones, health_impact, depression_risk, sleep_quality_loss]
+        ),
+        'ses_inequality': _group_sums(
+            country * len(INCOME_LEVELS) + income, len(SES_COUNTRIES) * len(INCOME_LEVELS),
+            [ones, hours, health_impact, access]
+        ),
+    }
+
+
+def _mean(sums, people):
+    """Group means, NaN for groups nobody fell into"""
+    return np.divide(sums, people, out=np.full_like(sums, np.nan), where=people > 0)
+
+
+def aggregate_tables(sums):
+    """Turn accumulated per-group sums into DataFrames with the SOURCE 1 table shapes"""
+    epi = sums['global_epidemiology']
+    age = sums['age_stratification']
+    ses = sums['ses_inequality']
+    n_hours = len(SCREEN_TIME_HOURS)
+    n_levels = len(INCOME_LEVELS)
+
+    # SES multipliers are relative to the same country's high-income group
+    ses_screen_time = _mean(ses[:, 1], ses[:, 0]).reshape(-1, n_levels)
+    ses_impact = _mean(ses[:, 2], ses[:, 0]).reshape(-1, n_levels)
+
+    return {
+        'global_epidemiology': _apply_schema('global_epidemiology', {
+            'country': _categorical(COUNTRIES, np.repeat(np.arange(len(COUNTRIES)), N_YEARS)),
+            'year': np.tile(np.arange(START_YEAR, START_YEAR + N_YEARS), len(COUNTRIES)),
+            'avg_screen_time_hours': _mean(epi[:, 1], epi[:, 0]),
+            'depression_rate': _mean(epi[:, 2], epi[:, 0]),
+            'anxiety_rate': _mean(epi[:, 3], epi[:, 0]),
+            'sleep_disorders': _mean(epi[:, 4], epi[:, 0])
+        }),
+        'age_stratification': _apply_schema('age_stratification', {
+            'age_group': _categorical(AGE_GROUPS, np.repeat(np.arange(len(AGE_GROUPS)), n_hours)),
+            'screen_time_hours': np.tile(SCREEN_TIME_HOURS, len(AGE_GROUPS)),
+            'vulnerability_multiplier': np.repeat(AGE_VULNERABILITY, n_hours),
+            'health_impact_score': _mean(age[:, 1], age[:, 0]),
+            'depression_risk': _mean(age[:, 2], age[:, 0]),
+            'sleep_quality_loss': _mean(age[:, 3], age[:, 0])
+        }),
+        'ses_inequality': _apply_schema('ses_inequality', {
+            'country': _categorical(SES_COUNTRIES, np.repeat(np.arange(len(SES_COUNTRIES)), n_levels)),
+            'income_level': _categorical(INCOME_LEVELS, np.tile(np.arange(n_levels), len(SES_COUNTRIES))),
+            'screen_time_multiplier': (ses_screen_time / ses_screen_time[:, -1:]).ravel(),
+            'health_impact_multiplier': (ses_impact / ses_impact[:, -1:]).ravel(),
+            'access_to_interventions': _mean(ses[:, 3], ses[:, 0])
+        }),
+    }
+
+
+def run_microsimulation(n_people=1_000_000, seed=42, chunk_size=250_000, workers=None, processes=True):
+    """
+    Simulate ``n_people`` individuals and aggregate them into the global
+    epidemiology, age stratification and SES inequality tables.
+
+    Chunks are spawned from ``seed`` in order and their sums are added in
+    chunk order, so the tables depend only on ``seed`` and ``chunk_size``.
+    ``workers=1`` runs in-process; otherwise chunks go to a process pool
+    (or a thread pool with ``processes=False``).
+    """
+    if n_people < 1:
+        raise ValueError(f"n_people must be at least 1, got {n_people}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    sizes = [min(chunk_size, n_people - start) for start in range(0, n_people, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = workers or min(len(sizes), os.cpu_count() or 1)
+
+    start = time.perf_counter()
+    if workers == 1:
+        partials = [simulate_chunk(size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+    else:
+        executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        with executor_class(max_workers=workers) as executor:
+            partials = list(executor.map(simulate_chunk, sizes, seeds))
+
+    sums = {name: sum(partial[name] for partial in partials) for name in partials[0]}
+    tables = aggregate_tables(sums)
+    seconds = time.perf_counter() - start
+
+    result = MicrosimulationResult(tables, n_people, seconds, workers, len(sizes))
+    logger.info(f"✓ Simulated {n_people:,} people in {seconds:.2f}s ({result.people_per_second:,.0f} people/s, {workers} workers)")
+    return result
+
+
+if __name__ == "__main__":
+    result = run_microsimulation()
+    print(f"Simulated {result.n_people:,} people in {result.seconds:.2f}s "
+          f"({result.people_per_second:,.0f} people/s, {result.workers} workers, {result.chunks} chunks)")
+    for name, df in result.tables.items():
+        print(f"\n{name}: {len(df)} records")
+        print(df.head())
@@ -1,14 +1,112 @@
 """
 Digital Detox Weaver: RAG Integration Module
 Real-time data fetching using Gemini LLM for live health insights
+
+The module-level getters read one process-wide ``LiveValue`` (live_metrics.py)
+refreshed in the background, never in a dashboard rerun. A refresh is a single
+JSON-mode Gemini call for all three feeds, validated before it is cached. A
+refresh that only produced fallback data raises (``fetch_live``), so the cache
+keeps the last live bundle and retries with backoff.
+JSON answers are streamed through an incremental extractor (json_stream.py)
+that stops reading at the end of the first object and checks it against a
+typed schema.
+Prompts are grounded in passages retrieved from the generated reports and the
+SOURCE 1 tables by the local BM25 index (retrieval.py).
 """
 
 import os
-import json
-import requests
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import google.generativeai as genai
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent / ".kiro"))
+from agents.circuit_breaker import REQUEST_TIMEOUT, call_with_retry, circuit_breakers
+from agents.client_pool import client_pool
+from agents.rate_limiter import INTERACTIVE, rate_limiters
+from agents.tokens import estimate_tokens
+from json_stream import JSONObjectExtractor, validate
+from live_metrics import LiveValue
+from data_cache import load_datasets
+from retrieval import RetrievalIndex
+
+# Expected response size reserved against the tokens-per-minute limit
+RESPONSE_TOKENS = 1024
+
+# One structured call for all three dashboard feeds (RAG_COMBINED_FETCH=0: three concurrent calls)
+COMBINED_FETCH = os.getenv("RAG_COMBINED_FETCH", "1").lower() in ("1", "true", "yes")
+HEALTH_FIELDS = ["screen_time_hours", "depression_rate", "anxiety_rate", "sleep_disorders"]
+POLICY_FIELDS = ["policy", "country", "description"]
+DEFAULT_TOPICS = ["Digital Detox", "Screen Time Limits", "Blue Light Impact"]
+HEALTH_SCHEMA = {**{field: float for field in HEALTH_FIELDS}, "detox_findings": Optional[str]}
+COMBINED_SCHEMA = {
+    "health_metrics": HEALTH_SCHEMA,
+    "trending_topics": List[str],
+    "policy_updates": [{field: str for field in POLICY_FIELDS}],
+}
+
+# Prompts are grounded in passages retrieved from our own reports and tables (RAG_GROUNDING=0 to disable)
+GROUNDING = os.getenv("RAG_GROUNDING", "1").lower() in ("1", "true", "yes")
+GROUNDING_PASSAGES = 6
+GROUNDING_TOKENS = 600
+HEALTH_QUERY = "global average screen time hours depression anxiety sleep disorders rates detox effectiveness"
+TOPICS_QUERY = "trending digital health topics adolescents social media platforms mental health"
+POLICY_QUERY = "policy interventions age restrictions schools screen time regulation effectiveness"
+
+COMBINED_PROMPT = """
+Provide current 2025 digital wellness data as one JSON object with exactly these keys:
+
+"health_metrics": global statistics from credible health organizations (WHO, CDC, etc.):
+    {"screen_time_hours": average daily screen time in hours,
+     "depression_rate": share (0-1) of depression linked to excessive screen time,
+     "anxiety_rate": share (0-1) of anxiety in digital natives (Gen Z),
+     "sleep_disorders": share (0-1) of sleep disorders from blue light exposure,
+     "detox_findings": one sentence on the latest digital detox research}
+"trending_topics": the top 5 trending digital health topics in 2025 (screen time,
+    mental health, digital wellness), as a list of short strings
+"policy_updates": the latest 2025 policy updates on social media age restrictions,
+    screen time rules for children, digital wellness in schools and tech company
+    accountability, as a list of {"policy": ..., "country": ..., "description": ...}
+"""
+
+
+def validate_combined(data: object) -> Dict:
+    """
+    The combined response checked against ``COMBINED_SCHEMA``
+
+    Raises ValueError naming the first field that is missing or mistyped.
+    """
+    validate(data, COMBINED_SCHEMA)
+    if not data["trending_topics"]:
+        raise ValueError("trending_topics: expected a non-empty list of strings")
+    return data
+
+
+def read_json_stream(response) -> Tuple[Optional[object], str]:
+    """
+    (first JSON object or None, text read) from a streamed Gemini response
+
+    Stops pulling chunks once the object is complete, so the caller does not
+    wait for closing fences or trailing prose.
+    """
+    extractor = JSONObjectExtractor()
+    read = []
+    for chunk in response:
+        read.append(chunk.text)
+        if extractor.feed(chunk.text):
+            break
+    return extractor.value if extractor.done else None, "".join(read)
+
+
+class RAGFetchError(RuntimeError):
+    """A refresh that fell back to simulated or empty data instead of live data"""
+
+
+# Feed statuses the fetchers return in place of live data after an error
+FALLBACK_STATUSES = ("fallback_active", "error")
+
 
 class RAGDataFetcher:
     """RAG-powered real-time data fetcher using Gemini"""
@@ -16,10 +114,151 @@ class RAGDataFetcher:
     def __init__(self):
         self.api_key = os.getenv('GEMINI_API_KEY')
         if self.api_key:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+            # Shared with LLMRouter: same model object, same transport
+            self.model = client_pool.gemini_model('gemini-2.0-flash-exp', api_key=self.api_key)
         else:
             self.model = None
+        self.combined = COMBINED_FETCH
+        self.retriever = RetrievalIndex(data=load_datasets) if GROUNDING else None
+        # Gemini requests made, for comparing the fetch modes
+        self.calls = 0
+        self._calls_lock = threading.Lock()
+    
+    def _ground(self, prompt: str, query: str) -> str:
+        """``prompt`` preceded by the passages of our own corpus most relevant to ``query``"""
+        if self.retriever is None:
+            return prompt
+        try:
+            context = self.retriever.context(query, k=GROUNDING_PASSAGES, max_tokens=GROUNDING_TOKENS)
+        except Exception as e:
+            print(f"RAG retrieval error: {e}")
+            return prompt
+        if not context:
+            return prompt
+        return (
+            "Context from the Digital Detox Weaver reports and datasets "
+            "(prefer it where relevant; each passage starts with its [source]):\n"
+            f"{context}\n\n{prompt}"
+        )
+    
+    def _generate(self, prompt: str, query: Optional[str] = None, **kwargs) -> str:
+        """Response text of a Gemini call (see ``_request``)"""
+        return self._request(prompt, query, lambda response: (response.text, response.text), **kwargs)
+    
+    def _generate_json(self, prompt: str, query: Optional[str] = None, **kwargs) -> Optional[object]:
+        """First JSON object of a streamed Gemini call, or None if the answer has none"""
+        return self._request(prompt, query, read_json_stream, stream=True, **kwargs)
+    
+    def _request(self, prompt: str, query: Optional[str], read, **kwargs):
+        """
+        Gemini call through the shared breaker and rate limiter: retried with
+        backoff, instant failure while open, admitted ahead of batch workflow calls
+        
+        With a ``query``, the prompt is grounded in retrieved passages first
+        (only once the breaker lets the call through). ``read(response)``
+        returns (result, response text read).
+        """
+        grounded = []
+        
+        def call():
+            if not grounded:
+                grounded.append(self._ground(prompt, query) if query else prompt)
+            prompt_text = grounded[0]
+            with rate_limiters.get("gemini").acquire(estimate_tokens(prompt_text) + RESPONSE_TOKENS, INTERACTIVE,
+                                                     timeout=REQUEST_TIMEOUT) as permit:
+                with self._calls_lock:
+                    self.calls += 1
+                response = self.model.generate_content(prompt_text, request_options={"timeout": REQUEST_TIMEOUT}, **kwargs)
+                result, response_text = read(response)
+                permit.actual_tokens = estimate_tokens(prompt_text) + estimate_tokens(response_text)
+                return result
+
+        return call_with_retry(circuit_breakers.get("gemini"), call)
+    
+    def fetch_all(self) -> Dict:
+        """
+        Health metrics, trending topics and policy updates in one refresh
+
+        In combined mode this is a single streamed JSON-mode Gemini call
+        validated by ``validate_combined``. If the response does not validate
+        (or combined mode is off) the three separate fetches run concurrently
+        instead.
+        A failed combined call degrades to the fallbacks without further calls.
+        """
+        if not self.model:
+            return self._fetch_separately()
+        if self.combined:
+            try:
+                data = validate_combined(self._generate_json(
+                    COMBINED_PROMPT, " ".join([HEALTH_QUERY, TOPICS_QUERY, POLICY_QUERY]),
+                    generation_config={"response_mime_type": "application/json"}))
+            except ValueError as e:
+                print(f"RAG combined response rejected ({e}); fetching separately")
+            except Exception as e:
+                print(f"RAG fetch error: {e}")
+                return self._fallback_bundle(e)
+            else:
+                return self._bundle_from_combined(data)
+        return self._fetch_separately()
+    
+    def fetch_live(self) -> Dict:
+        """
+        ``fetch_all`` for the live cache: raises RAGFetchError instead of
+        returning a bundle in which a feed fell back after an error
+
+        Simulated data without an API key is not an error and is returned.
+        """
+        bundle = self.fetch_all()
+        failed = [feed for feed in ("health_metrics", "policy_updates")
+                  if bundle[feed].get("status") in FALLBACK_STATUSES]
+        if failed:
+            reason = bundle["health_metrics"].get("error_reason", "no live data")
+            raise RAGFetchError(f"{', '.join(failed)} fell back ({reason})")
+        return bundle
+    
+    def _fetch_separately(self) -> Dict:
+        """The three fetches, issued concurrently"""
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="rag-fetch") as pool:
+            metrics = pool.submit(self.fetch_real_time_health_data)
+            topics = pool.submit(self.fetch_trending_health_topics)
+            policy = pool.submit(self.get_live_policy_updates)
+            return {
+                "health_metrics": metrics.result(),
+                "trending_topics": topics.result(),
+                "policy_updates": policy.result()
+            }
+    
+    def _bundle_from_combined(self, data: Dict) -> Dict:
+        """Validated combined response in the shapes the separate fetches return"""
+        now = datetime.now()
+        metrics = dict(data["health_metrics"])
+        metrics.update({
+            "last_updated": now.strftime("%Y-%m-%d %H:%M:%S"),
+            "source": "Gemini RAG",
+            "status": "live"
+        })
+        return {
+            "health_metrics": metrics,
+            "trending_topics": data["trending_topics"][:5],
+            "policy_updates": {
+                "status": "live",
+                "last_updated": now.isoformat(),
+                "source": "Gemini RAG",
+                "updates": [f"{update['policy']} ({update['country']}): {update['description']}"
+                            for update in data["policy_updates"][:5]]
+            }
+        }
+    
+    def _fallback_bundle(self, error: Exception) -> Dict:
+        """What the separate fetches return when Gemini is unavailable"""
+        metrics = self._get_simulated_data()
+        metrics["status"] = "fallback_active"
+        metrics["error_reason"] = str(error)[:100]
+        return {
+            "health_metrics": metrics,
+            "trending_topics": list(DEFAULT_TOPICS),
+            "policy_updates": {"status": "error", "updates": []}
+        }
     
     def fetch_real_time_health_data(self) -> Dict:
         """Fetch real-time health statistics using Gemini"""
@@ -28,22 +267,20 @@ class RAGDataFetcher:
         
         try:
             prompt = """
-            Provide current 2025 global health statistics related to digital wellness and screen time:
+            Provide current 2025 global health statistics related to digital wellness and screen time
+            as one JSON object with these keys:
             
-            1. Average daily screen time (hours) globally
-            2. Depression rates linked to excessive screen time
-            3. Anxiety rates in digital natives (Gen Z)
-            4. Sleep disorder prevalence from blue light exposure
-            5. Latest research findings on digital detox effectiveness
+            1. "screen_time_hours": average daily screen time (hours) globally
+            2. "depression_rate": share (0-1) of depression linked to excessive screen time
+            3. "anxiety_rate": share (0-1) of anxiety in digital natives (Gen Z)
+            4. "sleep_disorders": share (0-1) of sleep disorders from blue light exposure
+            5. "detox_findings": one sentence on the latest research on digital detox effectiveness
             
-            Format as JSON with numerical values and brief explanations.
             Focus on credible health organizations data (WHO, CDC, etc.).
             """
             
-            response = self.model.generate_content(prompt)
-            
             # Parse and structure the response
-            return self._parse_gemini_response(response.text)
+            return self._parse_gemini_response(self._generate_json(prompt, HEALTH_QUERY))
             
         except Exception as e:
             print(f"RAG fetch error: {e}")
@@ -55,7 +292,7 @@ class RAGDataFetcher:
     def fetch_trending_health_topics(self) -> List[str]:
         """Fetch trending digital health topics using Gemini"""
         if not self.model:
-            return ["Digital Detox", "Screen Time Limits", "Blue Light Impact"]
+            return list(DEFAULT_TOPICS)
         
         try:
             prompt = """
@@ -64,11 +301,10 @@ class RAGDataFetcher:
             Return as a simple list.
             """
             
-            response = self.model.generate_content(prompt)
-            return response.text.strip().split('\n')[:5]
+            return self._generate(prompt, TOPICS_QUERY).strip().split('\n')[:5]
             
         except Exception as e:
-            return ["Digital Detox", "Screen Time Limits", "Blue Light Impact"]
+            return list(DEFAULT_TOPICS)
     
     def get_live_policy_updates(self) -> Dict:
         """Fetch latest policy updates on digital wellness"""
@@ -86,25 +322,22 @@ class RAGDataFetcher:
             Format as JSON with policy name, country, and brief description.
             """
             
-            response = self.model.generate_content(prompt)
-            return self._parse_policy_response(response.text)
+            return self._parse_policy_response(self._generate(prompt, POLICY_QUERY))
             
         except Exception as e:
             return {"status": "error", "updates": []}
     
-    def _parse_gemini_response(self, response_text: str) -> Dict:
-        """Parse Gemini response into structured data"""
+    def _parse_gemini_response(self, data: Optional[object]) -> Dict:
+        """Health metrics extracted from the response, checked against ``HEALTH_SCHEMA``"""
         try:
-            # Try to extract JSON from response
-            import re
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-        except:
-            pass
-        
-        # Fallback to simulated data with live indicators
-        return self._get_simulated_data()
+            return validate(data, HEALTH_SCHEMA)
+        except ValueError as e:
+            print(f"RAG health response rejected ({e})")
+            # Marked as a fallback so fetch_live does not publish it as live data
+            fallback_data = self._get_simulated_data()
+            fallback_data["status"] = "fallback_active"
+            fallback_data["error_reason"] = f"rejected response: {e}"[:100]
+            return fallback_data
     
     def _parse_policy_response(self, response_text: str) -> Dict:
         """Parse policy response"""
@@ -131,14 +364,23 @@ class RAGDataFetcher:
 # Global RAG instance
 rag_fetcher = RAGDataFetcher()
 
+# Process-wide live data shared by every dashboard session; reads never wait on Gemini.
+# One refresh fetches all three feeds (see RAGDataFetcher.fetch_all); failed refreshes raise,
+# so the last live bundle is kept and the fallback below is only served before the first one.
+live_rag_data = LiveValue("rag_data", rag_fetcher.fetch_live, default=lambda: {
+    "health_metrics": dict(rag_fetcher._get_simulated_data(), status="refreshing"),
+    "trending_topics": list(DEFAULT_TOPICS),
+    "policy_updates": {"status": "refreshing", "updates": []}
+})
+
 def get_live_health_metrics() -> Dict:
-    """Get live health metrics with RAG enhancement"""
-    return rag_fetcher.fetch_real_time_health_data()
+    """Get live health metrics with RAG enhancement (cached; refreshed in the background)"""
+    return live_rag_data.get()["health_metrics"]
 
 def get_trending_topics() -> List[str]:
-    """Get trending digital health topics"""
-    return rag_fetcher.fetch_trending_health_topics()
+    """Get trending digital health topics (cached; refreshed in the background)"""
+    return live_rag_data.get()["trending_topics"]
 
 def get_policy_updates() -> Dict:
-    """Get latest policy updates"""
-    return rag_fetcher.get_live_policy_updates()
\ No newline at end of file
+    """Get latest policy updates (cached; refreshed in the background)"""
+    return live_rag_data.get()["policy_updates"]
\ No newline at end of file
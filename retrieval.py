@@ -0,0 +1,319 @@
+"""
+Digital Detox Weaver: Local Retrieval Index
+BM25 search over the generated reports and the SOURCE 1 tables, for grounding the RAG prompts
+
+Sources are the markdown reports in config.OUTPUTS_DIR (split into ~120-word
+passages under their nearest heading) and the SOURCE 1 datasets (a few rows
+per passage, rendered as ``column=value`` text). Term counts are kept as a
+NumPy CSR matrix (passages x terms) and searched through an inverted index of
+precomputed BM25 weights, so a query is a handful of array slices and one
+``bincount``.
+
+The index lives under CACHE_DIR/retrieval. ``update`` compares each source's
+version (file mtime and size; data fingerprint for the tables) with the
+stored one and re-chunks only the sources that changed; the rows of every
+other source are reused as they are. One index may be shared by threads:
+``update`` and ``search`` hold an instance lock, and saves write to unique
+temp files before renaming them into place.
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import CACHE_DIR, OUTPUTS_DIR
+from data_summary import data_fingerprint, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever chunking or tokenization changes; an index of another version is rebuilt
+INDEX_VERSION = 1
+CHUNK_WORDS = 120
+CHUNK_OVERLAP = 30
+ROWS_PER_PASSAGE = 8
+# BM25 parameters (the usual defaults)
+K1 = 1.5
+B = 0.75
+
+TOKEN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+HEADING = re.compile(r"^\s*#{1,6}\s+(.*)$|^\s*\*\*([^*]+)\*\*:?\s*$")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or that the their this to was were which with"
+    .split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word and number tokens, stopwords removed"""
+    return [token for token in TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+@dataclass
+class Passage:
+    """One retrievable piece of a source"""
+    source: str
+    heading: str
+    text: str
+
+
+def chunk_markdown(text: str, words: int = CHUNK_WORDS, overlap: int = CHUNK_OVERLAP) -> List[Tuple[str, str]]:
+    """(heading, passage) pairs: each section split into overlapping windows of ``words`` words"""
+    sections: List[Tuple[str, List[str]]] = [("", [])]
+    for line in text.splitlines():
+        match = HEADING.match(line)
+        if match:
+            sections.append(((match.group(1) or match.group(2)).strip(), []))
+        else:
+            sections[-1][1].extend(line.split())
+
+    chunks = []
+    step = max(1, words - overlap)
+    for heading, section_words in sections:
+        for start in range(0, max(1, len(section_words) - overlap), step):
+            window = section_words[start:start + words]
+            if window:
+                chunks.append((heading, " ".join(window)))
+    return chunks
+
+
+def _format_value(value) -> str:
+    if isinstance(value, (float, np.floating)):
+        return f"{value:.3g}"
+    return str(value)
+
+
+def table_passages(name: str, df: pd.DataFrame, rows: int = ROWS_PER_PASSAGE) -> List[Tuple[str, str]]:
+    """(heading, passage) pairs for a dataset, ``rows`` rows per passage"""
+    columns = list(df.columns)
+    records = df.itertuples(index=False, name=None)
+    lines = ["; ".join(f"{column}={_format_value(value)}" for column, value in zip(columns, record)) for record in records]
+    return [(f"{name} rows {start + 1}-{min(start + rows, len(lines))}", " | ".join(lines[start:start + rows]))
+            for start in range(0, len(lines), rows)]
+
+
+class RetrievalIndex:
+    """
+    On-disk BM25 index over ``outputs_dir``/*.md and, optionally, a dataset mapping
+
+    ``data`` may be a mapping of DataFrames or a zero-argument callable
+    returning one (e.g. ``data_cache.load_datasets``), called only when the
+    tables have to be (re)indexed or fingerprinted.
+    """
+
+    def __init__(self, directory: Path = CACHE_DIR / "retrieval", outputs_dir: Path = OUTPUTS_DIR,
+                 data: Optional[object] = None):
+        self.directory = Path(directory)
+        self.outputs_dir = Path(outputs_dir)
+        self.data = data
+        self.passages: List[Passage] = []
+        self.vocab: Dict[str, int] = {}
+        self.sources: Dict[str, str] = {}
+        # Passage-major term counts (CSR): row i is terms[ptr[i]:ptr[i+1]] with counts[ptr[i]:ptr[i+1]]
+        self.ptr = np.zeros(1, dtype=np.int64)
+        self.terms = np.zeros(0, dtype=np.int32)
+        self.counts = np.zeros(0, dtype=np.float32)
+        self._loaded = False
+        self._postings: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        # search() calls update(), hence reentrant
+        self._lock = threading.RLock()
+
+    # Sources -------------------------------------------------------------
+
+    def _datasets(self) -> Optional[Mapping[str, pd.DataFrame]]:
+        if callable(self.data):
+            self.data = self.data()
+        return self.data
+
+    def _source_versions(self) -> Dict[str, Tuple[str, Callable[[], List[Tuple[str, str]]]]]:
+        """source id -> (version, chunker) for everything that should be indexed"""
+        sources = {}
+        for path in sorted(self.outputs_dir.glob("*.md")):
+            stat = path.stat()
+            sources[path.name] = (f"{stat.st_mtime_ns}:{stat.st_size}",
+                                  lambda path=path: chunk_markdown(path.read_text(errors="replace")))
+        data = self._datasets()
+        if data is not None:
+            version = data_fingerprint(data)
+            for name in data:
+                sources[f"table:{name}"] = (version, lambda name=name: table_passages(name, data[name]))
+        return sources
+
+    # Persistence ---------------------------------------------------------
+
+    def _meta_path(self) -> Path:
+        return self.directory / "index.json"
+
+    def _arrays_path(self) -> Path:
+        return self.directory / "index.npz"
+
+    def load(self) -> bool:
+        """Read the stored index; False if there is none (or it is of another version)"""
+        with self._lock:
+            return self._load()
+
+    def _load(self) -> bool:
+        self._loaded = True
+        meta_path, arrays_path = self._meta_path(), self._arrays_path()
+        if not (meta_path.exists() and arrays_path.exists()):
+            return False
+        meta = json.loads(meta_path.read_text())
+        if meta.get("version") != INDEX_VERSION:
+            return False
+        arrays = np.load(arrays_path)
+        if len(arrays["ptr"]) != len(meta["passages"]) + 1:
+            # Interrupted save: the two files are from different builds
+            return False
+        self.ptr, self.terms, self.counts = arrays["ptr"], arrays["terms"], arrays["counts"]
+        self.vocab = {term: i for i, term in enumerate(meta["vocab"])}
+        self.passages = [Passage(*passage) for passage in meta["passages"]]
+        self.sources = meta["sources"]
+        self._postings = None
+        return True
+
+    def save(self):
+        """Write the index atomically (temp files + rename)"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_arrays = tempfile.mkstemp(prefix=".index.", suffix=".npz", dir=self.directory)
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, ptr=self.ptr, terms=self.terms, counts=self.counts)
+        fd, tmp_meta = tempfile.mkstemp(prefix=".index.", suffix=".json", dir=self.directory)
+        with os.fdopen(fd, "w") as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "vocab": sorted(self.vocab, key=self.vocab.get),
+                "passages": [[p.source, p.heading, p.text] for p in self.passages],
+                "sources": self.sources,
+            }, f)
+        os.replace(tmp_arrays, self._arrays_path())
+        os.replace(tmp_meta, self._meta_path())
+
+    # Building ------------------------------------------------------------
+
+    def _encode(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        counts = Counter(tokenize(text))
+        ids = np.array([self.vocab.setdefault(term, len(self.vocab)) for term in counts], dtype=np.int32)
+        return ids, np.array(list(counts.values()), dtype=np.float32)
+
+    def update(self) -> List[str]:
+        """
+        Bring the index in line with its sources; returns the re-indexed (or removed) source ids
+
+        Unchanged sources keep their rows. The index is saved only when something changed.
+        """
+        with self._lock:
+            return self._update()
+
+    def _update(self) -> List[str]:
+        if not self._loaded:
+            self._load()
+        current = self._source_versions()
+        changed = sorted(
+            [source for source, (version, _) in current.items() if self.sources.get(source) != version]
+            + [source for source in self.sources if source not in current]
+        )
+        if not changed:
+            return []
+
+        passages, rows = [], []
+        for i, passage in enumerate(self.passages):
+            if passage.source not in changed and passage.source in current:
+                passages.append(passage)
+                rows.append((self.terms[self.ptr[i]:self.ptr[i + 1]], self.counts[self.ptr[i]:self.ptr[i + 1]]))
+        for source in changed:
+            if source not in current:
+                continue
+            for heading, text in current[source][1]():
+                passages.append(Passage(source, heading, text))
+                rows.append(self._encode(f"{heading} {text}"))
+
+        lengths = np.array([len(ids) for ids, _ in rows], dtype=np.int64)
+        self.ptr = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        self.terms = np.concatenate([ids for ids, _ in rows]) if rows else np.zeros(0, dtype=np.int32)
+        self.counts = np.concatenate([counts for _, counts in rows]) if rows else np.zeros(0, dtype=np.float32)
+        self.passages = passages
+        self.sources = {source: version for source, (version, _) in current.items()}
+        self._postings = None
+        self.save()
+        logger.info(f"✓ Retrieval index: re-indexed {', '.join(changed)} ({len(passages)} passages, {len(self.vocab)} terms)")
+        return changed
+
+    def _build_postings(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Term-major BM25 weights: term t's postings are rows/weights[term_ptr[t]:term_ptr[t+1]]"""
+        n = len(self.passages)
+        rows = np.repeat(np.arange(n, dtype=np.int32), np.diff(self.ptr))
+        doc_len = np.bincount(rows, weights=self.counts, minlength=n)
+        avg_len = doc_len.mean() if n and doc_len.any() else 1.0
+        df = np.bincount(self.terms, minlength=len(self.vocab))
+        idf = np.log1p((n - df + 0.5) / (df + 0.5))
+        tf = self.counts
+        weights = idf[self.terms] * tf * (K1 + 1) / (tf + K1 * (1 - B + B * doc_len[rows] / avg_len))
+
+        order = np.argsort(self.terms, kind="stable")
+        term_ptr = np.concatenate([[0], np.cumsum(df)])
+        return term_ptr, rows[order], weights[order].astype(np.float32)
+
+    # Querying ------------------------------------------------------------
+
+    def search(self, query: str, k: int = 5, refresh: bool = True) -> List[Tuple[float, Passage]]:
+        """Top ``k`` passages for ``query`` by BM25 score, best first"""
+        with self._lock:
+            if refresh or not self._loaded:
+                self._update()
+            if self._postings is None:
+                self._postings = self._build_postings()
+            term_ptr, rows, weights = self._postings
+
+            hits, scores = [], []
+            for term, repeats in Counter(tokenize(query)).items():
+                term_id = self.vocab.get(term)
+                if term_id is None:
+                    continue
+                start, end = term_ptr[term_id], term_ptr[term_id + 1]
+                hits.append(rows[start:end])
+                scores.append(weights[start:end] * repeats)
+            if not hits:
+                return []
+            total = np.bincount(np.concatenate(hits), weights=np.concatenate(scores), minlength=len(self.passages))
+            k = min(k, int((total > 0).sum()))
+            top = np.argpartition(-total, k - 1)[:k] if k else []
+            top = sorted(top, key=lambda i: (-total[i], i))
+            return [(float(total[i]), self.passages[i]) for i in top]
+
+    def context(self, query: str, k: int = 5, max_tokens: int = 600) -> str:
+        """The best passages for ``query`` as citable prompt context, within ``max_tokens``"""
+        lines, used = [], 0
+        for _, passage in self.search(query, k):
+            line = f"[{passage.source}{' / ' + passage.heading if passage.heading else ''}] {passage.text}"
+            cost = estimate_tokens(line) + 1
+            if used + cost > max_tokens:
+                break
+            lines.append(line)
+            used += cost
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from data_cache import load_datasets
+
+    index = RetrievalIndex(data=load_datasets)
+    index.update()
+    query = " ".join(sys.argv[1:]) or "adolescent depression screen time"
+    start = time.perf_counter()
+    results = index.search(query, refresh=False)
+    elapsed = time.perf_counter() - start
+    for score, passage in results:
+        print(f"{score:6.2f}  [{passage.source} / {passage.heading}] {passage.text[:120]}")
+    print(f"\n{len(index.passages)} passages, {len(index.vocab)} terms, query in {elapsed * 1000:.2f} ms")
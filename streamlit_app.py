@@ -9,7 +9,7 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from data_generators import get_all_data
+from data_cache import load_datasets
 
 # Page config
 st.set_page_config(
@@ -33,11 +33,11 @@ st.markdown("""
 st.title("🧵 Digital Detox Weaver")
 st.markdown("**Production-Ready Health Analytics Platform**")
 
-# Load data with error handling
-@st.cache_data
+# Load data with error handling (lazily read from the on-disk dataset cache)
+@st.cache_resource
 def load_data():
     try:
-        return get_all_data()
+        return load_datasets()
     except Exception as e:
         st.error(f"Data generation failed: {e}")
         # Return mock data for demo
@@ -121,7 +121,7 @@ try:
         
         # World map
         fig = px.choropleth(
-            data['global_epidemiology'].groupby('country')['avg_screen_time_hours'].mean().reset_index(),
+            data['global_epidemiology'].groupby('country', observed=True)['avg_screen_time_hours'].mean().reset_index(),
             locations='country',
             locationmode='country names',
             color='avg_screen_time_hours',
@@ -163,7 +163,7 @@ try:
         
     elif "Inequality" in tab_selection:
         fig = px.bar(
-            data['ses_inequality'].groupby('income_level')['health_impact_multiplier'].mean().reset_index(),
+            data['ses_inequality'].groupby('income_level', observed=True)['health_impact_multiplier'].mean().reset_index(),
             x='income_level',
             y='health_impact_multiplier',
             title="Health Impact by Socioeconomic Status"
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Bootstrap CI Tests
+Checks vectorized bootstrap intervals, grouping, worker determinism and caching
+"""
+
+import numpy as np
+import pandas as pd
+
+import bootstrap
+from bootstrap import bootstrap_ci, format_ci
+from data_generators import get_all_data
+
+
+def test_interval_width():
+    """The CI of a mean matches the normal-theory interval on a large sample"""
+    print("Testing interval width...")
+    values = np.random.default_rng(0).normal(10, 2, 2_000)
+    row = bootstrap_ci(pd.DataFrame({'x': values}), ['x']).iloc[0]
+    half_width = 1.96 * values.std(ddof=1) / np.sqrt(len(values))
+    assert row['ci_low'] < row['estimate'] < row['ci_high']
+    assert abs((row['ci_high'] - row['ci_low']) / 2 - half_width) < 0.1 * half_width
+    print(f"OK {format_ci(row)}")
+
+
+def test_grouped():
+    """One row per group and column, labelled by the group keys"""
+    print("\nTesting grouped intervals...")
+    data = get_all_data(seed=1, workers=1)
+    result = bootstrap_ci(data['age_stratification'], ['health_impact_score', 'depression_risk'], by='age_group', statistic='median')
+    assert len(result) == 5 * 2
+    assert set(result['age_group']) == {'13-17', '18-24', '25-34', '35-49', '50+'}
+    assert (result['n'] == 16).all()
+    assert (result['ci_low'] <= result['ci_high']).all()
+    print(f"OK {len(result)} grouped intervals")
+
+
+def test_workers_and_cache():
+    """Process-pool results match in-process ones, and repeats come from the cache"""
+    print("\nTesting workers and cache...")
+    epi = get_all_data(seed=2, workers=1)['global_epidemiology']
+    columns = ['depression_rate', 'anxiety_rate']
+    serial = bootstrap_ci(epi, columns, by='year', n_resamples=500)
+    bootstrap._cache.clear()
+    parallel = bootstrap_ci(epi, columns, by='year', n_resamples=500, workers=2)
+    assert serial.equals(parallel)
+
+    cached = len(bootstrap._cache)
+    again = bootstrap_ci(epi, columns, by='year', n_resamples=500)
+    assert again.equals(serial) and len(bootstrap._cache) == cached
+    changed = epi.assign(depression_rate=epi['depression_rate'] * 2)
+    assert not bootstrap_ci(changed, columns, by='year', n_resamples=500).equals(serial)
+    print("OK identical across workers, cached by fingerprint")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("DIGITAL DETOX WEAVER: BOOTSTRAP CI TEST")
+    print("=" * 50)
+
+    for test in [test_interval_width, test_grouped, test_workers_and_cache]:
+        test()
+
+    print("\n" + "=" * 50)
+    print("SUCCESS All bootstrap CI tests passed!")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
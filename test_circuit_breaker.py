@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Circuit Breaker Tests
+Checks breaker states, jittered retries and fast degradation of the router and RAG fetcher under an outage
+"""
+
+import functools
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / ".kiro"))
+
+from agents.circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakers, CircuitOpenError, backoff_delay, call_with_retry
+)
+from agents.latency import LatencyTracker
+from agents.llm_router import LLMRouter
+
+OUTAGE_DELAY = 0.05
+
+
+def test_breaker_states():
+    """closed -> open after the threshold, half-open after the reset time, one probe at a time"""
+    print("Testing breaker states...")
+    now = [0.0]
+    breaker = CircuitBreaker("claude", failure_threshold=3, reset_seconds=10, clock=lambda: now[0])
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+    try:
+        breaker.before_call()
+        raise AssertionError("open breaker let a call through")
+    except CircuitOpenError as e:
+        assert "next probe in 10.0s" in str(e)
+
+    now[0] = 10.0
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN and breaker.opened == 2
+
+    now[0] = 20.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.failures == 0
+
+    delays = [backoff_delay(attempt, base=0.5, cap=2.0) for attempt in range(6) for _ in range(50)]
+    assert 0 <= min(delays) and max(delays) <= 2.0 and len(set(delays)) > 100
+    print("OK closed -> open -> half-open -> closed")
+
+
+def test_call_with_retry():
+    """Transient errors are retried, configuration errors and exhausted deadlines are not"""
+    print("\nTesting retries...")
+    breaker = CircuitBreaker("gemini", failure_threshold=10)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("reset by peer")
+        return "ok"
+
+    assert call_with_retry(breaker, flaky, retries=3, timeout=5, backoff_base=0.01) == "ok"
+    assert len(attempts) == 3 and breaker.failures == 0
+
+    def misconfigured():
+        attempts.append(1)
+        raise AttributeError("no client")
+
+    attempts.clear()
+    try:
+        call_with_retry(breaker, misconfigured, retries=3, timeout=5, backoff_base=0.01)
+    except AttributeError:
+        pass
+    assert len(attempts) == 1
+
+    def down():
+        attempts.append(1)
+        raise ConnectionError("down")
+
+    attempts.clear()
+    start = time.perf_counter()
+    try:
+        call_with_retry(breaker, down, retries=10, timeout=0.2, backoff_base=0.1)
+    except ConnectionError:
+        pass
+    assert time.perf_counter() - start < 0.3 and len(attempts) < 10
+    print(f"OK gave up after {len(attempts)} attempts within the deadline")
+
+
+def test_outage_degrades_fast():
+    """Once breakers open, workflow-sized bursts of requests fail over or fail in milliseconds"""
+    print("\nTesting outage behaviour...")
+    calls = []
+
+    def dead(name):
+        def generate(*args):
+            calls.append(name)
+            time.sleep(OUTAGE_DELAY)
+            raise ConnectionError(f"{name} unreachable")
+            yield
+        return generate
+
+    def alive(*args):
+        calls.append("gemini")
+        yield "gemini answer"
+
+    router = LLMRouter()
+    router.primary_provider, router.fallback_provider = "claude", "gemini"
+    router.response_cache = None
+    router.routing, router.hedge = "fixed", False
+    router.latency = LatencyTracker()
+    router.breakers = CircuitBreakers(failure_threshold=2, reset_seconds=60)
+    router.retry_attempts, router.backoff_base = 2, 0.01
+    router._claude_generate = dead("claude")
+    router._gemini_generate = alive
+
+    # A request's retries count as one breaker failure; the second failed request opens it
+    assert "".join(router.generate("q")) == "gemini answer"
+    assert calls.count("claude") == 3 and router.breakers.get("claude").failures == 1
+    assert router.breakers.get("claude").state == CLOSED
+    assert "".join(router.generate("q")) == "gemini answer"
+    assert calls.count("claude") == 6 and router.breakers.get("claude").state == OPEN
+    assert router.provider_order() == ["gemini", "claude"]
+
+    # Six report steps with the primary circuit open never touch it
+    calls.clear()
+    start = time.perf_counter()
+    for _ in range(6):
+        assert "".join(router.generate("q")) == "gemini answer"
+    failover = time.perf_counter() - start
+    assert "claude" not in calls
+
+    # Total outage: both breakers open, every request fails immediately
+    router._gemini_generate = dead("gemini")
+    for _ in range(2):
+        list(router.generate("q"))
+    calls.clear()
+    start = time.perf_counter()
+    for _ in range(6):
+        assert "".join(router.generate("q")).startswith("Error:")
+    outage = time.perf_counter() - start
+    assert calls == [] and outage < 6 * OUTAGE_DELAY
+    print(f"OK 6 requests: {failover * 1000:.1f} ms via fallback, {outage * 1000:.1f} ms in total outage")
+
+
+def test_rag_fetcher_fails_fast():
+    """Dashboard RAG calls return simulated data without waiting once the Gemini circuit is open"""
+    print("\nTesting RAG fetcher under outage...")
+    import rag_integration
+
+    calls = []
+
+    class DeadModel:
+        def generate_content(self, prompt, **kwargs):
+            calls.append(prompt)
+            time.sleep(OUTAGE_DELAY)
+            raise ConnectionError("gemini unreachable")
+
+    original = rag_integration.circuit_breakers, rag_integration.call_with_retry
+    rag_integration.circuit_breakers = CircuitBreakers(failure_threshold=2, reset_seconds=60)
+    rag_integration.call_with_retry = functools.partial(call_with_retry, retries=1, backoff_base=0.01)
+    try:
+        fetcher = rag_integration.RAGDataFetcher()
+        fetcher.model = DeadModel()
+        assert fetcher.fetch_real_time_health_data()["status"] == "fallback_active"
+        assert len(calls) == 2
+
+        start = time.perf_counter()
+        metrics = fetcher.fetch_real_time_health_data()
+        topics = fetcher.fetch_trending_health_topics()
+        policy = fetcher.get_live_policy_updates()
+        wall = time.perf_counter() - start
+    finally:
+        rag_integration.circuit_breakers, rag_integration.call_with_retry = original
+    assert len(calls) == 2 and wall < OUTAGE_DELAY
+    assert "circuit open" in metrics["error_reason"]
+    assert len(topics) == 3 and policy["status"] == "error"
+    print(f"OK 3 dashboard calls degraded in {wall * 1000:.2f} ms")
+
+
+def main():
+    print("=" * 50)
+    print("Circuit Breaker Tests")
+    print("=" * 50)
+    for test in [test_breaker_states, test_call_with_retry, test_outage_degrades_fast, test_rag_fetcher_fails_fast]:
+        test()
+    print("=" * 50)
+    print("SUCCESS: All circuit breaker tests passed")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Client Pool Tests
+Checks that provider clients are built once per key and shared across callers
+"""
+
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / ".kiro"))
+
+from agents.client_pool import ClientPool, client_pool
+
+
+def test_one_client_per_key():
+    """Repeated and concurrent lookups return the same client; other keys get their own"""
+    print("Testing client reuse...")
+    pool = ClientPool(pool_size=2)
+    builds = []
+    barrier = threading.Barrier(8)
+
+    def build():
+        builds.append(1)
+        return object()
+
+    def get(_):
+        barrier.wait()
+        return pool._get(("test", "key"), build)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(get, range(8)))
+    assert len(builds) == 1 and all(client is clients[0] for client in clients)
+
+    claude = pool.claude(api_key="test-key", base_url="http://127.0.0.1:1")
+    assert pool.claude(api_key="test-key", base_url="http://127.0.0.1:1") is claude
+    assert pool.claude(api_key="test-key", base_url="http://127.0.0.1:2") is not claude
+
+    session = pool.http_session()
+    assert pool.http_session() is session
+    assert session.get_adapter("https://example.org")._pool_maxsize == 2
+    pool.close()
+    print(f"OK {pool.created} clients built")
+
+
+def test_gemini_models_shared_with_rag():
+    """The router and RAGDataFetcher get the same GenerativeModel per model and system instruction"""
+    print("\nTesting Gemini model sharing...")
+    os.environ["GEMINI_API_KEY"] = "test-key"
+    try:
+        from agents.llm_router import LLMRouter
+        from rag_integration import RAGDataFetcher
+
+        router = LLMRouter()
+        fetcher = RAGDataFetcher()
+        assert router.clients is client_pool
+        assert fetcher.model is client_pool.gemini_model("gemini-2.0-flash-exp")
+        analyst = client_pool.gemini_model("gemini-2.0-flash-exp", "You are a data analyst")
+        assert analyst is client_pool.gemini_model("gemini-2.0-flash-exp", "You are a data analyst")
+        assert analyst is not fetcher.model
+    finally:
+        del os.environ["GEMINI_API_KEY"]
+    print("OK one model per (model, system instruction)")
+
+
+def main():
+    print("=" * 50)
+    print("Client Pool Tests")
+    print("=" * 50)
+    for test in [test_one_client_per_key, test_gemini_models_shared_with_rag]:
+        test()
+    print("=" * 50)
+    print("SUCCESS: All client pool tests passed")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Dataset Cache Tests
+Checks the columnar on-disk cache round-trips the SOURCE 1 datasets
+"""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+import pyarrow.parquet as pq
+
+from data_cache import DatasetCache, load_datasets, generate_datasets, write_partitioned
+from data_generators import iter_dataset
+
+
+def test_round_trip():
+    """Cached datasets equal freshly generated ones, for both formats"""
+    print("Testing cache round trip...")
+    expected = generate_datasets()
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in ["parquet", "feather", "arrow"]:
+            data = load_datasets(cache_dir=Path(tmp), fmt=fmt)
+            for name, df in expected.items():
+                assert data.num_rows(name) == len(df)
+                assert np.array_equal(data[name].to_numpy(), df.to_numpy()), f"{fmt}: {name}"
+            print(f"OK {fmt} round trip")
+
+
+def test_lazy_projection():
+    """Datasets load on first access and select() reads only requested columns"""
+    print("\nTesting lazy loading and column projection...")
+    with tempfile.TemporaryDirectory() as tmp:
+        data = load_datasets(cache_dir=Path(tmp))
+        projected = data.select('global_epidemiology', ['year', 'depression_rate'])
+        assert list(projected.columns) == ['year', 'depression_rate']
+        assert data._frames == {}
+        assert len(data['global_epidemiology']) == 192
+        assert list(data._frames) == ['global_epidemiology']
+    print("OK lazy mapping with projection")
+
+
+def test_cache_key_and_reuse():
+    """Collections are keyed by version, seed and scale and written only once"""
+    print("\nTesting cache keys...")
+    with tempfile.TemporaryDirectory() as tmp:
+        default = DatasetCache(cache_dir=Path(tmp))
+        seeded = DatasetCache(seed=3, scale=2, cache_dir=Path(tmp))
+        assert default.directory != seeded.directory
+        default.ensure()
+        mtime = default.path('mechanisms').stat().st_mtime_ns
+        DatasetCache(cache_dir=Path(tmp)).ensure()
+        assert default.path('mechanisms').stat().st_mtime_ns == mtime
+    print("OK distinct keys, no rewrite on hit")
+
+
+def _mapped_ranges(path):
+    """Address ranges where ``path`` is memory-mapped into this process (Linux)"""
+    ranges = []
+    for line in Path("/proc/self/maps").read_text().splitlines():
+        if line.endswith(str(path)):
+            start, end = line.split()[0].split("-")
+            ranges.append((int(start, 16), int(end, 16)))
+    return ranges
+
+
+def test_memory_mapped_arrow():
+    """The arrow format maps columns from the file instead of copying them"""
+    print("\nTesting memory-mapped loading...")
+    if not Path("/proc/self/maps").exists():
+        print("SKIP /proc/self/maps not available")
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        data = load_datasets(cache_dir=Path(tmp), fmt="arrow")
+        df = data['global_epidemiology']
+        ranges = _mapped_ranges(data.cache.path('global_epidemiology').resolve())
+        assert ranges, "dataset file is not memory-mapped"
+        for column in ['year', 'depression_rate']:
+            address = np.asarray(df[column].array).__array_interface__['data'][0]
+            assert any(start <= address < end for start, end in ranges), column
+    print("OK numeric columns are views into the mapped file")
+
+
+def test_write_partitioned():
+    """Streamed chunks land in a year-partitioned Parquet dataset"""
+    print("\nTesting partitioned Parquet sink...")
+    with tempfile.TemporaryDirectory() as tmp:
+        chunks = iter_dataset('global_epidemiology', scale=10, chunk_size=500, seed=1)
+        rows = write_partitioned(chunks, Path(tmp) / "epi", partition_cols=['year'])
+        assert rows == 10 * 192
+        years = sorted(p.name for p in (Path(tmp) / "epi").iterdir())
+        assert years[0] == 'year=2010' and len(years) == 16
+        table = pq.read_table(Path(tmp) / "epi")
+        assert table.num_rows == rows
+        assert len(set(table.column('country').to_pylist())) == 120
+    print(f"OK {rows} rows across {len(years)} partitions")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("DIGITAL DETOX WEAVER: DATASET CACHE TEST")
+    print("=" * 50)
+
+    for test in [test_round_trip, test_lazy_projection, test_cache_key_and_reuse, test_memory_mapped_arrow,
+                 test_write_partitioned]:
+        test()
+
+    print("\n" + "=" * 50)
+    print("SUCCESS All dataset cache tests passed!")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
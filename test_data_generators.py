@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Data Generator Tests
+Checks the vectorized SOURCE 1 generators against the original row-by-row behaviour
+"""
+
+import numpy as np
+
+import data_generators
+from data_generators import get_all_data
+
+EXPECTED_RECORDS = {
+    'global_epidemiology': 192,
+    'age_stratification': 80,
+    'platform_comparison': 7,
+    'mechanisms': 41,
+    'disease_timeline': 112,
+    'ses_inequality': 60,
+    'detox_timeline': 13,
+    'policy_interventions': 8,
+}
+
+
+def test_record_counts():
+    """Scale 1 keeps the original dataset shapes"""
+    print("Testing record counts...")
+    np.random.seed(42)
+    data = get_all_data()
+    for name, expected in EXPECTED_RECORDS.items():
+        assert len(data[name]) == expected, f"{name}: {len(data[name])} != {expected}"
+    print(f"OK {sum(len(df) for df in data.values())} records across {len(data)} datasets")
+
+
+def test_scaled_shapes():
+    """Scale multiplies each dataset's entity axis with labelled replicas"""
+    print("\nTesting scaled shapes...")
+    np.random.seed(42)
+    data = get_all_data(scale=3)
+    assert len(data['global_epidemiology']) == 3 * 192
+    assert len(data['mechanisms']) == 3 * 40 + 1
+    assert 'USA_3' in set(data['global_epidemiology']['country'])
+    assert data['age_stratification']['vulnerability_multiplier'].max() == 5.5
+
+    epi = data_generators.generate_global_epidemiology(n_countries=30, n_years=5)
+    assert epi['country'].nunique() == 30 and epi['year'].nunique() == 5
+    print("OK scale=3 and explicit n_countries/n_years")
+
+
+def test_interleaved_draws_match_loop():
+    """Vectorized normal/uniform pairs consume the stream like the original loop"""
+    print("\nTesting interleaved normal/uniform draws...")
+    for n in [1, 2, 7, 112]:
+        for cached_gauss in (False, True):
+            np.random.seed(n)
+            if cached_gauss:
+                np.random.normal()
+            expected = [(np.random.normal(0, 0.005), np.random.uniform(0.15, 0.45)) for _ in range(n)]
+            expected_next = np.random.random_sample(3)
+
+            np.random.seed(n)
+            if cached_gauss:
+                np.random.normal()
+            normals, uniforms = data_generators._normal_uniform_pairs(n, 0.005, 0.15, 0.45)
+            assert np.array_equal(np.column_stack([normals, uniforms]), np.array(expected))
+            assert np.array_equal(np.random.random_sample(3), expected_next)
+    print("OK draws and stream position identical")
+
+
+def test_reproducible():
+    """Reseeding reproduces every dataset exactly"""
+    print("\nTesting reproducibility...")
+    np.random.seed(42)
+    first = get_all_data()
+    np.random.seed(42)
+    second = get_all_data()
+    for name in first:
+        assert first[name].equals(second[name]), name
+    print("OK seeded generation is deterministic")
+
+
+def test_seeded_parallel_generation():
+    """Seeded mode is deterministic across worker counts and pool types"""
+    print("\nTesting seeded parallel generation...")
+    sequential = get_all_data(scale=2, seed=7, workers=1)
+    for kwargs in [{'workers': 8}, {'workers': 3}, {'workers': 2, 'processes': True}]:
+        parallel = get_all_data(scale=2, seed=7, **kwargs)
+        assert list(parallel) == list(sequential)
+        for name in sequential:
+            assert sequential[name].equals(parallel[name]), f"{name} differs with {kwargs}"
+
+    # Each dataset's stream depends only on its own name
+    alone = data_generators._generate_seeded('policy_interventions', 2, data_generators.dataset_seed(7, 'policy_interventions'))
+    assert alone.equals(sequential['policy_interventions'])
+    assert not get_all_data(seed=8, workers=1)['global_epidemiology'].equals(get_all_data(seed=7, workers=1)['global_epidemiology'])
+    print("OK identical output for 1, 2, 3 and 8 workers")
+
+
+def test_compact_schema():
+    """Every dataset carries its declared compact dtypes"""
+    print("\nTesting compact schema...")
+    data = get_all_data(scale=2, seed=1, workers=1)
+    for name, df in data.items():
+        assert list(df.columns) == list(data_generators.SCHEMAS[name]), name
+        for column, dtype in data_generators.SCHEMAS[name].items():
+            assert df[column].dtype == dtype, f"{name}.{column}: {df[column].dtype}"
+
+    report = data_generators.memory_report(data)
+    assert (report['reduction'] > 1).all()
+    print(f"OK schema applied, {report['wide_bytes'].sum() / report['compact_bytes'].sum():.1f}x smaller")
+
+
+def test_chunked_generation():
+    """Chunks from the global stream concatenate to the one-shot dataset"""
+    print("\nTesting chunked generation...")
+    for name in data_generators.DATASET_GENERATORS:
+        np.random.seed(5)
+        whole = data_generators.DATASET_GENERATORS[name](scale=7)
+        np.random.seed(5)
+        chunks = list(data_generators.iter_dataset(name, scale=7, chunk_size=40))
+        assert len(chunks) > 1, name
+        assert len(chunks[0]) <= 40 or len(chunks) == 7, name
+        joined = np.concatenate([chunk.to_numpy() for chunk in chunks]).astype(str)
+        expected = whole.to_numpy().astype(str)
+        if name == 'mechanisms':
+            # The fixed 41st row closes the first chunk instead of the whole table
+            first = len(chunks[0])
+            joined = np.concatenate([joined[:first - 1], joined[first:], joined[first - 1:first]])
+        assert np.array_equal(joined, expected), name
+
+    seeded = [len(c) for c in data_generators.iter_dataset('global_epidemiology', scale=5, chunk_size=400, seed=3)]
+    assert seeded == [384, 384, 192]
+    print("OK chunked output identical to one-shot generation")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("DIGITAL DETOX WEAVER: DATA GENERATOR TEST")
+    print("=" * 50)
+
+    for test in [test_record_counts, test_scaled_shapes, test_interleaved_draws_match_loop, test_reproducible,
+                 test_seeded_parallel_generation, test_compact_schema, test_chunked_generation]:
+        test()
+
+    print("\n" + "=" * 50)
+    print("SUCCESS All data generator tests passed!")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Data Summary Tests
+Checks the precomputed SOURCE 1 summary, its token budget and its cache
+"""
+
+import tempfile
+from pathlib import Path
+
+import data_summary
+from data_cache import generate_datasets
+from data_summary import build_data_summary, compute_sections, estimate_tokens, render_summary
+
+
+def test_sections():
+    """Key trends, ratios and the dose-response exponent come out of the data"""
+    print("Testing summary sections...")
+    sections = compute_sections(generate_datasets())
+    text = "\n".join(line for lines in sections.values() for line in lines)
+    assert "avg_screen_time_hours" in text and "inflection 2020" in text
+    assert "dose-response exponent (log-log fit, uncapped rows): 1.30" in text
+    assert "low vs high income health impact: 2.2x" in text
+    assert "95% CI" in text
+    assert list(sections)[-1].startswith("Descriptive statistics")
+    print(f"OK {len(sections)} sections")
+
+
+def test_token_budget():
+    """Rendering keeps high-priority sections and stays within the budget"""
+    print("\nTesting token budget...")
+    sections = compute_sections(generate_datasets())
+    full = render_summary(sections, max_tokens=100_000)
+    for budget in [50, 200, 600]:
+        text = render_summary(sections, max_tokens=budget)
+        assert estimate_tokens(text) <= budget
+        assert text.startswith("### Global trends")
+        assert len(text) < len(full)
+    print(f"OK budgets respected (full summary ~{estimate_tokens(full)} tokens)")
+
+
+def test_cached_by_fingerprint():
+    """A second build reads the cached sections instead of recomputing"""
+    print("\nTesting fingerprint cache...")
+    data = generate_datasets(seed=5)
+    calls = []
+    original = data_summary.compute_sections
+    data_summary.compute_sections = lambda d: calls.append(1) or original(d)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            first = build_data_summary(data, cache_dir=Path(tmp))
+            data_summary._sections_cache.clear()
+            second = build_data_summary(data, cache_dir=Path(tmp))
+            assert first == second and len(calls) == 1
+            assert len(list((Path(tmp) / "summaries").glob("*.json"))) == 1
+
+            data['policy_interventions'] = data['policy_interventions'].assign(cost_per_person=1.0)
+            build_data_summary(data, cache_dir=Path(tmp))
+            assert len(calls) == 2
+    finally:
+        data_summary.compute_sections = original
+    print("OK recomputed only when the data changes")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("DIGITAL DETOX WEAVER: DATA SUMMARY TEST")
+    print("=" * 50)
+
+    for test in [test_sections, test_token_budget, test_cached_by_fingerprint]:
+        test()
+
+    print("\n" + "=" * 50)
+    print("SUCCESS All data summary tests passed!")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
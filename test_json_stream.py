@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Streaming JSON Tests
+Checks incremental extraction across chunk boundaries, schema validation and early stop on Gemini streams
+"""
+
+import json
+import re
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List, Optional
+
+sys.path.append(str(Path(__file__).parent / ".kiro"))
+
+import rag_integration
+from agents.circuit_breaker import CircuitBreakers
+from json_stream import JSONObjectExtractor, extract_json, validate
+from rag_integration import RAGDataFetcher
+
+ANSWER = ('Here are the figures you asked for {as of 2025}:\n```json\n'
+          '{"screen_time_hours": 6.9, "depression_rate": 0.21, "anxiety_rate": 0.3, "sleep_disorders": 0.24,\n'
+          ' "detox_findings": "Quote \\"}{\\" inside a string"}\n```\n'
+          'Let me know if you need {more} details.')
+
+
+def test_extraction_across_chunks():
+    """The first object is found at any chunk size, past fences, prose braces and escaped quotes"""
+    print("Testing incremental extraction...")
+    expected = json.loads(ANSWER[ANSWER.index("\n{") + 1:ANSWER.index("\n```\nLet")])
+    for size in [1, 2, 3, 7, 64, len(ANSWER)]:
+        assert extract_json(ANSWER[i:i + size] for i in range(0, len(ANSWER), size)) == expected, size
+    assert extract_json(["no JSON ", "at all"]) is None
+    assert extract_json(['{"unterminated": ', '"value"']) is None
+
+    extractor = JSONObjectExtractor()
+    assert not extractor.feed('```json\n{"a": {"b": [1, ')
+    assert extractor.feed('2]}}\n``` trailing') and extractor.value == {"a": {"b": [1, 2]}}
+    assert extractor.feed("ignored") and extractor.value == {"a": {"b": [1, 2]}}
+
+    # Linear in the answer size: many small chunks of one object, and deeply nested non-JSON braces
+    start = time.perf_counter()
+    assert extract_json(["{" + '"k": "' + "x" * 43] + ["y" * 50] * 40_000 + ['"}']) == {"k": "x" * 43 + "y" * 2_000_000}
+    assert extract_json(["{" * 8_000, "}" * 8_000, ' then {"k": 1}']) == {"k": 1}
+    elapsed = time.perf_counter() - start
+    assert elapsed < 1.0
+    print(f"OK every chunk size, 40k chunks and 8k nested braces in {elapsed * 1000:.0f} ms")
+
+
+def test_schema_validation():
+    """Typed schemas reject missing fields, wrong types and booleans posing as numbers"""
+    print("\nTesting schema validation...")
+    schema = {"value": float, "tags": List[str], "note": Optional[str], "items": [{"name": str}]}
+    good = {"value": 1, "tags": ["a"], "items": [{"name": "x", "extra": 1}]}
+    assert validate(good, schema) is good
+    for bad, message in [
+        ({"tags": [], "items": []}, "value: missing"),
+        ({**good, "value": True}, "value: expected a number"),
+        ({**good, "tags": "a"}, "tags: expected a list"),
+        ({**good, "note": 3}, "note: expected a string"),
+        ({**good, "items": [{}]}, "items[0].name: missing"),
+        (None, "response: expected an object"),
+    ]:
+        try:
+            validate(bad, schema)
+            raise AssertionError(f"accepted {bad}")
+        except ValueError as e:
+            assert str(e) == message, e
+    print("OK 6 invalid responses rejected")
+
+
+def deployed_python():
+    """Interpreter matching the Dockerfile's ``FROM python:X.Y`` image, or None if not installed"""
+    root = Path(__file__).parent
+    version = re.search(r"^FROM python:(\d+\.\d+)", (root / "Dockerfile").read_text(), re.M).group(1)
+    if sys.version.startswith(f"{version}."):
+        return sys.executable
+    candidates = sorted(Path.home().glob(f".pyenv/versions/{version}.*/bin/python"))
+    for python in [str(path) for path in candidates[::-1]] + [shutil.which(f"python{version}")]:
+        # A pyenv shim is on PATH even when that version is not selected, and fails to run
+        if python and subprocess.run([python, "-c", ""], capture_output=True).returncode == 0:
+            return python
+    return None
+
+
+def test_schemas_import_on_deployed_python():
+    """rag_integration builds its schemas without error on the Python version the Dockerfile deploys"""
+    print("\nTesting schema import on the deployed Python...")
+    python = deployed_python()
+    if python is None:
+        print("SKIP no interpreter for the Dockerfile's Python version")
+        return
+    result = subprocess.run([python, "-c", "import rag_integration"], cwd=Path(__file__).parent,
+                            capture_output=True, text=True, timeout=120)
+    if "ModuleNotFoundError" in result.stderr:
+        print(f"SKIP dependencies missing for {python}: {result.stderr.strip().splitlines()[-1]}")
+        return
+    assert result.returncode == 0, result.stderr
+    print(f"OK rag_integration imports under {python}")
+
+
+def test_fetch_stops_reading_after_object():
+    """The health fetch parses the metrics and stops pulling chunks at the end of the object"""
+    print("\nTesting early stop on a streamed response...")
+    pulled = []
+
+    class Model:
+        def generate_content(self, prompt, stream=False, **kwargs):
+            assert stream
+
+            def chunks():
+                for i in range(0, len(ANSWER), 8):
+                    pulled.append(i)
+                    yield SimpleNamespace(text=ANSWER[i:i + 8])
+            return chunks()
+
+    fetcher = RAGDataFetcher()
+    fetcher.model = Model()
+    fetcher.retriever = None
+    original = rag_integration.circuit_breakers
+    rag_integration.circuit_breakers = CircuitBreakers()
+    try:
+        metrics = fetcher.fetch_real_time_health_data()
+    finally:
+        rag_integration.circuit_breakers = original
+    assert metrics["screen_time_hours"] == 6.9 and metrics["detox_findings"] == 'Quote "}{" inside a string'
+    total = -(-len(ANSWER) // 8)
+    assert len(pulled) < total
+    print(f"OK {len(pulled)} of {total} chunks read")
+
+
+def main():
+    print("=" * 50)
+    print("Streaming JSON Tests")
+    print("=" * 50)
+    for test in [test_extraction_across_chunks, test_schema_validation, test_schemas_import_on_deployed_python,
+                 test_fetch_stops_reading_after_object]:
+        test()
+    print("=" * 50)
+    print("SUCCESS: All streaming JSON tests passed")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,10 +15,10 @@ def test_imports():
     print("Testing imports...")
     
     try:
-        from config.llm_config import llm_config
+        from kiro_config.llm_config import llm_config
         print("OK LLM config imported")
         
-        from config.agent_config import agent_config
+        from kiro_config.agent_config import agent_config
         print("OK Agent config imported")
         
         from prompts.analysis_prompts import analysis_prompts
@@ -37,7 +37,7 @@ def test_configuration():
     print("\nTesting configuration...")
     
     try:
-        from config.agent_config import agent_config
+        from kiro_config.agent_config import agent_config
         
         # Test agent temperatures
         temps = agent_config.AGENT_TEMPERATURES
@@ -113,6 +113,30 @@ def test_prompts():
         print(f"FAIL Prompts test failed: {e}")
         return False
 
+def test_config_packages():
+    """Test that `config` is the root module and `kiro_config` the .kiro package, in any import order"""
+    print("\nTesting config packages...")
+    
+    import subprocess
+    root = Path(__file__).parent
+    check = (
+        "import sys; sys.path[:0] = [{root!r}]; sys.path.append({kiro!r})\n"
+        "{first}\n"
+        "import config, kiro_config\n"
+        "from config import CACHE_DIR, LIVE_METRICS_TTL_SECONDS\n"
+        "from kiro_config import llm_config, agent_config\n"
+        "from kiro_config.llm_config import LLMConfig\n"
+        "from agents.circuit_breaker import REQUEST_TIMEOUT\n"
+        "assert not hasattr(config, '__path__') and kiro_config.__path__\n"
+        "assert REQUEST_TIMEOUT == float(llm_config.timeout)\n"
+    )
+    for first in ["import kiro_config", "import config", "import live_metrics"]:
+        script = check.format(root=str(root), kiro=str(root / ".kiro"), first=first)
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, cwd=root)
+        assert result.returncode == 0, result.stderr
+    print("OK config and kiro_config resolve independently")
+    return True
+
 def main():
     """Run all tests"""
     print("=" * 50)
@@ -123,7 +147,8 @@ def main():
         test_imports,
         test_configuration,
         test_llm_router,
-        test_prompts
+        test_prompts,
+        test_config_packages
     ]
     
     results = []
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Live Metrics Tests
+Checks that dashboard reads never wait on the fetch, share one in-flight fetch and serve stale values while refreshing
+"""
+
+import threading
+import time
+
+from live_metrics import LiveValue
+
+FETCH_DELAY = 0.2
+
+
+def slow_source(calls, fail=lambda: False):
+    def fetch():
+        calls.append(time.monotonic())
+        time.sleep(FETCH_DELAY)
+        if fail():
+            raise ConnectionError("gemini unreachable")
+        return {"screen_time_hours": 9.0, "fetch": len(calls)}
+    return fetch
+
+
+def test_reads_never_wait_and_share_one_fetch():
+    """Concurrent cold reads return the default at once while a single fetch runs"""
+    print("Testing single-flight reads...")
+    calls = []
+    value = LiveValue("metrics", slow_source(calls), ttl_seconds=60, default=lambda: {"status": "refreshing"})
+    results, latencies = [], []
+
+    def read():
+        start = time.perf_counter()
+        results.append(value.get())
+        latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=read) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(result == {"status": "refreshing"} for result in results)
+    assert max(latencies) < FETCH_DELAY / 4
+
+    assert value.get(wait=2 * FETCH_DELAY)["fetch"] == 1
+    for _ in range(100):
+        assert value.get()["fetch"] == 1
+    stats = value.stats()
+    assert len(calls) == 1 and stats["fresh_reads"] >= 100
+    value.stop()
+    print(f"OK 20 cold reads in at most {max(latencies) * 1000:.1f} ms, 1 fetch")
+
+
+def test_stale_while_revalidate_and_errors():
+    """Expired values are served while one refresh runs; failures keep the last good value"""
+    print("\nTesting stale-while-revalidate...")
+    calls = []
+    failing = [False]
+    value = LiveValue("metrics", slow_source(calls, lambda: failing[0]), ttl_seconds=FETCH_DELAY * 3,
+                      idle_seconds=60)
+    first = value.refresh(timeout=2)
+    assert first["fetch"] == 1
+
+    # Refresh-ahead: the worker renews the value before it expires while it is being read
+    deadline = time.monotonic() + 2
+    while value.get()["fetch"] == 1 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert value.get()["fetch"] == 2
+
+    # An outage: readers keep getting the last value without waiting
+    failing[0] = True
+    value.refresh(timeout=2)
+    time.sleep(value.ttl_seconds)
+    start = time.perf_counter()
+    stale = value.get()
+    assert time.perf_counter() - start < 0.01 and stale["fetch"] >= 2
+    stats = value.stats()
+    assert stats["errors"] >= 1 and "unreachable" in stats["last_error"] and stats["stale_reads"] >= 1
+    calls_after_failure = len(calls)
+    for _ in range(20):
+        value.get()
+    assert len(calls) <= calls_after_failure + 1
+    value.stop()
+    print(f"OK {stats['fetches']} fetches, {stats['errors']} errors, {stats['stale_reads']} stale reads")
+
+
+def test_worker_stops_when_idle():
+    """Without readers the background worker exits; the next read restarts it"""
+    print("\nTesting idle shutdown...")
+    calls = []
+    value = LiveValue("metrics", slow_source(calls), ttl_seconds=0.1, idle_seconds=0.3)
+    value.refresh(timeout=2)
+    time.sleep(0.8)
+    assert value._worker is None
+    fetched = len(calls)
+    time.sleep(0.3)
+    assert len(calls) == fetched
+    value.get()
+    assert value._worker is not None
+    value.stop()
+    print(f"OK worker stopped after {fetched} fetches")
+
+
+def main():
+    print("=" * 50)
+    print("Live Metrics Tests")
+    print("=" * 50)
+    for test in [test_reads_never_wait_and_share_one_fetch, test_stale_while_revalidate_and_errors,
+                 test_worker_stops_when_idle]:
+        test()
+    print("=" * 50)
+    print("SUCCESS: All live metrics tests passed")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
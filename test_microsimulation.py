@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Microsimulation Tests
+Checks the person-level simulator aggregates to the SOURCE 1 table shapes
+"""
+
+import numpy as np
+
+import data_generators
+from microsimulation import run_microsimulation
+
+
+def test_table_shapes():
+    """Aggregated tables carry the generator schemas and record counts"""
+    print("Testing aggregated table shapes...")
+    result = run_microsimulation(n_people=200_000, chunk_size=50_000, workers=1)
+    np.random.seed(42)
+    reference = data_generators.get_all_data()
+    for name, df in result.tables.items():
+        assert len(df) == len(reference[name]), name
+        assert dict(df.dtypes.astype(str)) == dict(reference[name].dtypes.astype(str)), name
+    assert result.chunks == 4 and result.people_per_second > 0
+    for kwargs in [{"n_people": 0}, {"n_people": 10, "chunk_size": 0}]:
+        try:
+            run_microsimulation(workers=1, **kwargs)
+            raise AssertionError(f"accepted {kwargs}")
+        except ValueError:
+            pass
+    print(f"OK {len(result.tables)} tables, {result.people_per_second:,.0f} people/s")
+
+
+def test_multipliers_survive_aggregation():
+    """Teens and low-income groups come out with the higher risks they were given"""
+    print("\nTesting vulnerability multipliers...")
+    tables = run_microsimulation(n_people=400_000, workers=1).tables
+    age = tables['age_stratification']
+    at_four_hours = age[age['screen_time_hours'] == 4].set_index('age_group')['health_impact_score']
+    assert at_four_hours['13-17'] / at_four_hours['50+'] > 4
+
+    ses = tables['ses_inequality']
+    low = ses[ses['income_level'] == 'low']['health_impact_multiplier']
+    assert (low > 2.0).all()
+
+    epi = tables['global_epidemiology']
+    yearly = epi.groupby('year', observed=True)['depression_rate'].mean()
+    assert yearly.iloc[-1] > yearly.iloc[0]
+    print("OK age, SES and trend effects present")
+
+
+def test_deterministic_across_workers():
+    """Tables depend only on seed and chunk size, not on the pool"""
+    print("\nTesting determinism across workers...")
+    baseline = run_microsimulation(n_people=120_000, chunk_size=30_000, seed=9, workers=1).tables
+    for kwargs in [{'workers': 3, 'processes': False}, {'workers': 2, 'processes': True}]:
+        tables = run_microsimulation(n_people=120_000, chunk_size=30_000, seed=9, **kwargs).tables
+        for name in baseline:
+            assert baseline[name].equals(tables[name]), f"{name} differs with {kwargs}"
+    print("OK identical tables for 1, 2 and 3 workers")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("DIGITAL DETOX WEAVER: MICROSIMULATION TEST")
+    print("=" * 50)
+
+    for test in [test_table_shapes, test_multipliers_survive_aggregation, test_deterministic_across_workers]:
+        test()
+
+    print("\n" + "=" * 50)
+    print("SUCCESS All microsimulation tests passed!")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
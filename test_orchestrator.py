@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Orchestrator Tests
+Checks the async LLM streaming bridge and the workflow scheduler with a fake provider
+"""
+
+import asyncio
+import contextlib
+import io
+import itertools
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / ".kiro"))
+
+from agents.llm_router import LLMRouter
+from workflows.step_cache import StepCache
+
+CHUNK_DELAY = 0.1
+
+
+def fake_generate(prompt, system="", temperature=0.7, max_tokens=4096, streaming=True, priority=None, prefix="",
+                  served=None):
+    """Provider stand-in: three chunks, each after a blocking network-like wait"""
+    chunks = []
+    for i in range(3):
+        time.sleep(CHUNK_DELAY)
+        chunks.append(f"{prompt[:10]}-{i} ")
+        yield chunks[-1]
+    if served is not None:
+        served.update(provider="claude", chunks=chunks)
+
+
+def _fake_router():
+    router = LLMRouter()
+    router.generate = fake_generate
+    return router
+
+
+async def _collect(router, prompt):
+    return "".join([chunk async for chunk in router.agenerate(prompt)])
+
+
+def test_agenerate_overlaps():
+    """Two async streams overlap instead of running back-to-back"""
+    print("Testing async streaming bridge...")
+    router = _fake_router()
+
+    async def run():
+        start = time.perf_counter()
+        results = await asyncio.gather(_collect(router, "first"), _collect(router, "second"))
+        return results, time.perf_counter() - start
+
+    results, wall = asyncio.run(run())
+    assert results == ["first-0 first-1 first-2 ", "second-0 second-1 second-2 "]
+    assert wall < 1.5 * 3 * CHUNK_DELAY, f"streams ran serially ({wall:.2f}s)"
+    print(f"OK 2 streams in {wall:.2f}s (serial {2 * 3 * CHUNK_DELAY:.2f}s)")
+
+
+def test_agenerate_errors_and_early_exit():
+    """Provider errors surface in the caller; breaking out early is clean"""
+    print("\nTesting errors and early exit...")
+    router = LLMRouter()
+
+    def failing(*args, **kwargs):
+        yield "partial"
+        raise RuntimeError("boom")
+
+    router.generate = failing
+
+    async def consume():
+        return [chunk async for chunk in router.agenerate("x")]
+
+    try:
+        asyncio.run(consume())
+        raise AssertionError("error was swallowed")
+    except RuntimeError as e:
+        assert str(e) == "boom"
+
+    router.generate = fake_generate
+
+    async def first_chunk():
+        async for chunk in router.agenerate("early"):
+            return chunk
+
+    assert asyncio.run(first_chunk()) == "early-0 "
+    print("OK errors propagate, early exit stops the stream")
+
+
+def test_scheduler_dependencies_and_cap():
+    """Ready steps overlap up to the cap, dependants wait, and the critical path is reported"""
+    print("\nTesting workflow scheduler...")
+    from workflows.scheduler import WorkflowScheduler, WorkflowStep
+
+    running = []
+    peak = []
+
+    def step(seconds):
+        async def run():
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(seconds)
+            running.pop()
+        return run
+
+    steps = [
+        WorkflowStep("a", step(0.2), [], ["x"]),
+        WorkflowStep("b", step(0.1), [], ["y"]),
+        WorkflowStep("c", step(0.1), [], ["z"]),
+        WorkflowStep("d", step(0.2), ["x", "y"], ["w"]),
+        WorkflowStep("e", step(0.05), ["w", "z", "external.md"], []),
+    ]
+    report = asyncio.run(WorkflowScheduler(steps, max_concurrency=2).run())
+    assert max(peak) == 2
+    assert report.timings["d"][0] >= max(report.timings["a"][1], report.timings["b"][1])
+    assert report.timings["e"][0] >= report.timings["d"][1]
+    assert report.critical_path == ["a", "d", "e"]
+    assert report.wall_seconds < report.serial_seconds
+
+    cyclic = [WorkflowStep("p", step(0), ["q.md"], ["p.md"]), WorkflowStep("q", step(0), ["p.md"], ["q.md"])]
+    try:
+        WorkflowScheduler(cyclic)
+        raise AssertionError("cycle not detected")
+    except ValueError as e:
+        assert "cycle" in str(e)
+    print(f"OK critical path {' -> '.join(report.critical_path)}, saved {report.saved_seconds:.2f}s")
+
+
+def test_scheduler_failure_stops_dependants():
+    """A failing step raises and its dependants never start"""
+    print("\nTesting workflow failure...")
+    from workflows.scheduler import WorkflowScheduler, WorkflowStep
+
+    started = []
+
+    async def fail():
+        raise RuntimeError("step failed")
+
+    async def dependant():
+        started.append("after")
+
+    steps = [WorkflowStep("fail", fail, [], ["x"]), WorkflowStep("after", dependant, ["x"], [])]
+    try:
+        asyncio.run(WorkflowScheduler(steps).run())
+        raise AssertionError("failure was swallowed")
+    except RuntimeError as e:
+        assert str(e) == "step failed"
+    assert started == []
+    print("OK dependants skipped, error raised")
+
+
+def test_dashboard_workflow_graph():
+    """The full workflow runs as a graph, beats running its steps back-to-back and still echoes agent output"""
+    print("\nTesting dashboard workflow...")
+    import kiro_main
+
+    with tempfile.TemporaryDirectory() as tmp:
+        orchestrator = kiro_main.KiroOrchestrator(StepCache(Path(tmp) / "steps"))
+        orchestrator.llm_router = _fake_router()
+        orchestrator.output_dir = Path(tmp)
+        orchestrator.lineage_file = Path(tmp) / "data_lineage.md"
+        console = io.StringIO()
+        with contextlib.redirect_stdout(console):
+            asyncio.run(orchestrator.run_dashboard_workflow(max_concurrency=4))
+        for name in ["01_initialization.md", "03_analysis.md", "04_visualization_design.md",
+                     "05_health_insights.md", "06_policy_recommendations.md", "FINAL_REPORT.md", "data_lineage.md"]:
+            assert (Path(tmp) / name).exists(), name
+
+    report = orchestrator.workflow_report
+    assert len(report.timings) == 10
+    assert report.critical_path[-1] == "10_finalization"
+    assert "08_report" in report.critical_path
+    assert report.saved_seconds > 2 * 3 * CHUNK_DELAY
+    # Concurrent steps print their responses whole, never interleaved chunk by chunk
+    for step in ["01_initialization", "03_analysis", "07_policy_recommendations", "08_report"]:
+        assert f"── {step} ──" in console.getvalue(), step
+    assert all(line.count("-0 ") <= 1 for line in console.getvalue().splitlines())
+    print(f"OK {report.wall_seconds:.2f}s wall vs {report.serial_seconds:.2f}s serial")
+
+
+def test_step_cache_resume_and_force():
+    """A failed run resumes from cached steps; unchanged reruns skip the LLM; --force regenerates"""
+    print("\nTesting step cache...")
+    import kiro_main
+    from kiro_config.agent_config import agent_config
+
+    calls = []
+    serial = itertools.count()
+
+    def counting_generate(prompt, system="", temperature=0.7, max_tokens=4096, streaming=True, priority=None, prefix="",
+                          served=None):
+        calls.append(system)
+        if fail_policy and system == agent_config.POLICY_ADVISOR_SYSTEM_PROMPT:
+            raise RuntimeError("provider down")
+        text = f"{len(prompt)}-{next(serial)} "
+        yield text
+        served.update(provider="claude", chunks=[text])
+
+    def run(force=()):
+        orchestrator = kiro_main.KiroOrchestrator(StepCache(Path(tmp) / "steps", force=force))
+        orchestrator.llm_router = LLMRouter()
+        orchestrator.llm_router.generate = counting_generate
+        orchestrator.output_dir = Path(tmp)
+        orchestrator.lineage_file = Path(tmp) / "data_lineage.md"
+        calls.clear()
+        asyncio.run(orchestrator.run_dashboard_workflow(max_concurrency=4))
+        return orchestrator
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fail_policy = True
+        try:
+            run()
+            raise AssertionError("policy failure was swallowed")
+        except RuntimeError:
+            pass
+
+        # Steps 1, 3, 4 and 5 finished before the failure and are reused
+        fail_policy = False
+        orchestrator = run()
+        assert len(calls) == 2, calls
+        assert sorted(orchestrator.step_cache.hits) == ["01_initialization", "03_analysis",
+                                                        "04_visualization_design", "05_health_insights"]
+
+        orchestrator = run()
+        assert calls == []
+        assert len(orchestrator.token_usage) == 6
+        assert all(usage["cached"] for usage in orchestrator.token_usage.values())
+        report = (Path(tmp) / "FINAL_REPORT.md").read_text()
+
+        # Forcing the policy step regenerates it and, with new text, the report built on it
+        orchestrator = run(force={"07_policy_recommendations"})
+        assert len(calls) == 2
+        assert (Path(tmp) / "FINAL_REPORT.md").read_text() != report
+
+    assert kiro_main.resolve_steps(["8", "03_analysis"], ["03_analysis", "08_report"]) == ["08_report", "03_analysis"]
+    try:
+        kiro_main.resolve_steps(["99"], ["03_analysis"])
+        raise AssertionError("unknown step accepted")
+    except ValueError:
+        pass
+    print("OK resumed after failure, skipped unchanged steps, honoured --force")
+
+
+def test_step_cache_stores_complete_answers_only():
+    """Partial answers finished by the fallback and provider errors are not cached; fallback answers are keyed by it"""
+    print("\nTesting step cache with failing providers...")
+    import kiro_main
+    from agents.circuit_breaker import CircuitBreakers
+
+    def cut_off(*args):
+        yield "half an ans"
+        raise ConnectionError("stream reset")
+
+    def down(*args):
+        raise ValueError("bad request")
+        yield
+
+    def answer(*args):
+        yield "full answer"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        orchestrator = kiro_main.KiroOrchestrator(StepCache(Path(tmp) / "steps"))
+        router = orchestrator.llm_router = LLMRouter(breakers=CircuitBreakers())
+        router.primary_provider, router.fallback_provider = "claude", "gemini"
+        router.routing, router.hedge, router.response_cache = "fixed", False, None
+
+        def run(primary, fallback):
+            router._claude_generate, router._gemini_generate = primary, fallback
+            return asyncio.run(orchestrator._generate("03_analysis", "prompt", "system", 0.7))
+
+        assert run(cut_off, answer) == "half an ansfull answer"
+        assert run(cut_off, down).startswith("half an ansError: Both primary and fallback providers failed")
+        assert run(down, down).startswith("Error:")
+        assert not list((Path(tmp) / "steps").glob("*.json"))
+
+        assert run(down, answer) == "full answer"
+        (entry,) = (Path(tmp) / "steps").glob("*.json")
+        assert entry.read_text().count('"model": "gemini/') == 1
+    print("OK only complete answers cached, under the provider that served them")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("DIGITAL DETOX WEAVER: ORCHESTRATOR TEST")
+    print("=" * 50)
+
+    for test in [test_agenerate_overlaps, test_agenerate_errors_and_early_exit, test_scheduler_dependencies_and_cap,
+                 test_scheduler_failure_stops_dependants, test_dashboard_workflow_graph,
+                 test_step_cache_resume_and_force, test_step_cache_stores_complete_answers_only]:
+        test()
+
+    print("\n" + "=" * 50)
+    print("SUCCESS All orchestrator tests passed!")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Policy Simulation Tests
+Checks the Monte Carlo policy simulator's intervals, ranking and Pareto frontier
+"""
+
+import numpy as np
+
+from data_generators import generate_policy_interventions
+from policy_simulation import simulate_policies
+
+
+def _policy_data():
+    return generate_policy_interventions(rng=np.random.default_rng(0))
+
+
+def test_intervals_and_ranking():
+    """Intervals are ordered, ranks follow the median and win rates sum to one"""
+    print("Testing intervals and ranking...")
+    result = simulate_policies(_policy_data())
+    ranking = result.ranking
+    assert result.n_scenarios >= 1_000_000
+    assert len(ranking) == 8 + 28 + 56
+    for metric in ['priority', 'effectiveness', 'cost']:
+        assert (ranking[f'{metric}_low'] <= ranking[f'{metric}_median']).all()
+        assert (ranking[f'{metric}_median'] <= ranking[f'{metric}_high']).all()
+    assert ranking['priority_median'].is_monotonic_decreasing
+    assert abs(ranking['probability_best'].sum() - 1.0) < 1e-9
+    print(f"OK {result.n_scenarios:,} scenarios in {result.seconds:.2f}s")
+
+
+def test_single_interventions_track_table():
+    """Single-intervention medians stay close to the deterministic Tab 8 score"""
+    print("\nTesting single interventions...")
+    policy = _policy_data()
+    singles = simulate_policies(policy).ranking.set_index('package')
+    deterministic = policy['effectiveness_score'] * policy['political_feasibility'] / policy['implementation_difficulty']
+    for name, score in zip(policy['intervention'], deterministic):
+        row = singles.loc[name]
+        assert row['priority_low'] < score < row['priority_high'], name
+    print("OK table scores fall inside the simulated intervals")
+
+
+def test_pareto_frontier():
+    """No package beats a frontier package on both cost and effectiveness"""
+    print("\nTesting Pareto frontier...")
+    result = simulate_policies(_policy_data(), n_draws=2_000)
+    ranking = result.ranking
+    for _, row in result.frontier.iterrows():
+        dominated_by = ranking[(ranking['cost_median'] <= row['cost_median'])
+                               & (ranking['effectiveness_median'] > row['effectiveness_median'])]
+        assert dominated_by.empty, row['package']
+    assert result.frontier['effectiveness_median'].is_monotonic_increasing
+    print(f"OK {len(result.frontier)} non-dominated packages")
+
+
+def test_reproducible():
+    """The same seed gives the same ranking"""
+    print("\nTesting reproducibility...")
+    policy = _policy_data()
+    first = simulate_policies(policy, n_draws=3_000, seed=1).ranking
+    second = simulate_policies(policy, n_draws=3_000, seed=1).ranking
+    assert first.equals(second)
+    print("OK seeded simulation is deterministic")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("DIGITAL DETOX WEAVER: POLICY SIMULATION TEST")
+    print("=" * 50)
+
+    for test in [test_intervals_and_ranking, test_single_interventions_track_table, test_pareto_frontier, test_reproducible]:
+        test()
+
+    print("\n" + "=" * 50)
+    print("SUCCESS All policy simulation tests passed!")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Prompt Budget Tests
+Checks extractive compression of upstream outputs and the per-step prompt budgets
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / ".kiro"))
+
+from agents.tokens import estimate_tokens
+from prompts.analysis_prompts import AnalysisPrompts
+from prompts.budget import STEP_BUDGETS, compress_markdown, fit_sections
+
+OUTPUTS = Path(__file__).parent / "outputs"
+
+
+def test_compress_markdown():
+    """Long outputs shrink to the budget, keep headings and numbers, and compress the same way every time"""
+    print("Testing extractive compression...")
+    analysis = (OUTPUTS / "03_analysis.md").read_text(errors="replace")
+    assert compress_markdown(analysis, 100_000) == analysis
+
+    for budget in [200, 800, 1500]:
+        summary = compress_markdown(analysis, budget)
+        assert estimate_tokens(summary) <= budget
+        assert summary == compress_markdown(analysis, budget)
+        assert summary.endswith(f"[... extractive summary of ~{estimate_tokens(analysis)} tokens]")
+    assert "### 1. Screen Time Trends (2010-2024)" in summary
+    assert "95% CI: 118-132% increase" in summary
+
+    # Kept lines stay in document order
+    position = 0
+    for line in summary.splitlines()[:-1]:
+        position = analysis.index(line.split(". ")[0], position)
+
+    assert compress_markdown("x" * 4000, 50).startswith("x" * 100)
+    print(f"OK ~{estimate_tokens(analysis)} -> ~{estimate_tokens(summary)} tokens")
+
+
+def test_fit_sections_and_step_budgets():
+    """Short sections pass through; every prompt stays within its step's budget"""
+    print("\nTesting step budgets...")
+    analysis = (OUTPUTS / "03_analysis.md").read_text(errors="replace")
+    health = (OUTPUTS / "05_health_insights.md").read_text(errors="replace")
+    policy = (OUTPUTS / "06_policy_recommendations.md").read_text(errors="replace")
+
+    fitted = fit_sections({"short": "Screen time doubled.", "long": health}, 1000)
+    assert fitted["short"] == "Screen time doubled."
+    assert estimate_tokens(fitted["long"]) <= 1000 - estimate_tokens("Screen time doubled.")
+
+    prompts = {
+        "04_visualization_design": AnalysisPrompts.visualization_prompt(analysis),
+        "05_health_insights": AnalysisPrompts.health_insights_prompt(analysis),
+        "07_policy_recommendations": AnalysisPrompts.policy_prompt(health),
+        "08_report": AnalysisPrompts.report_prompt(analysis, health, policy),
+    }
+    for step, prompt in prompts.items():
+        assert estimate_tokens(prompt) <= STEP_BUDGETS[step], step
+    unbudgeted = AnalysisPrompts._report_template(analysis, health, policy)
+    assert estimate_tokens(unbudgeted) > STEP_BUDGETS["08_report"]
+    assert "STEP 8: GENERATE COMPREHENSIVE FINAL REPORT" in prompts["08_report"]
+
+    # Inputs that fit are embedded verbatim
+    assert analysis in AnalysisPrompts.visualization_prompt(analysis, max_tokens=10_000)
+    print(f"OK report prompt ~{estimate_tokens(unbudgeted)} -> ~{estimate_tokens(prompts['08_report'])} tokens")
+
+
+def main():
+    print("=" * 50)
+    print("Prompt Budget Tests")
+    print("=" * 50)
+    for test in [test_compress_markdown, test_fit_sections_and_step_budgets]:
+        test()
+    print("=" * 50)
+    print("SUCCESS: All prompt budget tests passed")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
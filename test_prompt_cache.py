@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Prompt Prefix Cache Tests
+Checks that the shared prompt prefix reaches Claude as a cacheable system block and that cache hits are counted
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).parent / ".kiro"))
+
+from agents.circuit_breaker import CircuitBreakers
+from agents.latency import LatencyTracker
+from agents.llm_router import LLMRouter
+from agents.prompt_cache import PromptCacheStats, split_prefix
+from agents.rate_limiter import RateLimiters
+from prompts.analysis_prompts import AnalysisPrompts
+
+
+class FakeStream:
+    """``messages.stream`` context manager yielding one chunk and a final message with usage"""
+
+    def __init__(self, usage):
+        self.text_stream = iter(["ok"])
+        self.usage = usage
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def get_final_message(self):
+        return SimpleNamespace(usage=self.usage)
+
+
+class FakeMessages:
+    """Anthropic ``messages`` stand-in that caches system blocks marked with cache_control"""
+
+    def __init__(self):
+        self.requests = []
+        self.cached = set()
+
+    def stream(self, **kwargs):
+        self.requests.append(kwargs)
+        system = kwargs["system"]
+        cacheable = "".join(block["text"] for block in system if "cache_control" in block) if isinstance(system, list) else ""
+        tokens = len(cacheable) // 4
+        hit = cacheable in self.cached
+        self.cached.add(cacheable)
+        uncached = kwargs["messages"][0]["content"] + ("" if cacheable else str(system))
+        return FakeStream(SimpleNamespace(input_tokens=len(uncached) // 4,
+                                          cache_read_input_tokens=tokens if hit else 0,
+                                          cache_creation_input_tokens=0 if hit else tokens))
+
+
+def make_router(caching=True):
+    messages = FakeMessages()
+    router = LLMRouter(breakers=CircuitBreakers(), limiters=RateLimiters())
+    router.primary_provider, router.fallback_provider = "claude", "claude"
+    router.response_cache = None
+    router.routing, router.hedge = "fixed", False
+    router.latency = LatencyTracker()
+    router.retry_attempts = 0
+    router.prompt_caching = caching
+    router.prompt_cache = PromptCacheStats()
+    router.claude_client = SimpleNamespace(messages=messages)
+    return router, messages
+
+
+def test_split_prefix():
+    """The static context moves from the prompt to the front of the system prompt"""
+    print("Testing prefix split...")
+    context = AnalysisPrompts.data_sources_context()
+    prompt = AnalysisPrompts.visualization_prompt("analysis text")
+    user, system = split_prefix(prompt, "You are a visualization expert.", context)
+    assert context.strip() in system and system.endswith("You are a visualization expert.")
+    assert "STEP 4: DESIGN VISUALIZATIONS" in user and context.strip() not in user
+    assert split_prefix("unrelated prompt", "system", context) == ("unrelated prompt", "system")
+    print("OK prefix moved into the system block")
+
+
+def test_claude_reads_prefix_from_cache():
+    """Repeated steps of an agent send an identical cached system block; hits are counted"""
+    print("\nTesting Claude prompt caching...")
+    context = AnalysisPrompts.data_sources_context()
+    router, messages = make_router()
+    system = "You are a public health researcher."
+    for analysis in ["first analysis", "second analysis", "third analysis"]:
+        prompt = AnalysisPrompts.health_insights_prompt(analysis)
+        assert "".join(router.generate(prompt, system, prefix=context)) == "ok"
+
+    blocks = [request["system"] for request in messages.requests]
+    assert all(block == blocks[0] for block in blocks)
+    assert blocks[0][0]["cache_control"] == {"type": "ephemeral"}
+    assert all(context.strip() not in request["messages"][0]["content"] for request in messages.requests)
+    stats = router.prompt_cache.stats()["claude"]
+    assert stats["requests"] == 3 and stats["prefix_reuses"] == 2
+    assert stats["cache_read_tokens"] == 2 * stats["cache_write_tokens"] > 0
+    assert 0 < stats["cached_token_share"] < 1
+
+    # Disabled: plain string system prompt, nothing cached by the provider
+    router, messages = make_router(caching=False)
+    list(router.generate(AnalysisPrompts.policy_prompt("findings"), system, prefix=context))
+    assert isinstance(messages.requests[0]["system"], str)
+    assert router.prompt_cache.stats()["claude"]["cache_read_tokens"] == 0
+    print(f"OK {stats['prefix_reuses']}/{stats['requests']} prefix reuses, "
+          f"{stats['cached_token_share']:.0%} of prompt tokens from cache")
+
+
+def main():
+    print("=" * 50)
+    print("Prompt Prefix Cache Tests")
+    print("=" * 50)
+    for test in [test_split_prefix, test_claude_reads_prefix_from_cache]:
+        test()
+    print("=" * 50)
+    print("SUCCESS: All prompt cache tests passed")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: RAG Fetch Tests
+Checks the single-call combined fetch, its schema validation and the concurrent fallback
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).parent / ".kiro"))
+
+import rag_integration
+from agents.circuit_breaker import CircuitBreakers
+from live_metrics import LiveValue
+from rag_integration import RAGDataFetcher, validate_combined
+
+CALL_DELAY = 0.1
+
+COMBINED = {
+    "health_metrics": {"screen_time_hours": 7.1, "depression_rate": 0.21, "anxiety_rate": 0.3,
+                       "sleep_disorders": 0.24, "detox_findings": "One week off social media lifts mood."},
+    "trending_topics": ["Dopamine detox", "Phone-free schools", "AI companions", "Sleep hygiene", "Doomscrolling"],
+    "policy_updates": [{"policy": "Under-16 social media ban", "country": "Australia",
+                        "description": "Platforms must verify age."}],
+}
+METRICS = {"screen_time_hours": 7.0, "depression_rate": 0.2, "anxiety_rate": 0.3, "sleep_disorders": 0.25}
+PLAIN = f"Latest figures:\n```json\n{json.dumps(METRICS)}\n```\nSources: WHO, CDC."
+
+
+class FakeModel:
+    """Gemini stand-in: JSON-mode calls get ``combined``, plain calls get text; streamed in 16-character chunks"""
+
+    def __init__(self, combined):
+        self.combined = combined
+        self.calls = []
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        with self.lock:
+            self.calls.append(generation_config)
+            self.prompts.append(prompt)
+        time.sleep(CALL_DELAY)
+        text = self.combined if generation_config else PLAIN
+        if stream:
+            return [SimpleNamespace(text=text[i:i + 16]) for i in range(0, len(text), 16)]
+        return SimpleNamespace(text=text)
+
+
+def fetcher_with(combined):
+    fetcher = RAGDataFetcher()
+    fetcher.model = FakeModel(combined)
+    fetcher.combined = True
+    fetcher.retriever = None
+    return fetcher
+
+
+def test_combined_fetch():
+    """One call fills all three feeds in the shapes the dashboard reads"""
+    print("Testing combined fetch...")
+    original = rag_integration.circuit_breakers
+    rag_integration.circuit_breakers = CircuitBreakers()
+    try:
+        fetcher = fetcher_with(json.dumps(COMBINED))
+        start = time.perf_counter()
+        bundle = fetcher.fetch_all()
+        wall = time.perf_counter() - start
+    finally:
+        rag_integration.circuit_breakers = original
+    assert fetcher.calls == 1 and len(fetcher.model.calls) == 1
+    assert fetcher.model.calls[0] == {"response_mime_type": "application/json"}
+    metrics = bundle["health_metrics"]
+    assert metrics["screen_time_hours"] == 7.1 and metrics["status"] == "live"
+    assert bundle["trending_topics"][0] == "Dopamine detox"
+    assert bundle["policy_updates"]["updates"] == ["Under-16 social media ban (Australia): Platforms must verify age."]
+    print(f"OK 1 call in {wall * 1000:.0f} ms")
+
+
+def test_invalid_response_falls_back_to_concurrent_calls():
+    """A response that fails the schema is replaced by the three fetches, run concurrently"""
+    print("\nTesting schema validation and fallback...")
+    for broken in [{**COMBINED, "trending_topics": []},
+                   {**COMBINED, "health_metrics": {**COMBINED["health_metrics"], "anxiety_rate": "high"}},
+                   {**COMBINED, "policy_updates": [{"policy": "x"}]}]:
+        try:
+            validate_combined(broken)
+            raise AssertionError(f"accepted {broken}")
+        except ValueError:
+            pass
+    assert validate_combined(COMBINED) is COMBINED
+
+    original = rag_integration.circuit_breakers
+    rag_integration.circuit_breakers = CircuitBreakers()
+    try:
+        fetcher = fetcher_with("Here are the statistics you asked for: ...")
+        start = time.perf_counter()
+        bundle = fetcher.fetch_all()
+        wall = time.perf_counter() - start
+    finally:
+        rag_integration.circuit_breakers = original
+    assert fetcher.calls == 4
+    assert wall < 3 * CALL_DELAY
+    assert bundle["health_metrics"] == METRICS
+    assert bundle["trending_topics"][0] == "Latest figures:"
+    assert bundle["policy_updates"]["status"] == "live"
+    print(f"OK fell back to 3 concurrent calls ({wall * 1000:.0f} ms)")
+
+
+def test_getters_share_one_refresh():
+    """The three dashboard getters read one cached bundle from one call"""
+    print("\nTesting shared cache...")
+    original = rag_integration.live_rag_data, rag_integration.circuit_breakers
+    fetcher = fetcher_with(json.dumps(COMBINED))
+    rag_integration.live_rag_data = LiveValue("rag_data", fetcher.fetch_live, ttl_seconds=60)
+    rag_integration.circuit_breakers = CircuitBreakers()
+    try:
+        rag_integration.live_rag_data.refresh(timeout=2)
+        metrics = rag_integration.get_live_health_metrics()
+        topics = rag_integration.get_trending_topics()
+        policy = rag_integration.get_policy_updates()
+        rag_integration.live_rag_data.stop()
+    finally:
+        rag_integration.live_rag_data, rag_integration.circuit_breakers = original
+    assert metrics["status"] == "live" and len(topics) == 5 and policy["status"] == "live"
+    assert fetcher.calls == 1
+    print("OK 3 feeds from 1 Gemini call")
+
+
+def test_failed_refresh_keeps_live_data():
+    """An outage after a good refresh counts as a failed fetch; the live bundle stays cached"""
+    print("\nTesting failed refresh...")
+    fetcher = fetcher_with(json.dumps(COMBINED))
+    live = LiveValue("rag_data", fetcher.fetch_live, ttl_seconds=60)
+    original = rag_integration.circuit_breakers
+    # Opens on the first failure, so the retries fail fast
+    rag_integration.circuit_breakers = CircuitBreakers(failure_threshold=1)
+    try:
+        assert live.refresh(timeout=2)["health_metrics"]["status"] == "live"
+
+        def outage(prompt, **kwargs):
+            raise ConnectionError("network down")
+        fetcher.model.generate_content = outage
+        assert fetcher.fetch_all()["health_metrics"]["status"] == "fallback_active"
+        try:
+            fetcher.fetch_live()
+            raise AssertionError("fallback bundle accepted")
+        except rag_integration.RAGFetchError:
+            pass
+        bundle = live.refresh(timeout=2)
+        stats = live.stats()
+        live.stop()
+    finally:
+        rag_integration.circuit_breakers = original
+    assert bundle["health_metrics"]["status"] == "live"
+    assert stats["errors"] == 1 and "fell back" in stats["last_error"]
+    print(f"OK kept the live bundle ({stats['last_error']})")
+
+
+def test_rejected_responses_keep_live_data():
+    """Invalid JSON from the combined call and the separate health call is a failed fetch, not live data"""
+    print("\nTesting rejected responses...")
+    fetcher = fetcher_with(json.dumps(COMBINED))
+    live = LiveValue("rag_data", fetcher.fetch_live, ttl_seconds=60)
+    original = rag_integration.circuit_breakers
+    rag_integration.circuit_breakers = CircuitBreakers()
+    try:
+        assert live.refresh(timeout=2)["health_metrics"]["status"] == "live"
+
+        def prose(prompt, stream=False, **kwargs):
+            text = "Figures are not available today {sorry}."
+            return [SimpleNamespace(text=text)] if stream else SimpleNamespace(text=text)
+        fetcher.model.generate_content = prose
+        metrics = fetcher.fetch_all()["health_metrics"]
+        assert metrics["status"] == "fallback_active" and "rejected" in metrics["error_reason"]
+        try:
+            fetcher.fetch_live()
+            raise AssertionError("rejected health response accepted")
+        except rag_integration.RAGFetchError:
+            pass
+        bundle = live.refresh(timeout=2)
+        live.stop()
+    finally:
+        rag_integration.circuit_breakers = original
+    assert bundle["health_metrics"]["screen_time_hours"] == 7.1
+    print(f"OK kept the live bundle ({metrics['error_reason']})")
+
+
+def main():
+    print("=" * 50)
+    print("RAG Fetch Tests")
+    print("=" * 50)
+    for test in [test_combined_fetch, test_invalid_response_falls_back_to_concurrent_calls,
+                 test_getters_share_one_refresh, test_failed_refresh_keeps_live_data,
+                 test_rejected_responses_keep_live_data]:
+        test()
+    print("=" * 50)
+    print("SUCCESS: All RAG fetch tests passed")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Rate Limiter Tests
+Checks the stream cap, priority admission, token buckets and the router's use of them
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / ".kiro"))
+
+from agents.circuit_breaker import CircuitBreakers
+from agents.latency import LatencyTracker
+from agents.llm_router import LLMRouter
+from agents.rate_limiter import BATCH, INTERACTIVE, LimiterTimeout, ProviderLimiter, RateLimiters
+
+
+def test_priority_admission_and_timeout():
+    """With one slot, queued interactive requests go before earlier batch ones; timeouts leave the queue"""
+    print("Testing priority admission...")
+    limiter = ProviderLimiter("claude", max_concurrent=1)
+    holder = limiter.acquire()
+    order = []
+
+    def request(name, priority):
+        with limiter.acquire(priority=priority):
+            order.append(name)
+
+    threads = []
+    for name, priority in [("batch-1", BATCH), ("batch-2", BATCH), ("interactive", INTERACTIVE)]:
+        threads.append(threading.Thread(target=request, args=(name, priority)))
+        threads[-1].start()
+        time.sleep(0.02)
+    assert limiter.queue_depth == 3
+
+    try:
+        limiter.acquire(timeout=0.05)
+        raise AssertionError("acquire should have timed out")
+    except LimiterTimeout:
+        pass
+    assert limiter.queue_depth == 3
+
+    holder.release()
+    for thread in threads:
+        thread.join()
+    assert order == ["interactive", "batch-1", "batch-2"]
+    stats = limiter.stats()
+    assert stats["max_queue_depth"] == 4 and stats["admitted"] == 4 and stats["in_flight"] == 0
+    assert stats["wait_mean_batch"] > stats["wait_mean_interactive"]
+    print(f"OK admission order {order}")
+
+
+def test_token_bucket_throttles_and_refunds():
+    """TPM spending blocks until refill; overestimates are refunded on release"""
+    print("\nTesting tokens-per-minute bucket...")
+    limiter = ProviderLimiter("gemini", tpm=6000)  # 100 tokens/s
+    with limiter.acquire(tokens=6000) as permit:
+        permit.actual_tokens = 6000
+    start = time.perf_counter()
+    limiter.acquire(tokens=20).release()
+    waited = time.perf_counter() - start
+    assert 0.1 < waited < 0.5, waited
+
+    limiter = ProviderLimiter("gemini", tpm=6000)
+    with limiter.acquire(tokens=6000) as permit:
+        permit.actual_tokens = 100
+    start = time.perf_counter()
+    limiter.acquire(tokens=20).release()
+    assert time.perf_counter() - start < 0.05
+
+    requests = ProviderLimiter("gemini", rpm=600)  # 10 requests/s after the burst
+    for _ in range(600):
+        requests.acquire().release()
+    start = time.perf_counter()
+    requests.acquire().release()
+    assert time.perf_counter() - start > 0.05
+    print(f"OK waited {waited:.2f}s for 20 tokens at 100 tokens/s")
+
+
+def test_router_caps_concurrent_streams():
+    """Concurrent router calls never exceed the provider's stream cap and report queue metrics"""
+    print("\nTesting router stream cap...")
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def slow_provider(prompt, system, temperature, max_tokens, streaming):
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.05)
+        yield "ok"
+        with lock:
+            running.pop()
+
+    limiters = RateLimiters()
+    limiters._limiters["claude"] = ProviderLimiter("claude", max_concurrent=2)
+    router = LLMRouter(breakers=CircuitBreakers(), limiters=limiters)
+    router.primary_provider, router.fallback_provider = "claude", "claude"
+    router.response_cache = None
+    router.routing, router.hedge = "fixed", False
+    router.latency = LatencyTracker()
+    router._claude_generate = slow_provider
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda p=priority: results.append("".join(router.generate("q", priority=p))))
+        for priority in [BATCH] * 5 + [INTERACTIVE]
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["ok"] * 6 and max(peak) == 2
+    stats = router.limiters.stats()["claude"]
+    assert stats["admitted"] == 6 and stats["max_queue_depth"] >= 3 and stats["wait_p95"] > 0
+    print(f"OK peak {max(peak)} streams, max queue depth {stats['max_queue_depth']}, wait p95 {stats['wait_p95']:.2f}s")
+
+
+def test_queue_timeout_releases_probe():
+    """A request that times out in the limiter queue gives back the half-open probe it claimed"""
+    print("\nTesting queue timeout in half-open state...")
+    limiters = RateLimiters()
+    limiters._limiters["claude"] = ProviderLimiter("claude", max_concurrent=1)
+    breakers = CircuitBreakers(failure_threshold=1, reset_seconds=0.2)
+    router = LLMRouter(breakers=breakers, limiters=limiters)
+    router.primary_provider, router.fallback_provider = "claude", "claude"
+    router.response_cache = None
+    router.routing, router.hedge, router.timeout = "fixed", False, 0.05
+    router._claude_generate = lambda *args: iter(["ok"])
+
+    breakers.get("claude").record_failure()
+    time.sleep(0.25)
+    busy = limiters.get("claude").acquire(1)
+    try:
+        assert "".join(router.generate("q")).startswith("Error:")
+    finally:
+        busy.release()
+    assert breakers.get("claude").allow()
+    print("OK probe released after LimiterTimeout")
+
+
+def main():
+    print("=" * 50)
+    print("Rate Limiter Tests")
+    print("=" * 50)
+    for test in [test_priority_admission_and_timeout, test_token_bucket_throttles_and_refunds,
+                 test_router_caps_concurrent_streams, test_queue_timeout_releases_probe]:
+        test()
+    print("=" * 50)
+    print("SUCCESS: All rate limiter tests passed")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: LLM Response Cache Tests
+Checks TTL expiry, LRU eviction and chunked replay through LLMRouter.generate
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / ".kiro"))
+
+from agents.circuit_breaker import CircuitBreakers
+from agents.latency import LatencyTracker
+from agents.llm_router import LLMRouter
+from agents.response_cache import ResponseCache
+
+
+def test_ttl_and_lru_eviction():
+    """Expired entries miss; the least recently used entry goes first"""
+    print("Testing TTL and LRU eviction...")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(Path(tmp) / "responses.sqlite", ttl_seconds=0.2, max_entries=2)
+        cache.put("a", ["alpha"])
+        cache.put("b", ["beta"])
+        assert cache.get("a") == ["alpha"]
+        cache.put("c", ["gamma"])  # evicts b, the least recently used
+        assert cache.get("b") is None
+        assert cache.get("a") == ["alpha"] and cache.get("c") == ["gamma"]
+
+        time.sleep(0.3)
+        assert cache.get("a") is None
+        stats = cache.stats()
+        assert stats["hits"] == 3 and stats["misses"] == 2
+        assert stats["entries"] == 1
+
+        sized = ResponseCache(Path(tmp) / "sized.sqlite", max_bytes=100)
+        for i in range(5):
+            sized.put(str(i), ["x" * 30])
+        assert sized.stats()["bytes"] <= 100
+        assert sized.get("4") is not None and sized.get("0") is None
+    print(f"OK {stats}")
+
+
+def test_router_replays_cached_stream():
+    """A repeated request replays the provider's chunks without calling it; errors are not cached"""
+    print("\nTesting router replay...")
+    calls = []
+
+    def provider(prompt, system, temperature, max_tokens, streaming):
+        calls.append(prompt)
+        if prompt == "fail":
+            raise RuntimeError("provider down")
+        yield from ["Screen ", "time ", f"{temperature}"]
+
+    def fallback(*args):
+        raise RuntimeError("fallback down")
+        yield
+
+    with tempfile.TemporaryDirectory() as tmp:
+        router = LLMRouter()
+        router.primary_provider = "claude"
+        router._claude_generate = provider
+        router._gemini_generate = fallback
+        router.response_cache = ResponseCache(Path(tmp) / "responses.sqlite")
+        router.breakers = CircuitBreakers()
+        router.retry_attempts = 0
+
+        first = list(router.generate("prompt", "system", temperature=0.3))
+        second = list(router.generate("prompt", "system", temperature=0.3))
+        assert first == second == ["Screen ", "time ", "0.3"]
+        assert calls == ["prompt"]
+
+        # Any change in the request is a different entry
+        list(router.generate("prompt", "system", temperature=0.5))
+        assert len(calls) == 2
+
+        # Abandoned streams are not stored
+        stream = router.generate("partial", "system")
+        next(stream)
+        stream.close()
+        list(router.generate("partial", "system"))
+        assert calls.count("partial") == 2
+
+        for _ in range(2):
+            assert list(router.generate("fail"))[0].startswith("Error:")
+        assert calls.count("fail") == 2
+        stats = router.response_cache.stats()
+    print(f"OK {stats['hits']} hits, {stats['misses']} misses")
+
+
+def test_entries_keyed_by_serving_provider():
+    """A fallback's answer is stored under the fallback and not replayed while the primary is preferred"""
+    print("\nTesting provider-keyed entries...")
+    calls = []
+    down = {"claude": True}
+
+    def provider(name, ttft=0.0):
+        def generate(prompt, system, temperature, max_tokens, streaming):
+            calls.append(name)
+            time.sleep(ttft)
+            if down.get(name):
+                raise RuntimeError(f"{name} down")
+            yield f"{name} answer"
+        return generate
+
+    with tempfile.TemporaryDirectory() as tmp:
+        router = LLMRouter()
+        router.primary_provider, router.fallback_provider = "claude", "gemini"
+        router.routing, router.hedge = "fixed", False
+        router._claude_generate, router._gemini_generate = provider("claude"), provider("gemini")
+        router.response_cache = ResponseCache(Path(tmp) / "responses.sqlite")
+        router.breakers = CircuitBreakers(failure_threshold=2)
+        router.latency = LatencyTracker()
+        router.retry_attempts = 0
+
+        assert list(router.generate("q")) == ["gemini answer"]
+        # Claude is preferred again (its circuit is still closed): it is asked, not the cached Gemini answer
+        down["claude"] = False
+        assert list(router.generate("q")) == ["claude answer"]
+        assert list(router.generate("q")) == ["claude answer"]
+        assert calls == ["claude", "gemini", "claude"]
+
+        # While Claude's circuit is open Gemini goes first, and its stored answer is replayed
+        router.breakers.get("claude").record_failure()
+        router.breakers.get("claude").record_failure()
+        assert list(router.generate("q")) == ["gemini answer"]
+        assert calls == ["claude", "gemini", "claude"]
+
+        # A hedged request is stored under the provider that won the race
+        router.breakers = CircuitBreakers()
+        router.hedge, router.hedge_default_seconds = True, 0.05
+        router._claude_generate = provider("claude", ttft=0.5)
+        assert list(router.generate("hedged")) == ["gemini answer"]
+        key = ResponseCache.key(f"gemini/{router.model_name('gemini')}", "hedged", "", 0.7, 4096)
+        assert router.response_cache.get(key) == ["gemini answer"]
+    print("OK fallback and hedged answers keyed by the provider that served them")
+
+
+def main():
+    print("=" * 50)
+    print("LLM Response Cache Tests")
+    print("=" * 50)
+    for test in [test_ttl_and_lru_eviction, test_router_replays_cached_stream, test_entries_keyed_by_serving_provider]:
+        test()
+    print("=" * 50)
+    print("SUCCESS: All response cache tests passed")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
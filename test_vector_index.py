@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Digital Detox Weaver: Vector Index Tests
+Checks the hashing embedder, the memory-mapped float16 store, IVF recall against brute force and passage search
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent / ".kiro"))
+
+import numpy as np
+from retrieval import RetrievalIndex
+from vector_index import HashingEmbedder, IVFIndex, SemanticIndex, VectorStore, exact_search, get_embedder
+
+SLEEP_REPORT = """# Sleep Findings
+## Melatonin
+Blue light from screens suppresses melatonin by 23% in adolescents, delaying sleep onset.
+"""
+POLICY_REPORT = """# Policy
+## School phone bans
+School phone bans cut daily screen time by 1.2 hours with high political feasibility.
+"""
+
+
+def test_store_and_ivf_search():
+    """Batches go to a float16 memmap; IVF finds the brute-force neighbours, including vectors added after a build"""
+    print("Testing vector store and IVF search...")
+    rng = np.random.default_rng(0)
+    centres = rng.standard_normal((50, 32)).astype(np.float32)
+    vectors = centres[rng.integers(50, size=5_000)] + rng.standard_normal((5_000, 32)).astype(np.float32) * 0.1
+    with tempfile.TemporaryDirectory() as tmp:
+        store = VectorStore(Path(tmp), 32)
+        assert store.add(vectors[:3_000]) == range(0, 3_000)
+        assert store.add(vectors[3_000:4_000]) == range(3_000, 4_000)
+        assert isinstance(store.vectors, np.memmap) and store.vectors.dtype == np.float16
+        assert store.path.stat().st_size == 4_000 * 32 * 2
+        index = IVFIndex(store)
+        index.build()
+        assert len(index.centroids) == 63 and index.list_ptr[-1] == 4_000
+
+        # Searched exactly until the next build
+        store.add(vectors[4_000:])
+        queries = vectors[rng.choice(5_000, 50, replace=False)]
+        _, truth = exact_search(store.vectors, queries, 10)
+        scores, found = IVFIndex(store).search(queries, 10, nprobe=8)
+        recall = np.mean([len(set(f) & set(t)) / 10 for f, t in zip(found, truth)])
+        assert recall > 0.9
+        assert np.all(np.diff(scores, axis=1) <= 0)
+        assert any(i >= 4_000 for row in found for i in row)
+
+        # Too few vectors for k: rows are padded
+        small = VectorStore(Path(tmp) / "small", 32)
+        small.add(vectors[:3])
+        scores, found = IVFIndex(small).search(vectors[:2], 5)
+        assert list(found[0][3:]) == [-1, -1] and np.isneginf(scores[0][3:]).all()
+    print(f"OK recall@10 {recall:.2f} against brute force")
+
+
+def test_mismatched_ivf_files_ignored():
+    """IVF files from different builds are not loaded; search falls back to the exact scan"""
+    print("\nTesting interrupted IVF build...")
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((500, 16)).astype(np.float32)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = VectorStore(Path(tmp), 16)
+        store.add(vectors[:400])
+        IVFIndex(store).build()
+        assert IVFIndex(store).indexed == 400
+        assert not list(Path(tmp).glob(".ivf*"))
+
+        # The grouped vectors of a newer build next to the older lists
+        grouped = (Path(tmp) / "ivf_vectors.f16").read_bytes()
+        store.add(vectors[400:])
+        IVFIndex(store).build()
+        (Path(tmp) / "ivf_vectors.f16").write_bytes(grouped)
+        stale = IVFIndex(store)
+        assert stale.indexed == 0 and stale.centroids is None
+        _, truth = exact_search(store.vectors, vectors[:5], 3)
+        assert np.array_equal(stale.search(vectors[:5], 3)[1], truth)
+    print("OK mismatched files rejected, exact search used")
+
+
+def test_semantic_passage_search():
+    """Hashing embeddings are deterministic and find the passage about a query; unchanged sources are not re-embedded"""
+    print("\nTesting semantic passage search...")
+    embedder = get_embedder("hashing")
+    first, second = embedder.embed(["screens delay sleep"]), HashingEmbedder().embed(["screens delay sleep"])
+    assert np.array_equal(first, second) and abs(np.linalg.norm(first) - 1) < 1e-5
+    assert not embedder.embed([""]).any()
+    with tempfile.TemporaryDirectory() as tmp:
+        outputs = Path(tmp) / "outputs"
+        outputs.mkdir()
+        (outputs / "05_health_insights.md").write_text(SLEEP_REPORT)
+        (outputs / "06_policy_recommendations.md").write_text(POLICY_REPORT)
+        semantic = SemanticIndex(RetrievalIndex(Path(tmp) / "index", outputs), Path(tmp) / "vectors", embedder)
+        assert semantic.update() and not semantic.update()
+        assert semantic.search("melatonin and screens")[0][1].heading == "Melatonin"
+        assert semantic.search("phone bans in schools")[0][1].source == "06_policy_recommendations.md"
+        assert len(semantic.store) == len(semantic.retrieval.passages)
+
+        reloaded = SemanticIndex(RetrievalIndex(Path(tmp) / "index", outputs), Path(tmp) / "vectors", embedder)
+        assert not reloaded.update()
+        os.remove(outputs / "06_policy_recommendations.md")
+        assert reloaded.update()
+        assert all(p.source != "06_policy_recommendations.md" for _, p in reloaded.search("phone bans in schools"))
+    print("OK passages found by embedding similarity")
+
+
+def main():
+    print("=" * 50)
+    print("Vector Index Tests")
+    print("=" * 50)
+    for test in [test_store_and_ivf_search, test_mismatched_ivf_files_ignored, test_semantic_passage_search]:
+        test()
+    print("=" * 50)
+    print("SUCCESS: All vector index tests passed")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
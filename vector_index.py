@@ -0,0 +1,364 @@
+"""
+Digital Detox Weaver: Semantic Vector Index
+Embeddings of the report passages and SOURCE 1 tables with approximate nearest-neighbour search
+
+Complements the lexical BM25 index in retrieval.py:
+
+- embedders are pluggable: ``HashingEmbedder`` is a deterministic, offline
+  stand-in (signed feature hashing of words, word pairs and character
+  trigrams); ``SentenceTransformerEmbedder`` uses a small local model when
+  sentence-transformers is installed. EMBEDDING_BACKEND picks one.
+- ``VectorStore`` keeps unit-length float16 vectors in an append-only file that
+  readers memory-map, so a million 128-d vectors take 256 MB of page cache
+  and no heap
+- ``IVFIndex`` clusters the vectors with spherical k-means and stores them
+  grouped by cluster, so a query scores its ``nprobe`` nearest clusters as
+  contiguous slices of the mapped file. Vectors added after the last
+  ``build`` are searched exactly until the next one.
+
+``SemanticIndex`` ties them to a ``RetrievalIndex``: it re-embeds the passages
+whenever the retrieval index changes and answers queries with passages.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import CACHE_DIR
+from retrieval import Passage, RetrievalIndex, tokenize
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_DIM = 256
+# Rows per matrix product when scoring or assigning many vectors at once
+BATCH_ROWS = 65_536
+KMEANS_ITERATIONS = 10
+# Training points per IVF list
+TRAIN_POINTS_PER_LIST = 40
+DEFAULT_NPROBE = 16
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class HashingEmbedder:
+    """
+    Deterministic bag-of-features embedding (no model, no network)
+
+    Words, adjacent word pairs and character trigrams are hashed with CRC32
+    into ``dim`` signed buckets; texts sharing vocabulary or word stems land
+    close together. Good enough for offline tests and as a baseline.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    @staticmethod
+    def _features(text: str) -> List[Tuple[str, float]]:
+        words = tokenize(text)
+        features = [(f"w:{word}", 1.0) for word in words]
+        features += [(f"b:{a} {b}", 0.5) for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f"<{word}>"
+            features += [(f"c:{padded[i:i + 3]}", 0.25) for i in range(len(padded) - 2)]
+        return features
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), dim) float32, rows of unit length (all-zero for texts without tokens)"""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            if not features:
+                continue
+            hashes = np.array([zlib.crc32(feature.encode("utf-8")) for feature, _ in features], dtype=np.uint64)
+            weights = np.array([weight for _, weight in features], dtype=np.float32)
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(vectors[row], (hashes % self.dim).astype(np.int64), signs * weights)
+        return _normalize(vectors)
+
+
+class SentenceTransformerEmbedder:
+    """Small local sentence-transformers model (optional dependency)"""
+
+    name = "sentence-transformers"
+
+    def __init__(self, model: str = "all-MiniLM-L6-v2"):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError("EMBEDDING_BACKEND=sentence-transformers needs `pip install sentence-transformers`") from e
+        self.model = SentenceTransformer(model)
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        return self.model.encode(list(texts), normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+
+EMBEDDERS = {
+    HashingEmbedder.name: HashingEmbedder,
+    SentenceTransformerEmbedder.name: SentenceTransformerEmbedder,
+}
+
+
+def get_embedder(name: Optional[str] = None):
+    """Embedder by name (default: EMBEDDING_BACKEND, else hashing)"""
+    name = name or os.getenv("EMBEDDING_BACKEND", HashingEmbedder.name)
+    if name not in EMBEDDERS:
+        raise ValueError(f"Unknown embedding backend: {name} (expected one of {list(EMBEDDERS)})")
+    return EMBEDDERS[name]()
+
+
+def exact_search(vectors: np.ndarray, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Brute-force top ``k`` by inner product: (scores, row ids), each (len(queries), k), best first"""
+    queries = np.asarray(queries, dtype=np.float32)
+    k = min(k, len(vectors))
+    best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+    best_ids = np.zeros((len(queries), k), dtype=np.int64)
+    for start in range(0, len(vectors), BATCH_ROWS):
+        block = np.asarray(vectors[start:start + BATCH_ROWS], dtype=np.float32)
+        scores = np.concatenate([best_scores, queries @ block.T], axis=1)
+        ids = np.concatenate([best_ids, np.broadcast_to(np.arange(start, start + len(block)), (len(queries), len(block)))], axis=1)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(scores, top, axis=1)
+        best_ids = np.take_along_axis(ids, top, axis=1)
+    order = np.argsort(-best_scores, axis=1, kind="stable")
+    return np.take_along_axis(best_scores, order, axis=1), np.take_along_axis(best_ids, order, axis=1)
+
+
+class VectorStore:
+    """Append-only float16 vectors in a file that readers memory-map"""
+
+    def __init__(self, directory: Path, dim: int):
+        self.directory = Path(directory)
+        self.dim = dim
+        self.path = self.directory / "vectors.f16"
+        self._mapped: Optional[np.memmap] = None
+
+    def __len__(self) -> int:
+        if not self.path.exists():
+            return 0
+        return self.path.stat().st_size // (2 * self.dim)
+
+    def add(self, vectors: np.ndarray) -> range:
+        """Append a batch of vectors (normalized to unit length); returns their ids"""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        start = len(self)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            f.write(_normalize(vectors).astype(np.float16).tobytes())
+        self._mapped = None
+        return range(start, start + len(vectors))
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """All vectors, memory-mapped read-only"""
+        count = len(self)
+        if self._mapped is None or len(self._mapped) != count:
+            self._mapped = np.memmap(self.path, dtype=np.float16, mode="r", shape=(count, self.dim)) if count else \
+                np.zeros((0, self.dim), dtype=np.float16)
+        return self._mapped
+
+    def clear(self):
+        self._mapped = None
+        if self.path.exists():
+            self.path.unlink()
+
+
+class IVFIndex:
+    """Inverted-file index (spherical k-means lists) over a ``VectorStore``"""
+
+    def __init__(self, store: VectorStore):
+        self.store = store
+        self.directory = store.directory
+        self.centroids: Optional[np.ndarray] = None
+        self.list_ptr: Optional[np.ndarray] = None
+        self.ids: Optional[np.ndarray] = None
+        self.grouped: Optional[np.ndarray] = None
+        self.indexed = 0
+        self.load()
+
+    def _assign(self, vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), BATCH_ROWS):
+            block = np.asarray(vectors[start:start + BATCH_ROWS], dtype=np.float32)
+            labels[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        return labels
+
+    def _kmeans(self, sample: np.ndarray, nlist: int, rng: np.random.Generator) -> np.ndarray:
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            labels = self._assign(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=nlist)
+            empty = counts == 0
+            # Re-seed empty lists with random points so every list stays useful
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()), replace=False)]
+            centroids = _normalize(sums)
+        return centroids
+
+    def build(self, nlist: Optional[int] = None, seed: int = 0):
+        """
+        Train ``nlist`` lists (default sqrt(n)) on a sample and regroup every vector by list
+
+        The grouped copy is written next to the store and memory-mapped. Both
+        files go through temp files and a rename; ``load`` rejects a pair left
+        from different builds by an interrupted one.
+        """
+        vectors = self.store.vectors
+        n = len(vectors)
+        if n == 0:
+            (self.directory / "ivf.npz").unlink(missing_ok=True)
+            self.centroids, self.list_ptr, self.ids, self.grouped, self.indexed = None, None, None, None, 0
+            return
+        nlist = max(1, min(nlist or int(np.sqrt(n)), n))
+        rng = np.random.default_rng(seed)
+        sample_size = min(n, nlist * TRAIN_POINTS_PER_LIST)
+        sample = np.asarray(vectors[np.sort(rng.choice(n, sample_size, replace=False))], dtype=np.float32)
+        centroids = self._kmeans(sample, nlist, rng)
+
+        labels = self._assign(vectors, centroids)
+        ids = np.argsort(labels, kind="stable")
+        list_ptr = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=nlist))])
+        fd, tmp_grouped = tempfile.mkstemp(prefix=".ivf_vectors.", suffix=".f16", dir=self.directory)
+        os.close(fd)
+        grouped = np.memmap(tmp_grouped, dtype=np.float16, mode="w+", shape=(n, self.store.dim))
+        for start in range(0, n, BATCH_ROWS):
+            grouped[start:start + BATCH_ROWS] = vectors[ids[start:start + BATCH_ROWS]]
+        grouped.flush()
+        del grouped
+        fd, tmp_arrays = tempfile.mkstemp(prefix=".ivf.", suffix=".npz", dir=self.directory)
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, centroids=centroids, list_ptr=list_ptr, ids=ids)
+        os.replace(tmp_grouped, self.directory / "ivf_vectors.f16")
+        os.replace(tmp_arrays, self.directory / "ivf.npz")
+        self.load()
+        logger.info(f"✓ IVF index: {n} vectors in {nlist} lists")
+
+    def load(self) -> bool:
+        path, grouped_path = self.directory / "ivf.npz", self.directory / "ivf_vectors.f16"
+        if not (path.exists() and grouped_path.exists()):
+            return False
+        arrays = np.load(path)
+        centroids, list_ptr, ids = arrays["centroids"], arrays["list_ptr"], arrays["ids"]
+        if (len(list_ptr) != len(centroids) + 1 or list_ptr[-1] != len(ids)
+                or grouped_path.stat().st_size != len(ids) * self.store.dim * 2):
+            # Interrupted build: the two files are from different builds
+            logger.warning(f"Ignoring inconsistent IVF index in {self.directory}; rebuild it")
+            return False
+        self.centroids, self.list_ptr, self.ids = centroids, list_ptr, ids
+        self.indexed = len(ids)
+        self.grouped = np.memmap(grouped_path, dtype=np.float16, mode="r", shape=(self.indexed, self.store.dim))
+        return True
+
+    def search(self, queries: np.ndarray, k: int = 10, nprobe: int = DEFAULT_NPROBE) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top ``k`` by inner product for a batch of queries: (scores, ids), best first
+
+        Rows are padded with -inf / -1 when fewer than ``k`` candidates are found.
+        """
+        queries = _normalize(np.asarray(queries, dtype=np.float32).reshape(-1, self.store.dim))
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        ids = np.full((len(queries), k), -1, dtype=np.int64)
+        tail = np.asarray(self.store.vectors[self.indexed:], dtype=np.float32)
+        if self.centroids is None and not len(tail):
+            return scores, ids
+
+        # One pass per probed list: each slab is converted once and scored against every query probing it
+        found_rows, found_scores, found_ids = [], [], []
+        if self.centroids is not None:
+            nprobe = min(nprobe, len(self.centroids))
+            probes = np.argpartition(-(queries @ self.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+            rows = np.repeat(np.arange(len(queries)), nprobe)
+            clusters = probes.ravel()
+            order = np.argsort(clusters, kind="stable")
+            rows, clusters = rows[order], clusters[order]
+            bounds = np.flatnonzero(np.diff(clusters)) + 1
+            for group_rows, cluster in zip(np.split(rows, bounds), clusters[np.concatenate([[0], bounds])]):
+                start, end = self.list_ptr[cluster], self.list_ptr[cluster + 1]
+                if end == start:
+                    continue
+                slab_scores = queries[group_rows] @ np.asarray(self.grouped[start:end], dtype=np.float32).T
+                top = min(k, end - start)
+                best = np.argpartition(-slab_scores, top - 1, axis=1)[:, :top]
+                found_rows.append(np.repeat(group_rows, top))
+                found_scores.append(np.take_along_axis(slab_scores, best, axis=1).ravel())
+                found_ids.append(self.ids[start:end][best].ravel())
+        if len(tail):
+            tail_scores, tail_ids = exact_search(tail, queries, k)
+            found_rows.append(np.repeat(np.arange(len(queries)), tail_ids.shape[1]))
+            found_scores.append(tail_scores.ravel())
+            found_ids.append(tail_ids.ravel() + self.indexed)
+        if not found_rows:
+            return scores, ids
+
+        # Best ``k`` candidates per query: sort by (query, -score) and keep each query's first ``k``
+        rows, row_scores, row_ids = np.concatenate(found_rows), np.concatenate(found_scores), np.concatenate(found_ids)
+        order = np.lexsort((-row_scores, rows))
+        rows, row_scores, row_ids = rows[order], row_scores[order], row_ids[order]
+        rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+        keep = rank < k
+        scores[rows[keep], rank[keep]] = row_scores[keep]
+        ids[rows[keep], rank[keep]] = row_ids[keep]
+        return scores, ids
+
+
+class SemanticIndex:
+    """Embedding search over the passages of a ``RetrievalIndex``"""
+
+    def __init__(self, retrieval: RetrievalIndex, directory: Path = CACHE_DIR / "vectors", embedder=None):
+        self.retrieval = retrieval
+        self.embedder = embedder or get_embedder()
+        self.directory = Path(directory) / self.embedder.name
+        self.store = VectorStore(self.directory, self.embedder.dim)
+        self.index = IVFIndex(self.store)
+        self._signature_path = self.directory / "sources.json"
+
+    def update(self) -> bool:
+        """Re-embed the passages if the retrieval index changed; True if it did"""
+        self.retrieval.update()
+        signature = json.dumps(self.retrieval.sources, sort_keys=True)
+        if self._signature_path.exists() and self._signature_path.read_text() == signature \
+                and len(self.store) == len(self.retrieval.passages):
+            return False
+        self.store.clear()
+        passages = self.retrieval.passages
+        for start in range(0, len(passages), 1024):
+            batch = passages[start:start + 1024]
+            self.store.add(self.embedder.embed([f"{p.heading} {p.text}" for p in batch]))
+        self.index.build()
+        self._signature_path.write_text(signature)
+        return True
+
+    def search(self, query: str, k: int = 5, nprobe: int = DEFAULT_NPROBE) -> List[Tuple[float, Passage]]:
+        """Top ``k`` passages by embedding similarity, best first"""
+        self.update()
+        scores, ids = self.index.search(self.embedder.embed([query]), k, nprobe)
+        return [(float(score), self.retrieval.passages[i]) for score, i in zip(scores[0], ids[0]) if i >= 0]
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from data_cache import load_datasets
+
+    semantic = SemanticIndex(RetrievalIndex(data=load_datasets))
+    semantic.update()
+    query = " ".join(sys.argv[1:]) or "teenagers sleeping badly because of phones"
+    start = time.perf_counter()
+    results = semantic.search(query)
+    elapsed = time.perf_counter() - start
+    for score, passage in results:
+        print(f"{score:6.3f}  [{passage.source} / {passage.heading}] {passage.text[:120]}")
+    print(f"\n{len(semantic.store)} vectors ({semantic.embedder.name}), query in {elapsed * 1000:.2f} ms")
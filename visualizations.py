@@ -62,7 +62,8 @@ def create_mechanisms_heatmap(data: pd.DataFrame) -> go.Figure:
         values='pathway_strength',
         index='mechanism',
         columns='outcome',
-        fill_value=0
+        fill_value=0,
+        observed=True
     )
     
     fig = px.imshow(
@@ -103,7 +104,7 @@ def create_detox_recovery_chart(data: pd.DataFrame) -> go.Figure:
 
 def create_ses_inequality_chart(data: pd.DataFrame) -> go.Figure:
     """Create SES inequality visualization"""
-    summary = data.groupby('income_level')['health_impact_multiplier'].mean().reset_index()
+    summary = data.groupby('income_level', observed=True)['health_impact_multiplier'].mean().reset_index()
     
     fig = px.bar(
         summary,